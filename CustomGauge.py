@@ -1,68 +1,57 @@
 from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout
-from PySide6.QtGui import QPainter, QPen, QFont, QColor, QPolygonF, QPixmap, QImage
-from PySide6.QtCore import Qt, QRectF, QPointF, QPoint
+from PySide6.QtGui import (
+    QPainter, QPen, QBrush, QFont, QFontMetricsF, QColor, QPolygonF, QPixmap, QImage, QRegion,
+    QStaticText, QTransform,
+)
+from PySide6.QtCore import Qt, QRect, QRectF, QPointF, QPoint
+import os
 import sys
 import math
-from PySide6.QtCore import QTimer
 
-
-class CustomGauge(QWidget):
-    """A customizable gauge widget with needle, ticks, labels, and optional odometer."""
-    def __init__(
-        self,
-        # Determine if needle is rendered or not
-        needle=True,
-        # Min value of the gauge
-        min_value=0,
-        # Max value of the gauge
-        max_value=120,
-        # Number of major ticks
-        major_tick=10,
-        # Number of minor ticks
-        minor_tick=5,
-        # Label text (can include \n for multi-line)
-        label="MPH\nkm/h",
-        # Units text (displayed below value)
-        units="MPH",
-        # Needle color
-        needle_color=QColor("orange"),
-        # Dial center color
-        dial_color=QColor("orange"),
-        # Start angle of the gauge (in degrees)
-        start_angle=210,  
-        # End angle of the gauge (in degrees)   
-        end_angle=-30,       
-        # Optional parent widget 
-        parent=None,
-        # Optional odometer display below the gauge
-        odometer=False,
-        # Bottom text size (value + units)
-        bottom_text_size=14,
-        # Label text size
-        label_size=16,
-        # Value text size
-        value_size=16,
-        # Spacing factor for label numbers (0.0 to 1.0, where 1.0 is at the edge)
-        label_spacing=0.65,
-        # Odometer font size
-        odometer_font_size=16,
-        # Use E and F for fuel gauge instead of 0 and max_value
-        fuel_ticks=False
-    ):
-        """_summary_
-
-        Args:
-            min_value (int, optional): _description_. Defaults to 0.
-            max_value (int, optional): _description_. Defaults to 120.
-            major_tick (int, optional): _description_. Defaults to 10.
-            minor_tick (int, optional): _description_. Defaults to 5.
-            label (str, optional): _description_. Defaults to "MPH\nkm/h".
-            units (str, optional): _description_. Defaults to "MPH".
-            needle_color (_type_, optional): _description_. Defaults to QColor("orange").
-            dial_color (_type_, optional): _description_. Defaults to QColor("orange").
-            start_angle (int, optional): _description_. Defaults to 210.
-        """
-        super().__init__(parent)
+from animation import shared_clock
+from frame_scheduler import antialias, request_update
+from render_cache import render_cache
+from gauge_history import GaugeHistory, history_spec
+
+
+# Characters of the value readout that are drawn from the per-gauge glyph cache
+READOUT_GLYPHS = "0123456789.-"
+
+
+def layout_static_text(text, font, rect):
+    """Lay out text centered in rect, as drawText(rect, Qt.AlignCenter, text) would.
+
+    Returns a list of (QStaticText, QPointF) pairs, one per line, prepared for font
+    so that drawing them later does no text shaping.
+    """
+    metrics = QFontMetricsF(font)
+    lines = text.split("\n")
+    line_h = metrics.height()
+    top = rect.center().y() - line_h * len(lines) / 2
+    laid_out = []
+    for i, line in enumerate(lines):
+        static = QStaticText(line)
+        static.setTextFormat(Qt.PlainText)
+        static.setPerformanceHint(QStaticText.AggressiveCaching)
+        static.prepare(QTransform(), font)
+        laid_out.append((static, QPointF(rect.center().x() - static.size().width() / 2, top + i * line_h)))
+    return laid_out
+
+
+class GaugeDial:
+    """State and drawing of a gauge, shared by the CustomGauge widget and canvas items.
+
+    Classes using it provide width(), height(), rect(), devicePixelRatioF() and
+    _invalidate(region), and call _init_dial() from their constructor.
+    """
+    def _init_dial(self, needle=True, min_value=0, max_value=120, major_tick=10, minor_tick=5,
+                   label="MPH\nkm/h", units="MPH", needle_color=QColor("orange"),
+                   dial_color=QColor("orange"), start_angle=210, end_angle=-30, odometer=False,
+                   bottom_text_size=14, label_size=16, value_size=16, label_spacing=0.65,
+                   odometer_font_size=16, fuel_ticks=False, antialiasing=True, peak_hold=False,
+                   min_hold=False, sparkline=False, sparkline_seconds=30.0, history_windows=(),
+                   refresh="normal", decimals=None, deadband=0.25):
+        """Store the dial parameters. See CustomGauge for what each one does."""
         self.needle = needle
         self.value = min_value
         self.min_value = min_value
@@ -75,8 +64,6 @@ class CustomGauge(QWidget):
         self.dial_color = dial_color
         self.start_angle = start_angle
         self.end_angle = end_angle
-        self.setMinimumSize(400, 400)
-        self.setWindowTitle("Custom Gauge")
         self.odometer = odometer
         self.bottom_text_size = bottom_text_size 
         self.label_size = label_size
@@ -84,6 +71,51 @@ class CustomGauge(QWidget):
         self.label_spacing = label_spacing
         self.odometer_font_size = odometer_font_size
         self.fuel_ticks = fuel_ticks
+        self.antialiasing = antialiasing
+        self.peak_hold = peak_hold
+        self.min_hold = min_hold
+        self.sparkline = sparkline
+        # Read by the FrameScheduler to limit and, under load, degrade repaints
+        self.refresh_class = refresh
+        self.decimals = decimals
+
+        # set_value() skips repaints that would not change the readout and move the needle tip
+        # by at most deadband device pixels; suppressed_updates counts them, of value_updates
+        self.deadband = deadband
+        self.value_updates = 0
+        self.suppressed_updates = 0
+        self._needle_value = min_value  # last value the needle was sent to
+
+        # Static dial layer (face, ticks, numbers, label, odometer box), rebuilt
+        # only when the key returned by _background_key() changes
+        self._background = None
+        self._background_cache_key = None
+
+        # Snapshot drawn scaled while the gauge is being resized, see begin_resize_preview()
+        self._preview = None
+
+        # Position the needle is drawn at. Equal to value unless an animator is easing it.
+        self.display_value = min_value
+        self.animator = None
+        self._needle_sweep = QRect()  # reused by set_display_value() for every animation frame
+
+        # Pens, fonts and points reused by every paint, see _ensure_paint_objects()
+        self._paint_cache_key = None
+
+        # Tick numbers and label as prepared static text, see _ensure_text_layout()
+        self._text_layout_key = None
+
+        # Distance shown in the odometer box, see set_odometer()
+        self.odometer_value = 0.0
+        self._odometer_text = None
+
+        # Value history behind the peak/min markers, the sparkline and rolling statistics
+        spec = history_spec(peak_hold, min_hold, sparkline, sparkline_seconds, history_windows)
+        self.history = GaugeHistory(*spec) if spec else None
+        self._records_history = self.history is not None
+        self._drawn_history = None  # (peak marker, min marker, trail points) last invalidated
+        self._watching_holds = False  # subscribed to the clock to clear timed markers, see _watch_holds()
+        self._off_screen = False  # hidden (say, on another page): markers are re-checked once shown
 
     def set_value(self, value):
         """_summary_
@@ -91,27 +123,295 @@ class CustomGauge(QWidget):
         Args:
             value (integer): Value to set the gauge to
         """
+        self.value_updates += 1
+        old_text = self._format_value()
         self.value = max(self.min_value, min(value, self.max_value))
-        self.update()
+        self._ensure_paint_objects()
+        region = QRegion()
+        if self._format_value() != old_text:
+            region += self._value_text_rect
+        if self._needle_moves(self._needle_value, self.value):
+            self._needle_value = self.value
+            if self.animator is not None:
+                self.animator.set_target(self, self.value)
+            else:
+                region += self._needle_region(self.display_value, self.value)
+                self.display_value = self.value
+        if self.history is not None:
+            if self._records_history:
+                self.history.add(value)
+            region += self._history_region()
+        if region.isEmpty():
+            self.suppressed_updates += 1
+            return
+        self._invalidate(region)
+
+    def _needle_moves(self, old_value, new_value):
+        """Whether the needle tip at new_value is more than deadband device pixels from old_value."""
+        if not self.needle or old_value == new_value:
+            return False
+        swing = math.radians(abs(self._value_to_angle(new_value) - self._value_to_angle(old_value)))
+        return swing * self._radius * 0.75 * self.devicePixelRatioF() > self.deadband
+
+    def use_history(self, history):
+        """Show a GaugeHistory recorded elsewhere (say, by a channel) instead of recording one."""
+        self.history = history
+        self._records_history = False
+        self._drawn_history = None
+        self._invalidate()
+
+    def reset_peaks(self):
+        """Forget the held peak and low; the markers restart from the next value."""
+        if self.history is not None:
+            self.history.reset_peaks()
+            self._ensure_paint_objects()
+            self._invalidate(self._history_region())
+
+    def set_display_value(self, value):
+        """Move the needle without changing the value. Called by NeedleAnimator each frame."""
+        self._ensure_paint_objects()
+        old_value, self.display_value = self.display_value, value
+        if self.needle:
+            self._invalidate(self._needle_sweep_rect(old_value, value))
+
+    def set_odometer(self, distance):
+        """Show distance in the odometer box. Only repaints when the displayed digits change."""
+        old = self._format_odometer()
+        self.odometer_value = distance
+        if self.odometer and self._format_odometer() != old:
+            self._ensure_paint_objects()
+            self._odometer_text = None
+            self._invalidate(self._odometer_rect.toAlignedRect())
+
+    def _format_odometer(self):
+        return f"{int(self.odometer_value) % 1000000:06d}"
+
+    def _needle_rect(self, value):
+        """Pixel bounds of the needle (with pen width and hub) drawn at value."""
+        center = self._center
+        length = self._radius * 0.75
+        rad = math.radians(self._value_to_angle(value))
+        tx = center.x() + length * math.cos(rad)
+        ty = center.y() - length * math.sin(rad)
+        pad = self._needle_pad()
+        return QRectF(min(center.x(), tx) - pad, min(center.y(), ty) - pad,
+                      abs(tx - center.x()) + 2 * pad, abs(ty - center.y()) + 2 * pad).toAlignedRect()
+
+    def _needle_pad(self):
+        return max(self._needle_pen.widthF(), self._radius * 0.09) + 2  # pen cap, hub and antialiasing
+
+    def _needle_sweep_rect(self, old_value, new_value):
+        """Pixel bounds of the needle drawn at both old_value and new_value, written into the
+        gauge's one reused QRect. Animation frames move the needle a little at a time, so the
+        bounding rect is barely bigger than the two needle rects and needs no QRegion."""
+        cx, cy = self._center.x(), self._center.y()
+        length = self._radius * 0.75
+        old = math.radians(self._value_to_angle(old_value))
+        new = math.radians(self._value_to_angle(new_value))
+        old_x, old_y = cx + length * math.cos(old), cy - length * math.sin(old)
+        new_x, new_y = cx + length * math.cos(new), cy - length * math.sin(new)
+        pad = self._needle_pad()
+        self._needle_sweep.setCoords(math.floor(min(cx, old_x, new_x) - pad),
+                                     math.floor(min(cy, old_y, new_y) - pad),
+                                     math.ceil(max(cx, old_x, new_x) + pad) - 1,
+                                     math.ceil(max(cy, old_y, new_y) + pad) - 1)
+        return self._needle_sweep
+
+    def _needle_region(self, old_value, new_value):
+        """Region covering the needle sweep from old_value to new_value."""
+        if not self.needle:
+            return QRegion()
+        return QRegion(self._needle_rect(old_value)) + QRegion(self._needle_rect(new_value))
+
+    def _history_marks(self):
+        """(peak marker value, min marker value, trail points), markers clamped to the scale."""
+        history = self.history
+        marks = []
+        for hold, highest in ((self.peak_hold, True), (self.min_hold, False)):
+            value = history.hold(hold, highest)
+            marks.append(None if value is None else max(self.min_value, min(value, self.max_value)))
+        return marks[0], marks[1], history.trail_count if self.sparkline else 0
+
+    def _marker_rect(self, value):
+        """Pixel bounds of a peak/min marker drawn at value."""
+        rad = math.radians(self._value_to_angle(value))
+        r = self._radius * 0.8
+        x = self._center.x() + r * math.cos(rad)
+        y = self._center.y() - r * math.sin(rad)
+        pad = self._radius * 0.06 + 2
+        return QRectF(x - pad, y - pad, 2 * pad, 2 * pad).toAlignedRect()
+
+    def _history_region(self):
+        """Region of the markers and sparkline that changed since they were last invalidated."""
+        marks = self._history_marks()
+        drawn = self._drawn_history or (None, None, None)
+        region = QRegion()
+        if marks == drawn:
+            return region
+        for old, new in zip(drawn[:2], marks[:2]):
+            if old != new:
+                for value in (old, new):
+                    if value is not None:
+                        region += self._marker_rect(value)
+        if marks[2] != drawn[2]:
+            region += self._sparkline_rect.toAlignedRect()
+        self._drawn_history = marks
+        self._watch_holds(marks)
+        return region
+
+    def _watch_holds(self, marks):
+        """Re-check the markers twice a second while a timed one is shown, so it clears when its
+        window empties even if no new value arrives (say, a sensor dropped out)."""
+        timed = not self._off_screen and any(mark is not None and not isinstance(hold, bool)
+                                             for mark, hold in zip(marks[:2], (self.peak_hold, self.min_hold)))
+        if timed == self._watching_holds:
+            return
+        self._watching_holds = timed
+        if timed:
+            shared_clock().subscribe_blink(self._expire_holds, 1.0)
+        else:
+            shared_clock().unsubscribe_blink(self._expire_holds)
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+    def _expire_holds(self, state):
+        if self.history is None:
+            return
+        self._ensure_paint_objects()
+        region = self._history_region()
+        if not region.isEmpty():
+            self._invalidate(region)
+
+    def _set_shown(self, shown):
+        """Stop re-checking timed markers while the gauge is off screen (hidden, or on a page
+        not shown), and bring them up to date when it is shown again."""
+        if shown != self._off_screen:
+            return
+        self._off_screen = not shown
+        if not shown:
+            self._watch_holds((None, None, None))
+        elif self.history is not None:
+            self._expire_holds(True)
+            self._watch_holds(self._drawn_history or (None, None, None))
+
+    def _value_to_angle(self, value):
+        """Needle angle in degrees for value."""
+        sweep = self.start_angle - self.end_angle
+        value_range = self.max_value - self.min_value
+        return self.start_angle - ((value - self.min_value) * sweep / value_range)
+
+    def _dial_geometry(self):
+        """Return the dial center and radius for the current widget size."""
         rect = self.rect()
         center = rect.center()
         radius = min(rect.width(), rect.height()) // 2 * 0.95  # 95% of half the smallest dimension
+        return center, radius
+
+    def _background_key(self):
+        """Everything the static dial layer depends on."""
+        return (
+            self.width(), self.height(), self.devicePixelRatioF(),
+            self.needle, self.min_value, self.max_value, self.major_tick, self.minor_tick,
+            self.label, self.start_angle, self.end_angle, self.odometer,
+            self.label_size, self.value_size, self.label_spacing,
+            self.odometer_font_size, self.fuel_ticks, self.antialiasing,
+        )
+
+    def _ensure_background(self):
+        """Return the cached static dial layer, rendering it if it is stale."""
+        key = self._background_key()
+        if self._background is None or key != self._background_cache_key:
+            # A pixmap rendered by an earlier run is reused from the on-disk cache if installed
+            cache = render_cache()
+            pixmap = None
+            if cache is not None:
+                disk_key = cache.key("dial", *key)
+                pixmap = cache.load(disk_key)
+            if pixmap is None:
+                pixmap = self._render_background()
+                if cache is not None:
+                    cache.store(disk_key, pixmap)
+            self._background = pixmap
+            self._background_cache_key = key
+        return self._background
+
+    def prepare(self):
+        """Build the cached layers now rather than on the first paint."""
+        self._ensure_background()
+        self._ensure_paint_objects()
+
+    def begin_resize_preview(self):
+        """Until end_resize_preview(), draw a snapshot of the gauge scaled to its size, so a
+        resize in steps does not render the dial again at every step."""
+        if self._preview is not None:
+            return
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(max(1, round(self.width() * dpr)), max(1, round(self.height() * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        self.paint_dial(painter, QRegion(self.rect()))
+        painter.end()
+        self._preview = pixmap
+
+    def end_resize_preview(self):
+        """Drop the snapshot and render the gauge crisply at its new size."""
+        if self._preview is None:
+            return
+        self._preview = None
+        self._invalidate()
+
+    def _ensure_text_layout(self):
+        """Lay out the tick numbers and label once per size and configuration."""
+        key = (self.width(), self.height(), self.min_value, self.max_value, self.major_tick,
+               self.minor_tick, self.label, self.start_angle, self.end_angle, self.label_size,
+               self.value_size, self.label_spacing, self.fuel_ticks)
+        if key == self._text_layout_key:
+            return
+        center, radius = self._dial_geometry()
+        self._tick_font = QFont("Arial", self.value_size, QFont.Bold)
+        self._label_font = QFont("Arial", self.label_size, QFont.Bold)
+        number_offset = radius * self.label_spacing  # Move numbers further inward
+        text_box = 32                  # Increase bounding box
+
+        self._tick_texts = []
+        for i in range(self.min_value, self.max_value + 1, self.minor_tick):
+            if i % self.major_tick != 0:
+                continue
+            if self.fuel_ticks:
+                if i == self.min_value:
+                    text = "E"
+                elif i == self.max_value:
+                    text = "F"
+                else:
+                    continue
+            else:
+                text = str(i)
+            rad = math.radians(self._value_to_angle(i))
+            tx = center.x() + number_offset * math.cos(rad)
+            ty = center.y() - number_offset * math.sin(rad)
+            self._tick_texts += layout_static_text(
+                text, self._tick_font, QRectF(tx-text_box/2, ty-text_box/2, text_box, text_box))
+
+        self._label_texts = layout_static_text(
+            self.label, self._label_font,
+            QRectF(center.x()-radius*0.25, center.y()-radius*0.25, radius*0.5, radius*0.18))
+        self._text_layout_key = key
+
+    def _render_background(self):
+        """Render the parts of the gauge that do not depend on the value into a pixmap."""
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(max(1, round(self.width() * dpr)), max(1, round(self.height() * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing, self.antialiasing)
+        center, radius = self._dial_geometry()
 
         # Draw black background
         painter.setBrush(Qt.black)
         painter.setPen(Qt.black)
         painter.drawEllipse(center, radius, radius)
 
-        # Undo text size scaling: use fixed font sizes
-   
-        painter.setFont(QFont("Arial", self.value_size, QFont.Bold))
-        number_offset = radius * self.label_spacing  # Move numbers further inward
-        text_box = 32                  # Increase bounding box
-       
         tick_outer = radius
         tick_inner = radius * 0.85
         minor_tick_inner = radius * 0.92
@@ -126,45 +426,24 @@ class CustomGauge(QWidget):
             x2 = center.x() + tick_outer * math.cos(rad)
             y2 = center.y() - tick_outer * math.sin(rad)
 
-            # Major ticks and numbers
+            # Major ticks
             if i % self.major_tick == 0:
                 painter.setPen(QPen(Qt.white, max(2, int(radius * 0.03))))
                 painter.drawLine(QPointF(x1, y1), QPointF(x2, y2))
-                tx = center.x() + number_offset * math.cos(rad)
-                ty = center.y() - number_offset * math.sin(rad)
-                painter.setPen(Qt.white)
-                if self.fuel_ticks:
-                    if i == self.min_value:
-                        painter.drawText(QRectF(tx-text_box/2, ty-text_box/2, text_box, text_box), Qt.AlignCenter, "E")
-                    elif i == self.max_value:   
-                        painter.drawText(QRectF(tx-text_box/2, ty-text_box/2, text_box, text_box), Qt.AlignCenter, "F")
-                else:
-                    painter.drawText(QRectF(tx-text_box/2, ty-text_box/2, text_box, text_box), Qt.AlignCenter, str(i))
             # Minor ticks
             else:
                 painter.setPen(QPen(Qt.gray, max(1, int(radius * 0.015))))
                 painter.drawLine(QPointF(x1, y1), QPointF(center.x() + minor_tick_inner * math.cos(rad), center.y() - minor_tick_inner * math.sin(rad)))
 
-        # Draw needle
-        if self.needle == True:
-            needle_length = radius * 0.75
-            needle_angle = self.start_angle - ((self.value - self.min_value) * sweep / value_range)
-            rad = math.radians(needle_angle)
-            nx = center.x() + needle_length * math.cos(rad)
-            ny = center.y() - needle_length * math.sin(rad)
-            painter.setPen(QPen(self.needle_color, max(6, int(radius * 0.05))))
-            painter.drawLine(center, QPointF(nx, ny))
-
-            # Draw center dial piece
-            dial_radius = radius * 0.09
-            painter.setPen(self.dial_color)
-            painter.setBrush(self.dial_color)
-            painter.drawEllipse(center, dial_radius, dial_radius)
-
-        # Draw label
-        painter.setFont(QFont("Arial", self.label_size, QFont.Bold))
+        # Draw tick numbers and label from the prepared static text
+        self._ensure_text_layout()
         painter.setPen(Qt.white)
-        painter.drawText(QRectF(center.x()-radius*0.25, center.y()-radius*0.25, radius*0.5, radius*0.18), Qt.AlignCenter, self.label)
+        painter.setFont(self._tick_font)
+        for static, pos in self._tick_texts:
+            painter.drawStaticText(pos, static)
+        painter.setFont(self._label_font)
+        for static, pos in self._label_texts:
+            painter.drawStaticText(pos, static)
 
         # Draw odometer rectangle (optional, static)
         odo_w = radius * 0.6
@@ -174,57 +453,333 @@ class CustomGauge(QWidget):
             painter.setPen(Qt.white)
             painter.setBrush(Qt.black)
             painter.drawRect(odo_rect)
-            painter.setFont(QFont("Consolas", self.odometer_font_size, QFont.Bold))
-            painter.drawText(odo_rect, Qt.AlignCenter, "000000")
+
+        painter.end()
+        return pixmap
+
+    def _ensure_paint_objects(self):
+        """Build the pens, fonts and points used for the dynamic layer, only when they go stale."""
+        key = (self.width(), self.height(), self.devicePixelRatioF(), self.needle_color.rgba(),
+               self.dial_color.rgba(), self.bottom_text_size, self.units, self.odometer_font_size)
+        if key == self._paint_cache_key:
+            return
+        center, radius = self._dial_geometry()
+        self._center = QPointF(center)
+        self._radius = radius
+        self._needle_tip = QPointF()
+        self._needle_pen = QPen(self.needle_color, max(6, int(radius * 0.05)))
+        self._dial_pen = QPen(self.dial_color)
+        self._dial_brush = QBrush(self.dial_color)
+        self._value_font = QFont("Arial", self.bottom_text_size, QFont.Bold)
+        odo_w = radius * 0.6
+        odo_h = radius * 0.13
+        self._value_rect = QRectF(center.x()-odo_w/2, center.y()+radius*0.5, odo_w, odo_h)
+        # Inside of the odometer box drawn by _render_background(), so the digits never touch its frame
+        self._odometer_rect = QRectF(center.x()-odo_w/2, center.y()+radius*0.35, odo_w, odo_h).adjusted(1, 1, -1, -1)
+        self._odometer_font = QFont("Consolas", self.odometer_font_size, QFont.Bold)
+        self._odometer_text = None
+        # Between the needle hub and the odometer box
+        self._sparkline_rect = QRectF(center.x()-radius*0.3, center.y()+radius*0.15, radius*0.6, radius*0.17)
+        self._sparkline_pen = QPen(self.dial_color, max(1.0, radius * 0.012))
+        self._peak_brush = QBrush(self.needle_color)
+        self._low_brush = QBrush(Qt.white)
+        # The readout is centered on _value_rect but may overflow it, so invalidate the
+        # full dial width and at least one line of text
+        text_h = max(odo_h, QFontMetricsF(self._value_font).height())
+        self._value_text_rect = QRectF(center.x()-radius, self._value_rect.center().y()-text_h/2 - 1,
+                                       2*radius, text_h + 2).toAlignedRect()
+        self._build_glyph_cache()
+        self._paint_cache_key = key
+
+    def _build_glyph_cache(self):
+        """Pre-render the readout digits and prepare the units text, so a frame does no text shaping."""
+        metrics = QFontMetricsF(self._value_font)
+        dpr = self.devicePixelRatioF()
+        self._glyph_height = metrics.height()
+        self._glyphs = {}
+        for ch in READOUT_GLYPHS:
+            advance = metrics.horizontalAdvance(ch)
+            # One pixel of padding on each side for bearings and antialiasing
+            pixmap = QPixmap(math.ceil((advance + 2) * dpr), math.ceil(self._glyph_height * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.TextAntialiasing)
+            painter.setFont(self._value_font)
+            painter.setPen(Qt.white)
+            painter.drawText(QPointF(1, metrics.ascent()), ch)
+            painter.end()
+            self._glyphs[ch] = (pixmap, advance)
+        self._units_text = QStaticText(" " + self.units)
+        self._units_text.setTextFormat(Qt.PlainText)
+        self._units_text.prepare(QTransform(), self._value_font)
+        self._units_width = metrics.horizontalAdvance(" " + self.units)
+
+    def _format_value(self):
+        """The readout string for the current value, without units."""
+        if self.decimals is None:
+            return f"{self.value}"
+        text = f"{self.value:.{self.decimals}f}"
+        return text[1:] if text.startswith("-") and float(text) == 0 else text  # no "-0.0"
+
+    def _paint_history(self, painter, dirty):
+        peak, low, _ = self._history_marks()
+        painter.setPen(Qt.NoPen)
+        for value, brush in ((peak, self._peak_brush), (low, self._low_brush)):
+            if value is None or not dirty.intersects(self._marker_rect(value)):
+                continue
+            # A small triangle just inside the ticks, pointing at the scale
+            rad = math.radians(self._value_to_angle(value))
+            cos, sin = math.cos(rad), math.sin(rad)
+            c, r = self._center, self._radius
+            half = r * 0.04
+            tip = QPointF(c.x() + r * 0.84 * cos, c.y() - r * 0.84 * sin)
+            base = QPointF(c.x() + r * 0.76 * cos, c.y() - r * 0.76 * sin)
+            painter.setBrush(brush)
+            painter.drawPolygon(QPolygonF([tip, QPointF(base.x() - half * sin, base.y() - half * cos),
+                                           QPointF(base.x() + half * sin, base.y() + half * cos)]))
+
+        if not self.sparkline or not dirty.intersects(self._sparkline_rect.toAlignedRect()):
+            return
+        older, newer = self.history.trail_segments()
+        count = len(older) + len(newer)
+        if count < 2:
+            return
+        rect = self._sparkline_rect
+        step = rect.width() / (self.history.trail_length - 1)
+        x = rect.right() - (count - 1) * step  # newest point at the right edge
+        scale = rect.height() / (self.max_value - self.min_value)
+        points = []
+        for segment in (older, newer):
+            for value in segment:
+                value = max(self.min_value, min(value, self.max_value))
+                points.append(QPointF(x, rect.bottom() - (value - self.min_value) * scale))
+                x += step
+        painter.setPen(self._sparkline_pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPolyline(QPolygonF(points))
+
+    def paint_dial(self, painter, region):
+        """Draw the gauge with painter, limited to region (in the gauge's own coordinates)."""
+        if self._preview is not None:
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawPixmap(QRectF(self.rect()), self._preview, QRectF(self._preview.rect()))
+            return
+        self._ensure_paint_objects()
+        center = self._center
+        radius = self._radius
+
+        # Only copy the parts of the static layer that are being repainted
+        dirty = region.boundingRect()
+        background = self._ensure_background()
+        dpr = background.devicePixelRatio()
+        for r in region:
+            painter.drawPixmap(QRectF(r), background,
+                               QRectF(r.x()*dpr, r.y()*dpr, r.width()*dpr, r.height()*dpr))
+        painter.setRenderHint(QPainter.Antialiasing, self.antialiasing and antialias(self))
+
+        # Draw peak/min markers and sparkline (under the needle)
+        if self.history is not None:
+            self._paint_history(painter, dirty)
+
+        # Draw needle
+        if self.needle == True and dirty.intersects(self._needle_rect(self.display_value)):
+            needle_length = radius * 0.75
+            rad = math.radians(self._value_to_angle(self.display_value))
+            self._needle_tip.setX(center.x() + needle_length * math.cos(rad))
+            self._needle_tip.setY(center.y() - needle_length * math.sin(rad))
+            painter.setPen(self._needle_pen)
+            painter.drawLine(center, self._needle_tip)
+
+            # Draw center dial piece
+            dial_radius = radius * 0.09
+            painter.setPen(self._dial_pen)
+            painter.setBrush(self._dial_brush)
+            painter.drawEllipse(center, dial_radius, dial_radius)
+
+        # Draw odometer digits, laid out again only when they change
+        if self.odometer == True and dirty.intersects(self._odometer_rect.toAlignedRect()):
+            if self._odometer_text is None:
+                self._odometer_text = layout_static_text(self._format_odometer(), self._odometer_font,
+                                                         self._odometer_rect)
+            painter.save()
+            painter.setClipRect(self._odometer_rect, Qt.IntersectClip)
+            painter.setFont(self._odometer_font)
+            painter.setPen(Qt.white)
+            for static, pos in self._odometer_text:
+                painter.drawStaticText(pos, static)
+            painter.restore()
 
         # Draw value text (below odometer)
-        painter.setFont(QFont("Arial", self.bottom_text_size, QFont.Bold))
+        if not dirty.intersects(self._value_text_rect):
+            return
+        painter.setFont(self._value_font)
         painter.setPen(Qt.white)
-        painter.drawText(QRectF(center.x()-odo_w/2, center.y()+radius*0.5, odo_w, odo_h), Qt.AlignCenter, f"{self.value} {self.units}")
-
-class TurnSignal(QWidget):
-    """A blinking turn signal arrow widget."""
-    def __init__(self, direction="left", color="green", parent=None):
+        text = self._format_value()
+        glyphs = self._glyphs
+        if not all(ch in glyphs for ch in text):
+            # Unusual readouts (exponents, inf, nan) fall back to regular text drawing
+            painter.drawText(self._value_rect, Qt.AlignCenter, f"{text} {self.units}")
+            return
+        width = self._units_width
+        for ch in text:
+            width += glyphs[ch][1]
+        x = self._value_rect.center().x() - width / 2
+        top = round(self._value_rect.center().y() - self._glyph_height / 2)
+        for ch in text:
+            pixmap, advance = glyphs[ch]
+            painter.drawPixmap(round(x) - 1, top, pixmap)
+            x += advance
+        painter.drawStaticText(round(x), top, self._units_text)
+
+class CustomGauge(QWidget, GaugeDial):
+    """A customizable gauge widget with needle, ticks, labels, and optional odometer."""
+    def __init__(
+        self,
+        # Determine if needle is rendered or not
+        needle=True,
+        # Min value of the gauge
+        min_value=0,
+        # Max value of the gauge
+        max_value=120,
+        # Number of major ticks
+        major_tick=10,
+        # Number of minor ticks
+        minor_tick=5,
+        # Label text (can include \n for multi-line)
+        label="MPH\nkm/h",
+        # Units text (displayed below value)
+        units="MPH",
+        # Needle color
+        needle_color=QColor("orange"),
+        # Dial center color
+        dial_color=QColor("orange"),
+        # Start angle of the gauge (in degrees)
+        start_angle=210,  
+        # End angle of the gauge (in degrees)   
+        end_angle=-30,       
+        # Optional parent widget 
+        parent=None,
+        # Optional odometer display below the gauge
+        odometer=False,
+        # Bottom text size (value + units)
+        bottom_text_size=14,
+        # Label text size
+        label_size=16,
+        # Value text size
+        value_size=16,
+        # Spacing factor for label numbers (0.0 to 1.0, where 1.0 is at the edge)
+        label_spacing=0.65,
+        # Odometer font size
+        odometer_font_size=16,
+        # Use E and F for fuel gauge instead of 0 and max_value
+        fuel_ticks=False,
+        # Render with antialiasing
+        antialiasing=True,
+        # Mark the highest value: True holds it until reset_peaks(), a number holds it for that many seconds
+        peak_hold=False,
+        # Mark the lowest value, like peak_hold
+        min_hold=False,
+        # Draw a trail of recent values above the odometer
+        sparkline=False,
+        # Time covered by the sparkline, in seconds
+        sparkline_seconds=30.0,
+        # Rolling windows (in seconds) whose min/max/mean are kept, see gauge.history.window()
+        history_windows=(),
+        # Refresh class: "realtime" (every frame, never degraded), "normal" (every frame, slowed
+        # under load), "slow" (2 Hz) or a rate in Hz, see frame_scheduler.REFRESH_CLASSES
+        refresh="normal",
+        # Digits after the decimal point in the readout; None shows the value as given
+        decimals=None,
+        # Values moving the needle tip by at most this many device pixels (and leaving the
+        # readout as it is) are not repainted; 0 repaints any needle movement
+        deadband=0.25
+    ):
         """_summary_
 
         Args:
-            direction (str, optional): Direction the arrow faces. Defaults to "left".
-            color (str, optional): color of the arrow signal. Defaults to "green".
-            parent (any, optional): parent object of arrow. Defaults to None.
+            min_value (int, optional): _description_. Defaults to 0.
+            max_value (int, optional): _description_. Defaults to 120.
+            major_tick (int, optional): _description_. Defaults to 10.
+            minor_tick (int, optional): _description_. Defaults to 5.
+            label (str, optional): _description_. Defaults to "MPH\nkm/h".
+            units (str, optional): _description_. Defaults to "MPH".
+            needle_color (_type_, optional): _description_. Defaults to QColor("orange").
+            dial_color (_type_, optional): _description_. Defaults to QColor("orange").
+            start_angle (int, optional): _description_. Defaults to 210.
         """
         super().__init__(parent)
+        self._init_dial(
+            needle=needle, min_value=min_value, max_value=max_value, major_tick=major_tick,
+            minor_tick=minor_tick, label=label, units=units, needle_color=needle_color,
+            dial_color=dial_color, start_angle=start_angle, end_angle=end_angle, odometer=odometer,
+            bottom_text_size=bottom_text_size, label_size=label_size, value_size=value_size,
+            label_spacing=label_spacing, odometer_font_size=odometer_font_size,
+            fuel_ticks=fuel_ticks, antialiasing=antialiasing, peak_hold=peak_hold,
+            min_hold=min_hold, sparkline=sparkline, sparkline_seconds=sparkline_seconds,
+            history_windows=history_windows, refresh=refresh, decimals=decimals, deadband=deadband,
+        )
+        self.setMinimumSize(400, 400)
+        self.setWindowTitle("Custom Gauge")
+
+    def _invalidate(self, region=None):
+        request_update(self, region)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._set_shown(True)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._set_shown(False)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        self.paint_dial(painter, event.region())
+
+class TurnSignalArrow:
+    """State and drawing of a blinking turn signal, shared by TurnSignal and canvas items.
+
+    Classes using it provide width(), height() and _invalidate(region), and call
+    _init_signal() from their constructor.
+    """
+    def _init_signal(self, direction="left", color="green"):
         self.direction = direction
         self.color = QColor(color)
         self.on = False
         self.visible_state = False
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.toggle)
-        self.setFixedSize(60, 60)
+        self.blink_period = 1.0  # on for 500ms, off for 500ms
+        self.antialiasing = True
 
     def start(self):
-        """Start blinking the turn signal."""
+        """Start blinking the turn signal, in phase with every other blinker."""
+        if self.on:
+            return
         self.on = True
-        self.timer.start(500)  # blink every 500ms
-        self.update()
+        shared_clock().subscribe_blink(self._on_blink, self.blink_period)
+        self._invalidate()
 
     def stop(self):
         """Stop blinking the turn signal."""
         self.on = False
         self.visible_state = False
-        self.timer.stop()
-        self.update()
+        shared_clock().unsubscribe_blink(self._on_blink)
+        self._invalidate()
 
     def toggle(self):
         """Toggle the visibility state of the turn signal."""
         self.visible_state = not self.visible_state
-        self.update()
+        self._invalidate()
 
-    def paintEvent(self, event):
-        """Render the turn signal arrow if it's on and visible."""
+    def _on_blink(self, state):
+        if state != self.visible_state:
+            self.toggle()
+
+    def paint_signal(self, painter):
+        """Draw the arrow if it's on and visible."""
         if not self.on or not self.visible_state:
             return
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.Antialiasing, self.antialiasing)
         painter.setBrush(self.color)
         painter.setPen(Qt.NoPen)
 
@@ -234,71 +789,197 @@ class TurnSignal(QWidget):
         else:
             points = [QPointF(w*0.2, h*0.2), QPointF(w*0.8, h*0.5), QPointF(w*0.2, h*0.8)]
         painter.drawPolygon(QPolygonF(points))
-        
-from PySide6.QtWidgets import QWidget
-from PySide6.QtGui import QPainter, QPixmap, QColor, QFont, QImage
-from PySide6.QtCore import Qt, QRectF
 
-class AlertIcon(QWidget):
-    """A dashboard alert icon with active/inactive states."""
-    def __init__(self, icon_path, label="", active_color="red", inactive_color="gray", parent=None):
+
+class TurnSignal(QWidget, TurnSignalArrow):
+    """A blinking turn signal arrow widget."""
+    def __init__(self, direction="left", color="green", parent=None):
         """_summary_
 
         Args:
-            icon_path (str): path at which icon image is located. Defaults to "".
-            label (str, optional): Label under the icon. Defaults to "".
-            active_color (str, optional): Color the icon turns when active. Defaults to "red".
-            inactive_color (str, optional): Color the icon turns when inactive. Defaults to "gray".
-            parent (any, optional): Parent object. Defaults to None.
+            direction (str, optional): Direction the arrow faces. Defaults to "left".
+            color (str, optional): color of the arrow signal. Defaults to "green".
+            parent (any, optional): parent object of arrow. Defaults to None.
         """
         super().__init__(parent)
-        self.icon_path = icon_path
-        self.label = label
-        self.active_color = QColor(active_color)
-        self.inactive_color = QColor(inactive_color)
+        self._init_signal(direction, color)
+        self.setFixedSize(60, 60)
 
-        self.base_icon = QPixmap(icon_path).scaled(
-            40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation
+    def _invalidate(self, region=None):
+        request_update(self, region)
+
+    def paintEvent(self, event):
+        """Render the turn signal arrow if it's on and visible."""
+        if not self.on or not self.visible_state:
+            return
+        painter = QPainter(self)
+        self.paint_signal(painter)
+        
+from PySide6.QtWidgets import QWidget
+from PySide6.QtGui import QPainter, QPixmap, QColor, QFont, QImage
+from PySide6.QtCore import Qt, QRectF
+
+# Process-wide cache of decoded and tinted alert icons, keyed by (icon path, color, size).
+# The untinted icon is stored under a color of None.
+_icon_cache = {}
+
+
+def colorize_pixmap(pixmap: QPixmap, color: QColor) -> QPixmap:
+    """Recolor only the symbol (non-transparent) pixels of the pixmap, preserving alpha"""
+    if pixmap.isNull():
+        return QPixmap(pixmap)
+    img = pixmap.toImage().convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
+    # SourceIn keeps each pixel's alpha and replaces its color in one pass over the buffer
+    painter = QPainter(img)
+    painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
+    painter.fillRect(img.rect(), QColor(color))
+    painter.end()
+
+    return QPixmap.fromImage(img)
+
+
+def tinted_icon(icon_path, color, size=40) -> QPixmap:
+    """Return the icon at icon_path scaled to size and tinted with color, decoding it at most once.
+
+    Args:
+        icon_path (str): path at which icon image is located.
+        color (str | QColor): color to tint the icon with.
+        size (int, optional): size of the square box the icon is scaled into. Defaults to 40.
+    """
+    color = QColor(color)
+    key = (icon_path, color.rgba(), size)
+    icon = _icon_cache.get(key)
+    if icon is not None:
+        return icon
+
+    cache = render_cache()
+    disk_key = None
+    if cache is not None:
+        # Tinted icons from an earlier run skip decoding and recoloring altogether
+        try:
+            st = os.stat(icon_path)
+            disk_key = cache.key("icon", os.path.abspath(icon_path), st.st_mtime_ns, st.st_size,
+                                 color.rgba(), size)
+            icon = cache.load(disk_key)
+        except OSError:
+            pass
+        if icon is not None:
+            _icon_cache[key] = icon
+            return icon
+
+    base = _icon_cache.get((icon_path, None, size))
+    if base is None:
+        base = QPixmap(icon_path).scaled(
+            size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation
         )
-        if self.base_icon.isNull():
+        if base.isNull():
             print(f"⚠️ Could not load icon: {icon_path}")
+        _icon_cache[(icon_path, None, size)] = base
+    icon = colorize_pixmap(base, color)
+    _icon_cache[key] = icon
+    if disk_key is not None and not icon.isNull():
+        cache.store(disk_key, icon)
+    return icon
+
 
+class AlertIndicator:
+    """State and drawing of an alert icon, shared by AlertIcon and canvas items.
+
+    Classes using it provide _invalidate(region) and call _init_alert() from their
+    constructor. The icon is drawn into a 50x65 box.
+    """
+    def _init_alert(self, icon_path, label="", active_color="red", inactive_color="gray"):
+        self.icon_path = icon_path
+        self.label = label
+        self.icon_size = 40
         self.active = False
-        self.setFixedSize(50, 65)
+        self.flashing = False
+        self.flash_on = True
+        self.antialiasing = True
+        self.label_font = QFont("Arial", 9, QFont.Bold)
+
+        # Look up both versions in the shared icon cache
+        self.set_colors(active_color, inactive_color)
 
-        # Precompute both versions
-        self.colored_active = self.colorize_icon(self.base_icon, self.active_color)
-        self.colored_inactive = self.colorize_icon(self.base_icon, self.inactive_color)
+    @property
+    def base_icon(self):
+        """The decoded, untinted icon."""
+        return _icon_cache[(self.icon_path, None, self.icon_size)]
 
     def set_active(self, state: bool):
-        """Set the active state of the icon."""
+        """Set the active state of the icon. Only repaints if the state changes."""
+        if state == self.active:
+            return
         self.active = state
-        self.update()
+        self._invalidate()
+
+    def set_flashing(self, flashing: bool, period=1.0):
+        """Make the icon flash between its active and inactive colors while it is active."""
+        if flashing == self.flashing:
+            return
+        self.flashing = flashing
+        if flashing:
+            shared_clock().subscribe_blink(self._on_flash, period)
+        else:
+            shared_clock().unsubscribe_blink(self._on_flash)
+            self.flash_on = True
+            self._invalidate()
+
+    def _on_flash(self, state):
+        self.flash_on = state
+        if self.active:
+            self._invalidate()
+
+    def set_colors(self, active_color=None, inactive_color=None):
+        """Change the active and/or inactive colors. Tinted icons come from the shared cache."""
+        if active_color is not None:
+            self.active_color = QColor(active_color)
+            self.colored_active = tinted_icon(self.icon_path, self.active_color, self.icon_size)
+        if inactive_color is not None:
+            self.inactive_color = QColor(inactive_color)
+            self.colored_inactive = tinted_icon(self.icon_path, self.inactive_color, self.icon_size)
+        self._invalidate()
 
     def colorize_icon(self, pixmap: QPixmap, color: QColor) -> QPixmap:
         """Recolor only the symbol (non-transparent) pixels of the pixmap"""
-        img = pixmap.toImage().convertToFormat(QImage.Format_ARGB32)
-
-        for y in range(img.height()):
-            for x in range(img.width()):
-                pixel = img.pixelColor(x, y)
-                if pixel.alpha() > 0:  # Only recolor the symbol pixels
-                    new = QColor(color)
-                    new.setAlpha(pixel.alpha())  # preserve alpha channel
-                    img.setPixelColor(x, y, new)
-
-        return QPixmap.fromImage(img)
+        return colorize_pixmap(pixmap, color)
 
-    def paintEvent(self, event):
-        """Render the icon with appropriate color and label."""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+    def paint_alert(self, painter):
+        """Draw the icon with appropriate color and label."""
+        painter.setRenderHint(QPainter.Antialiasing, self.antialiasing)
 
-        icon = self.colored_active if self.active else self.colored_inactive
+        lit = self.active and (self.flash_on or not self.flashing)
+        icon = self.colored_active if lit else self.colored_inactive
         painter.drawPixmap(5, 5, icon)
 
         # Draw label under the icon
         if self.label:
             painter.setPen(Qt.white)
-            painter.setFont(QFont("Arial", 9, QFont.Bold))
-            painter.drawText(QRectF(0, 47, 50, 15), Qt.AlignCenter, self.label)
\ No newline at end of file
+            painter.setFont(self.label_font)
+            painter.drawText(QRectF(0, 47, 50, 15), Qt.AlignCenter, self.label)
+
+
+class AlertIcon(QWidget, AlertIndicator):
+    """A dashboard alert icon with active/inactive states."""
+    def __init__(self, icon_path, label="", active_color="red", inactive_color="gray", parent=None):
+        """_summary_
+
+        Args:
+            icon_path (str): path at which icon image is located. Defaults to "".
+            label (str, optional): Label under the icon. Defaults to "".
+            active_color (str, optional): Color the icon turns when active. Defaults to "red".
+            inactive_color (str, optional): Color the icon turns when inactive. Defaults to "gray".
+            parent (any, optional): Parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self._init_alert(icon_path, label, active_color, inactive_color)
+        self.setFixedSize(50, 65)
+
+    def _invalidate(self, region=None):
+        request_update(self, region)
+
+    def paintEvent(self, event):
+        """Render the icon with appropriate color and label."""
+        painter = QPainter(self)
+        self.paint_alert(painter)
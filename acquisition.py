@@ -0,0 +1,126 @@
+"""Telemetry acquisition in a child process, shared with the GUI through shared memory.
+
+In the default mode a TelemetryIngestor thread reads and decodes samples inside
+the GUI process, where heavy decoding competes with painting for the GIL. With
+an AcquisitionProcess the source is read and decoded by a child process instead.
+The child publishes the latest value of every channel into a
+multiprocessing.shared_memory block, and the GUI takes one consistent snapshot of
+it per frame: no pickling, queues or locks are involved.
+
+The block layout, the child's loop and the reader live in shared_channels.py,
+which does not import Qt.
+
+The GUI side watches the child and starts a new one if it exits or stops
+sending heartbeats. A new child gets a startup grace period first: it imports
+Python modules (and, being spawned, the main script) and opens its source
+before it can beat, which on a Raspberry Pi can take several seconds.
+"""
+import multiprocessing
+import time
+
+from PySide6.QtCore import QObject, QTimer
+
+from shared_channels import PID, SharedChannelReader, SharedChannels, acquire
+
+
+class AcquisitionProcess(QObject):
+    """Runs a telemetry source in a child process and restarts it if it dies.
+
+    Offers the same start(), stop(), rings and stats() as TelemetryIngestor; call
+    poll() once per frame before draining rings (GaugeFeeder.before_drain).
+    """
+    def __init__(self, source_factory, channels, watchdog_ms=500, heartbeat_timeout=5.0,
+                 startup_grace=30.0, parent=None):
+        """_summary_
+
+        Args:
+            source_factory (callable): picklable callable returning a TelemetrySource, called
+                in the child, e.g. functools.partial(source_from_spec, "udp:5005").
+            channels (list): channel names to share.
+            watchdog_ms (int, optional): how often the child is checked. Defaults to 500.
+            heartbeat_timeout (float, optional): seconds without a heartbeat after which a
+                child counts as hung and is replaced. Defaults to 5.0.
+            startup_grace (float, optional): seconds a new child may take to import and open
+                its source before missing heartbeats count against it. Defaults to 30.0.
+            parent (any, optional): Parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.source_factory = source_factory
+        self.channels = list(channels)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.startup_grace = startup_grace
+        self.restarts = 0
+        self.block = None
+        self.reader = None
+        self.process = None
+        # spawn rather than fork: the child must not inherit the GUI's Qt state
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._started_at = None
+        self.watchdog = QTimer(self)
+        self.watchdog.setInterval(watchdog_ms)
+        self.watchdog.timeout.connect(self._check)
+
+    @property
+    def rings(self):
+        return self.reader.rings
+
+    def poll(self):
+        self.reader.poll()
+
+    def start(self):
+        self.block = SharedChannels(self.channels, create=True)
+        self.reader = SharedChannelReader(self.block)
+        self._spawn()
+        self.watchdog.start()
+
+    def _spawn(self):
+        self.block.repair()
+        self.block.header[PID] = 0
+        self.block.beat()
+        self._started_at = time.monotonic()
+        self.process = self._context.Process(
+            target=acquire, args=(self.source_factory, self.channels, self.block.name, self._stop_event),
+            name="telemetry-acquisition", daemon=True)
+        self.process.start()
+
+    def _check(self):
+        """Replace the child if it exited or stopped beating."""
+        if self._stop_event.is_set():
+            return
+        now = time.monotonic()
+        # Until the child has opened its source, only the grace period limits it
+        starting = (self.block.header[PID] != self.process.pid
+                    and now - self._started_at < self.startup_grace)
+        hung = not starting and now - self.block.heartbeat[0] > self.heartbeat_timeout
+        if self.process.is_alive() and not hung:
+            return
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join(1.0)
+        self.restarts += 1
+        self._spawn()
+
+    def stop(self, timeout=1.0):
+        """Stop the child and free the shared block."""
+        self.watchdog.stop()
+        self._stop_event.set()
+        if self.process is not None:
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout)
+        if self.block is not None:
+            self.block.close()
+            self.block.shm.unlink()
+            self.block = None
+
+    def stats(self):
+        """Counters for monitoring, like TelemetryIngestor.stats(), plus restarts."""
+        return {
+            "received": self.reader.samples,
+            "drops": self.reader.drops,
+            "overruns": {name: slot.overruns for name, slot in self.reader.rings.items()},
+            "torn_snapshots": self.reader.torn,
+            "restarts": self.restarts,
+        }
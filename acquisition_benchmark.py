@@ -0,0 +1,160 @@
+"""Compare GUI frame times with telemetry decoded in a thread or in a child process.
+
+Runs a stand-in for the GUI frame loop (drain the channels, then spend paint_ms
+of Python work) at the target rate while a synthetic source produces samples
+that each cost decode_us of Python work to decode:
+
+    python acquisition_benchmark.py
+    python acquisition_benchmark.py --decode-us 200 --rate 2000 --output acq.json
+
+Modes are "none" (no telemetry), "thread" (TelemetryIngestor, decoding inside
+the GUI process) and "process" (AcquisitionProcess). For each, frame work time
+percentiles and the number of frames that overran their budget are reported.
+With decoding in a thread those go up as the decoder holds the GIL; in a
+child process they should stay close to "none".
+"""
+import argparse
+import functools
+import json
+import platform
+import sys
+import time
+
+from PySide6.QtCore import QCoreApplication
+
+from acquisition import AcquisitionProcess
+from render_benchmark import percentile
+from telemetry import TelemetryIngestor, TelemetrySource
+
+CHANNELS = ["OIL", "WATER", "VOLTS", "FUEL", "MPH", "RPM"]
+
+
+def spin(seconds):
+    """Busy Python work for about seconds, holding the GIL like decoding or painting would."""
+    end = time.perf_counter() + seconds
+    x = 0
+    while time.perf_counter() < end:
+        x += 1
+    return x
+
+
+class SyntheticSource(TelemetrySource):
+    """Produces rate samples per second across CHANNELS, each costing decode_us to decode."""
+    def __init__(self, rate=1000, decode_us=100):
+        self.rate = rate
+        self.decode_us = decode_us
+        self.n = 0
+
+    def read(self):
+        batch = max(1, self.rate // 100)  # one read every 10 ms
+        start = time.perf_counter()
+        lines = []
+        for _ in range(batch):
+            spin(self.decode_us / 1e6)
+            channel = CHANNELS[self.n % len(CHANNELS)]
+            lines.append(f"{channel},{self.n % 100}")
+            self.n += 1
+        rest = 0.01 - (time.perf_counter() - start)
+        if rest > 0:
+            time.sleep(rest)
+        return lines
+
+
+def run_frames(rings, poll, fps, paint_ms, seconds):
+    """Run the frame loop. Returns per-frame work times in ms and the number of late frames."""
+    interval = 1.0 / fps
+    times = []
+    late = 0
+    next_frame = time.perf_counter()
+    end = next_frame + seconds
+    while next_frame < end:
+        now = time.perf_counter()
+        if now < next_frame:
+            time.sleep(next_frame - now)
+        start = time.perf_counter()
+        if poll is not None:
+            poll()
+        for ring in rings.values():
+            ring.drain()
+        spin(paint_ms / 1000)
+        done = time.perf_counter()
+        times.append((done - start) * 1000)
+        if done - next_frame > interval:
+            late += 1
+        next_frame += interval
+        if done > next_frame:
+            next_frame = done  # do not try to catch up on missed frames
+    return times, late
+
+
+def run_mode(mode, args):
+    source_factory = functools.partial(SyntheticSource, args.rate, args.decode_us)
+    poll, rings, acquisition = None, {}, None
+    if mode == "thread":
+        acquisition = TelemetryIngestor(source_factory(), channels=CHANNELS)
+        rings = acquisition.rings
+    elif mode == "process":
+        acquisition = AcquisitionProcess(source_factory, CHANNELS)
+        poll = acquisition.poll
+    if acquisition is not None:
+        acquisition.start()
+        if mode == "process":
+            rings = acquisition.rings
+        time.sleep(args.warmup)  # let the child import and start producing
+    try:
+        times, late = run_frames(rings, poll, args.fps, args.paint_ms, args.seconds)
+    finally:
+        if acquisition is not None:
+            stats = acquisition.stats()
+            acquisition.stop()
+    times.sort()
+    result = {
+        "frames": len(times),
+        "p50_ms": round(percentile(times, 50), 3),
+        "p99_ms": round(percentile(times, 99), 3),
+        "max_ms": round(times[-1], 3),
+        "late_frames": late,
+    }
+    if acquisition is not None:
+        result["received"] = stats["received"]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GUI frame times with and without a separate acquisition process")
+    parser.add_argument("--modes", default="none,thread,process", help="comma separated modes to run")
+    parser.add_argument("--fps", type=int, default=60, help="frame loop rate")
+    parser.add_argument("--paint-ms", type=float, default=4.0, help="simulated paint work per frame")
+    parser.add_argument("--rate", type=int, default=1000, help="samples per second from the source")
+    parser.add_argument("--decode-us", type=float, default=300.0, help="decode work per sample in microseconds")
+    parser.add_argument("--seconds", type=float, default=5.0, help="measured time per mode")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds to let acquisition start")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    # AcquisitionProcess owns a watchdog QTimer, which needs an application object
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "fps": args.fps, "paint_ms": args.paint_ms, "rate": args.rate, "decode_us": args.decode_us,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "modes": {},
+    }
+    for mode in args.modes.split(","):
+        result = run_mode(mode, args)
+        results["modes"][mode] = result
+        print(f"{mode:<8} p50 {result['p50_ms']:7.3f} ms  p99 {result['p99_ms']:7.3f} ms  "
+              f"max {result['max_ms']:7.3f} ms  late {result['late_frames']:4d}/{result['frames']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Declarative threshold rules that switch alert icons from channel values.
+
+A rule is a line such as:
+
+    OIL < 10 for 2s
+    WATER > 230 hysteresis 5
+    VOLTS outside 11.5-15 for 0.5s hysteresis 0.3
+
+CHANNEL < X raises the alert while the value is below X, CHANNEL > X while it is
+above X, and CHANNEL outside A-B while it is below A or above B. "for Ns" only
+raises the alert once the condition has held for N seconds (debounce).
+"hysteresis H" keeps it raised until the value is H back inside the limit, so a
+value hovering at the threshold does not make the icon flicker. An alert is
+active while any of its rules is raised.
+
+Rules are parsed once into flat lists. AlertEngine.evaluate() runs once per frame
+against the latest value of each channel: only the rules of channels whose value
+changed (and rules waiting out a "for" delay) are looked at, and only alerts whose
+state changed are written, so a frame costs the same however many rules are idle.
+"""
+import json
+import math
+import re
+import time
+
+RULE = re.compile(
+    r"^\s*(?P<channel>\w+)\s+"
+    r"(?:(?P<op>[<>])\s*(?P<limit>-?[\d.]+)|outside\s+(?P<low>-?[\d.]+)\s*(?:-|–|\.\.)\s*(?P<high>-?[\d.]+))"
+    r"(?:\s+for\s+(?P<delay>[\d.]+)\s*s)?"
+    r"(?:\s+hysteresis\s+(?P<hysteresis>[\d.]+))?\s*$",
+    re.IGNORECASE,
+)
+
+
+def parse_rule(text):
+    """Parse a rule. Returns (channel, low, high, delay, hysteresis); the alert trips below
+    low or above high."""
+    match = RULE.match(text)
+    if match is None:
+        raise ValueError(f"Cannot parse alert rule: {text!r}")
+    if match["op"] == "<":
+        low, high = float(match["limit"]), math.inf
+    elif match["op"] == ">":
+        low, high = -math.inf, float(match["limit"])
+    else:
+        low, high = float(match["low"]), float(match["high"])
+        if low > high:
+            raise ValueError(f"Empty range in alert rule: {text!r}")
+    return (match["channel"], low, high, float(match["delay"] or 0.0),
+            float(match["hysteresis"] or 0.0))
+
+
+def load_rules(path):
+    """Read {"alert": "rule" or ["rule", ...]} from a JSON file as a list of (alert, rule)."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    rules = []
+    for alert, texts in data.items():
+        for text in [texts] if isinstance(texts, str) else texts:
+            rules.append((alert, text))
+    return rules
+
+
+class AlertEngine:
+    """Evaluates compiled alert rules against channel values and writes alert states."""
+    def __init__(self, rules, sources, write):
+        """_summary_
+
+        Args:
+            rules (list): (alert name, rule text) pairs.
+            sources (dict): channel name -> object whose .value is the channel's latest
+                value (None until the first sample), such as a dashboard_pages.ChannelValue.
+            write (callable): write(alert name, active) is called when an alert changes.
+        """
+        self.write = write
+        self.channels = []  # channel names, indexed like _sources and _last
+        self.alerts = []    # alert names, indexed like _active and _alert_rules
+        channel_index, alert_index = {}, {}
+
+        # One entry per rule in each of these lists
+        self.rule_text = []
+        self._rule_alert = []
+        self._trip_low = []
+        self._trip_high = []
+        self._clear_low = []
+        self._clear_high = []
+        self._delay = []
+        self._since = []   # when the trip condition started, while waiting out the delay
+        self._raised = []
+
+        self._channel_rules = []  # per channel, indices of its rules
+        self._alert_rules = []    # per alert, indices of its rules
+        for alert, text in rules:
+            channel, low, high, delay, hysteresis = parse_rule(text)
+            if channel not in channel_index:
+                channel_index[channel] = len(self.channels)
+                self.channels.append(channel)
+                self._channel_rules.append([])
+            if alert not in alert_index:
+                alert_index[alert] = len(self.alerts)
+                self.alerts.append(alert)
+                self._alert_rules.append([])
+            i = len(self.rule_text)
+            self.rule_text.append(text)
+            self._rule_alert.append(alert_index[alert])
+            self._trip_low.append(low)
+            self._trip_high.append(high)
+            self._clear_low.append(low + hysteresis)
+            self._clear_high.append(high - hysteresis)
+            self._delay.append(delay)
+            self._since.append(None)
+            self._raised.append(False)
+            self._channel_rules[channel_index[channel]].append(i)
+            self._alert_rules[alert_index[alert]].append(i)
+
+        missing = [c for c in self.channels if c not in sources]
+        if missing:
+            raise ValueError(f"Alert rules use unknown channels: {', '.join(missing)}")
+        self._sources = [sources[c] for c in self.channels]
+        self._last = [None] * len(self.channels)
+        self._active = [False] * len(self.alerts)
+        self._pending = set()  # rules waiting out their delay
+        self._synced = False
+        self.evaluations = 0   # rule checks performed, for profiling
+
+    def evaluate(self, now=None):
+        """Check the rules affected since the last call and write the alerts that changed."""
+        if now is None:
+            now = time.monotonic()
+        touched = set()
+        for c, source in enumerate(self._sources):
+            value = source.value
+            if value is None or value == self._last[c]:
+                continue
+            self._last[c] = value
+            for i in self._channel_rules[c]:
+                self._check(i, value, now)
+                touched.add(self._rule_alert[i])
+        for i in list(self._pending):
+            if now - self._since[i] >= self._delay[i]:
+                self._pending.discard(i)
+                self._raised[i] = True
+                touched.add(self._rule_alert[i])
+
+        if not self._synced:
+            # The first evaluation writes every alert, so hand-set states do not linger
+            touched = range(len(self.alerts))
+            self._synced = True
+        else:
+            touched = [a for a in touched if self._alert_state(a) != self._active[a]]
+        for a in touched:
+            self._active[a] = self._alert_state(a)
+            self.write(self.alerts[a], self._active[a])
+
+    def _check(self, i, value, now):
+        self.evaluations += 1
+        if self._raised[i]:
+            if self._clear_low[i] <= value <= self._clear_high[i]:
+                self._raised[i] = False
+                self._since[i] = None
+            return
+        if self._trip_low[i] <= value <= self._trip_high[i]:
+            # Back inside the limits before the delay ran out
+            self._since[i] = None
+            self._pending.discard(i)
+            return
+        if not self._delay[i]:
+            self._raised[i] = True
+        elif self._since[i] is None:
+            self._since[i] = now
+            self._pending.add(i)
+
+    def _alert_state(self, a):
+        raised = self._raised
+        return any(raised[i] for i in self._alert_rules[a])
+
+    def active(self, alert):
+        return self._active[self.alerts.index(alert)]
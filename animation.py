@@ -0,0 +1,245 @@
+"""Needle animation and periodic effects driven by one shared clock.
+
+NeedleAnimator eases every attached gauge's needle toward its target value,
+either with a critically damped spring or with a slew-rate limit. All gauges
+are stepped from the same AnimationClock tick.
+
+Blinking effects (turn signals, flashing alerts) subscribe to the same clock
+with subscribe_blink(). Their phase is derived from the clock's time, so every
+blinker with the same period is phase-locked. While only blinkers are active
+the clock sleeps until the next phase flip instead of ticking every frame, and
+once nothing is animating or blinking its timer stops entirely.
+
+Per-gauge state lives in flat Python lists indexed by gauge, so a step does not
+create Qt objects. For offscreen tests, build the clock with manual=True and
+call advance() to step time deterministically.
+"""
+import math
+import time
+
+from PySide6.QtCore import QObject, QTimer, Qt
+
+
+class AnimationClock(QObject):
+    """A shared frame clock that only runs while a subscriber has work to do."""
+    def __init__(self, fps=60, manual=False, parent=None):
+        """_summary_
+
+        Args:
+            fps (int, optional): tick rate while animating. Defaults to 60.
+            manual (bool, optional): never start a timer; time only moves through
+                advance(). Defaults to False.
+            parent (any, optional): Parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.manual = manual
+        self.now = 0.0  # seconds of clock time since the clock was created
+        self.frame_interval = max(1, round(1000 / fps))
+        self.wakeups = 0
+        self._subscribers = []
+        self._blinkers = []  # [callback, half period in seconds, last state]
+        self._busy = False
+        self._last = None
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+
+    def subscribe(self, callback):
+        """Call callback(dt) on every tick. It returns True while it still needs ticks."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def subscribe_blink(self, callback, period=1.0):
+        """Call callback(state) with the current blink state now and every time it flips.
+
+        Args:
+            callback (callable): receives True for the "on" half of each period.
+            period (float, optional): full on/off cycle in seconds. Defaults to 1.0.
+        """
+        half = period / 2
+        state = self._blink_state(half)
+        self._blinkers.append([callback, half, state])
+        callback(state)
+        self._schedule()
+
+    def unsubscribe_blink(self, callback):
+        self._blinkers = [b for b in self._blinkers if b[0] != callback]
+        self._schedule()
+
+    @property
+    def running(self):
+        return self.timer.isActive()
+
+    def wake(self):
+        """Tick every frame until the subscribers are idle again."""
+        self._busy = True
+        self._schedule()
+
+    def advance(self, dt):
+        """Step every subscriber by dt seconds. Returns True if any is still busy."""
+        self.now += dt
+        busy = False
+        for callback in self._subscribers:
+            if callback(dt):
+                busy = True
+        for blinker in self._blinkers:
+            state = self._blink_state(blinker[1])
+            if state != blinker[2]:
+                blinker[2] = state
+                blinker[0](state)
+        self._busy = busy
+        self._schedule()
+        return busy
+
+    def _blink_state(self, half):
+        return int(self.now / half) % 2 == 0
+
+    def _schedule(self):
+        """Pick the next wakeup: every frame while busy, at the next blink flip, or never."""
+        if self._busy:
+            interval = self.frame_interval
+        elif self._blinkers:
+            until_flip = min(half - self.now % half for _, half, _ in self._blinkers)
+            interval = max(1, math.ceil(until_flip * 1000))
+        else:
+            self.timer.stop()
+            return
+        if self.manual:
+            return
+        if not self.timer.isActive():
+            self._last = time.perf_counter()
+            self.timer.start(interval)
+        elif self.timer.interval() != interval:
+            self.timer.start(interval)
+
+    def _tick(self):
+        now = time.perf_counter()
+        dt = now - self._last
+        self._last = now
+        self.wakeups += 1
+        self.advance(dt)
+
+
+_clock = None
+
+
+def install_clock(clock):
+    """Make clock the one shared by every blinker and animator."""
+    global _clock
+    _clock = clock
+
+
+def shared_clock():
+    """The installed clock, creating a default one on first use."""
+    global _clock
+    if _clock is None:
+        _clock = AnimationClock()
+    return _clock
+
+
+class NeedleAnimator:
+    """Moves gauge needles toward their targets.
+
+    mode "spring" uses a critically damped spring with natural frequency omega
+    (rad/s); mode "slew" moves at most slew_rate of the gauge's full scale per
+    second.
+    """
+    def __init__(self, clock, mode="spring", omega=12.0, slew_rate=1.5, settle=0.001):
+        """_summary_
+
+        Args:
+            clock (AnimationClock): clock that drives the animation.
+            mode (str, optional): "spring" or "slew". Defaults to "spring".
+            omega (float, optional): spring natural frequency in rad/s. Defaults to 12.0.
+            slew_rate (float, optional): full-scale sweeps per second in slew mode. Defaults to 1.5.
+            settle (float, optional): fraction of full scale under which a needle counts as
+                settled. Defaults to 0.001.
+        """
+        if mode not in ("spring", "slew"):
+            raise ValueError(f"Unknown animation mode: {mode}")
+        self.clock = clock
+        self.mode = mode
+        self.omega = omega
+        self.slew_rate = slew_rate
+        self.settle = settle
+
+        self.gauges = []
+        self.position = []
+        self.velocity = []
+        self.target = []
+        self.span = []
+        self.active = []
+        self._index = {}
+        clock.subscribe(self.step)
+
+    def attach(self, gauge):
+        """Animate gauge's needle from now on."""
+        if gauge in self._index:
+            return
+        self._index[gauge] = len(self.gauges)
+        self.gauges.append(gauge)
+        self.position.append(float(gauge.display_value))
+        self.velocity.append(0.0)
+        self.target.append(float(gauge.value))
+        self.span.append(float(gauge.max_value - gauge.min_value) or 1.0)
+        self.active.append(gauge.display_value != gauge.value)
+        gauge.animator = self
+        if self.active[-1]:
+            self.clock.wake()
+
+    def set_target(self, gauge, value):
+        i = self._index[gauge]
+        self.target[i] = float(value)
+        if not self.active[i]:
+            self.active[i] = True
+            self.clock.wake()
+
+    def snap(self, gauge):
+        """Put gauge's needle on its target now, without easing."""
+        i = self._index[gauge]
+        self.position[i] = self.target[i]
+        self.velocity[i] = 0.0
+        self.active[i] = False
+        gauge.set_display_value(self.target[i])
+
+    def settled(self):
+        return not any(self.active)
+
+    def step(self, dt):
+        """Advance every active needle by dt seconds. Returns True while any is moving."""
+        busy = False
+        position = self.position
+        velocity = self.velocity
+        target = self.target
+        for i, gauge in enumerate(self.gauges):
+            if not self.active[i]:
+                continue
+            span = self.span[i]
+            tolerance = span * self.settle
+            if self.mode == "spring":
+                # Exact solution of x'' = -w^2 x - 2w x' over dt, with x measured from the target
+                w = self.omega
+                x = position[i] - target[i]
+                v = velocity[i]
+                decay = math.exp(-w * dt)
+                c = (v + w * x) * dt
+                x = (x + c) * decay
+                velocity[i] = (v - w * c) * decay
+                position[i] = target[i] + x
+                done = abs(x) < tolerance and abs(velocity[i]) < tolerance * self.omega
+            else:
+                x = target[i] - position[i]
+                limit = self.slew_rate * span * dt
+                position[i] += max(-limit, min(x, limit))
+                done = abs(target[i] - position[i]) < tolerance
+            if done:
+                position[i] = target[i]
+                velocity[i] = 0.0
+                self.active[i] = False
+            else:
+                busy = True
+            gauge.set_display_value(position[i])
+        return busy
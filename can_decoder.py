@@ -0,0 +1,607 @@
+"""Table-driven CAN frame decoding for the dashboard's gauge channels.
+
+Signal definitions (message ID, start bit, length, byte order, sign, scale and
+offset, as in a DBC file) are loaded from JSON and turned into one lookup table
+per message: arrays of shifts, masks, scales and offsets. Frames are decoded a
+batch at a time with NumPy, one array operation per message for all its
+signals and all its frames, instead of a Python loop per frame and signal:
+
+    {"messages": [
+        {"id": "0x360", "signals": [
+            {"name": "OIL", "start": 32, "length": 16, "scale": 0.0145038, "offset": -14.7}]},
+        {"id": "0x7E8", "multiplexor": {"start": 16, "length": 8}, "signals": [
+            {"name": "RPM", "mux": 12, "start": 31, "length": 16, "byte_order": "big", "scale": 0.00025},
+            {"name": "MPH", "mux": 13, "start": 24, "length": 8, "scale": 0.621371}]}
+    ]}
+
+Start bits follow the DBC convention: for "little" (Intel) signals the least
+significant bit, for "big" (Motorola) ones the most significant bit, numbered
+7..0 in byte 0, 15..8 in byte 1 and so on. A signal with "mux" is only present
+in frames whose multiplexor field holds that value, which is how OBD-II
+responses carry one PID per frame. A signal feeds the gauge channel of its
+name unless it gives a "channel". Signals that end past a frame's data length
+(dlc) are left out of that frame, rather than read from its zero padding.
+
+Frames come from a bus: CanBus wraps python-can for real interfaces, while
+VirtualBus (synthetic frames) and CandumpFile (a candump -l log) stand in for
+one when testing. CanSource turns any of them into a telemetry source:
+
+    python speedometer_app.py --telemetry can:obd_signals.json@virtual
+    python speedometer_app.py --telemetry can:obd_signals.json@file:drive.log
+    python speedometer_app.py --telemetry can:obd_signals.json@socketcan:can0
+"""
+import json
+import math
+import time
+
+import numpy as np
+
+from telemetry import TelemetrySource
+
+# One CAN frame: classic CAN carries up to 8 data bytes, shorter frames are zero padded
+FRAME_DTYPE = np.dtype([("timestamp", "<f8"), ("id", "<u4"), ("dlc", "u1"), ("data", "u1", 8)])
+
+
+def empty_frames(count=0):
+    return np.zeros(count, dtype=FRAME_DTYPE)
+
+
+# ===================== Definitions =====================
+class CanSignal:
+    """One signal of a CAN message."""
+    def __init__(self, name, start, length, byte_order="little", signed=False, scale=1.0, offset=0.0,
+                 channel=None, mux=None, minimum=None, maximum=None):
+        """_summary_
+
+        Args:
+            name (str): signal name.
+            start (int): start bit, DBC numbering (see the module docstring).
+            length (int): length in bits, 1 to 64.
+            byte_order (str, optional): "little" (Intel) or "big" (Motorola). Defaults to "little".
+            signed (bool, optional): two's complement raw value. Defaults to False.
+            scale (float, optional): physical = raw * scale + offset. Defaults to 1.0.
+            offset (float, optional): see scale. Defaults to 0.0.
+            channel (str, optional): gauge channel fed. Defaults to name.
+            mux (int, optional): multiplexor value of the frames carrying this signal, or None
+                if every frame of the message does. Defaults to None.
+            minimum (float, optional): lowest physical value, for the virtual bus. Defaults
+                to the lowest raw value scaled.
+            maximum (float, optional): highest physical value, likewise. Defaults to the
+                highest raw value scaled.
+        """
+        if not 1 <= length <= 64:
+            raise ValueError(f"Signal {name!r}: length must be 1 to 64 bits")
+        if byte_order not in ("little", "big"):
+            raise ValueError(f"Signal {name!r}: byte_order must be 'little' or 'big'")
+        self.name = name
+        self.start = start
+        self.length = length
+        self.byte_order = byte_order
+        self.signed = signed
+        self.scale = scale
+        self.offset = offset
+        self.channel = channel or name
+        self.mux = mux
+        if byte_order == "little":
+            # Bit n of the frame is bit n of the little-endian 64-bit word
+            self.shift = start
+        else:
+            # In the big-endian word, frame byte 0 is the top byte; start is the signal's MSB
+            msb = 63 - (start // 8 * 8 + 7 - start % 8)
+            self.shift = msb - length + 1
+        if not 0 <= self.shift <= 64 - length:
+            raise ValueError(f"Signal {name!r} does not fit in 8 bytes")
+        # Data bytes a frame must have for the signal to be in it
+        last_bit = self.shift + length - 1 if byte_order == "little" else 63 - self.shift
+        self.byte_count = last_bit // 8 + 1
+        lowest = -(1 << (length - 1)) if signed else 0
+        highest = (1 << (length - 1)) - 1 if signed else (1 << length) - 1
+        ends = sorted((lowest * scale + offset, highest * scale + offset))
+        self.minimum = ends[0] if minimum is None else minimum
+        self.maximum = ends[1] if maximum is None else maximum
+
+
+class CanMessage:
+    """A message ID and the signals it carries."""
+    def __init__(self, frame_id, signals, name=None, multiplexor=None):
+        """_summary_
+
+        Args:
+            frame_id (int): CAN identifier.
+            signals (list): CanSignal objects.
+            name (str, optional): message name. Defaults to the hex ID.
+            multiplexor (CanSignal, optional): field selecting which "mux" signals a frame
+                carries. Defaults to None.
+        """
+        self.id = frame_id
+        self.name = name or f"0x{frame_id:X}"
+        self.signals = signals
+        self.multiplexor = multiplexor
+        if multiplexor is None and any(s.mux is not None for s in signals):
+            raise ValueError(f"Message {self.name} has multiplexed signals but no multiplexor")
+
+    def mux_values(self):
+        """The multiplexor values used by the signals, [None] if the message is not multiplexed."""
+        values = sorted({s.mux for s in self.signals if s.mux is not None})
+        return values or [None]
+
+
+def _signal_from_config(item):
+    return CanSignal(item["name"], item["start"], item["length"], item.get("byte_order", "little"),
+                     item.get("signed", False), item.get("scale", 1.0), item.get("offset", 0.0),
+                     item.get("channel"), item.get("mux"), item.get("min"), item.get("max"))
+
+
+def load_definitions(path):
+    """Read signal definitions (see the module docstring) from the JSON file at path."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    messages = []
+    for item in data.get("messages", []):
+        frame_id = item["id"]
+        if isinstance(frame_id, str):
+            frame_id = int(frame_id, 0)
+        multiplexor = item.get("multiplexor")
+        if multiplexor is not None:
+            multiplexor = _signal_from_config(dict(multiplexor, name=multiplexor.get("name", "mux")))
+        signals = [_signal_from_config(s) for s in item.get("signals", [])]
+        messages.append(CanMessage(frame_id, signals, item.get("name"), multiplexor))
+    if len({m.id for m in messages}) != len(messages):
+        raise ValueError(f"{path}: a message ID is defined twice")
+    return messages
+
+
+# ===================== Decoder =====================
+class _MessageTable:
+    """Precomputed per-signal arrays of one message, in the order of its signals."""
+    def __init__(self, message, channel_index):
+        signals = message.signals
+        self.big = np.array([s.byte_order == "big" for s in signals])
+        self.shifts = np.array([s.shift for s in signals], dtype=np.uint64)
+        self.masks = np.array([(1 << s.length) - 1 for s in signals], dtype=np.uint64)
+        # Raw values with this bit set are negative, and have 2 ** length taken off
+        self.sign_bits = np.array([1 << (s.length - 1) if s.signed else 0 for s in signals], dtype=np.uint64)
+        self.ranges = np.array([2.0 ** s.length for s in signals])
+        self.any_signed = bool(self.sign_bits.any())
+        self.any_big = bool(self.big.any())
+        self.scales = np.array([s.scale for s in signals])
+        self.offsets = np.array([s.offset for s in signals])
+        self.channels = np.array([channel_index[s.channel] for s in signals], dtype=np.intp)
+        self.mux = np.array([-1 if s.mux is None else s.mux for s in signals], dtype=np.int64)
+        self.multiplexor = message.multiplexor
+        # A frame's dlc must reach this far for the signal to be decoded from it; a
+        # multiplexed signal also needs the multiplexor field
+        mux_bytes = 0 if message.multiplexor is None else message.multiplexor.byte_count
+        self.byte_counts = np.array([max(s.byte_count, mux_bytes if s.mux is not None else 0)
+                                     for s in signals], dtype=np.uint8)
+        self.min_dlc = int(self.byte_counts.max()) if signals else 0  # frames this long have every signal
+        # The same tables as Python numbers, one tuple per signal, for decoding a few frames
+        self.rows = list(zip(self.big.tolist(), self.shifts.tolist(), self.masks.tolist(),
+                             self.sign_bits.tolist(), self.ranges.tolist(), self.scales.tolist(),
+                             self.offsets.tolist(), self.channels.tolist(), self.mux.tolist(),
+                             self.byte_counts.tolist()))
+        if message.multiplexor is not None:
+            m = message.multiplexor
+            self.mux_field = (m.byte_order == "big", m.shift, (1 << m.length) - 1)
+        else:
+            self.mux_field = None
+
+
+class CanDecoder:
+    """Decodes batches of CAN frames into samples of named gauge channels.
+
+    NumPy's fixed cost per call outweighs its speed on a few frames: on one frame
+    it is about ten times slower than a Python loop. Batches smaller than
+    scalar_batch are therefore decoded by a plain loop over the same tables;
+    can_benchmark.py measures where the two cross over on a given machine.
+    """
+    scalar_batch = 128  # crossover measured with can_benchmark.py on a desktop x86
+
+    def __init__(self, messages):
+        self.messages = sorted(messages, key=lambda m: m.id)
+        self.channels = []  # channel names; decode() refers to them by index
+        channel_index = {}
+        for message in self.messages:
+            for signal in message.signals:
+                if signal.channel not in channel_index:
+                    channel_index[signal.channel] = len(self.channels)
+                    self.channels.append(signal.channel)
+        self.ids = np.array([m.id for m in self.messages], dtype=np.uint32)
+        self.tables = [_MessageTable(m, channel_index) for m in self.messages]
+        self.tables_by_id = {m.id: table for m, table in zip(self.messages, self.tables)}
+        self.unknown = 0  # frames with an ID that has no definition
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(load_definitions(path))
+
+    def decode(self, frames):
+        """Decode a FRAME_DTYPE array.
+
+        Returns (rows, channels, values): for every sample, the index of its frame in
+        frames, the index of its channel in self.channels and its physical value, in
+        frame order (and signal order within a frame).
+        """
+        if len(frames) == 0 or len(self.ids) == 0:
+            return np.empty(0, np.intp), np.empty(0, np.intp), np.empty(0)
+        data = np.ascontiguousarray(frames["data"])
+        le = data.view("<u8")[:, 0]
+        be = data.view(">u8")[:, 0].astype(np.uint64)
+        if len(frames) < self.scalar_batch:
+            return self._decode_scalar(frames["id"].tolist(), frames["dlc"].tolist(), le.tolist(), be.tolist())
+
+        ids = frames["id"]
+        slots = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+        known = np.flatnonzero(self.ids[slots] == ids)
+        self.unknown += len(frames) - len(known)
+        # Group the known frames by message, keeping frame order within each group
+        known = known[np.argsort(slots[known], kind="stable")]
+        present, starts = np.unique(slots[known], return_index=True)
+
+        out_rows, out_channels, out_values = [], [], []
+        for slot, rows in zip(present, np.split(known, starts[1:])):
+            table = self.tables[slot]
+            # One row per frame, one column per signal
+            word = le[rows, None]
+            if table.any_big:
+                word = np.where(table.big, be[rows, None], word)
+            raw = (word >> table.shifts) & table.masks
+            values = raw.astype(np.float64)
+            if table.any_signed:
+                values -= ((raw & table.sign_bits) != 0) * table.ranges
+            values = values * table.scales + table.offsets
+
+            shape = values.shape
+            dlc = frames["dlc"][rows]
+            short = bool((dlc < table.min_dlc).any())
+            if table.multiplexor is not None or short:
+                present_signals = np.ones(shape, dtype=bool)
+                if table.multiplexor is not None:
+                    mux = table.multiplexor
+                    word = be[rows] if mux.byte_order == "big" else le[rows]
+                    selector = ((word >> np.uint64(mux.shift)) & np.uint64((1 << mux.length) - 1)).astype(np.int64)
+                    present_signals = (table.mux < 0) | (table.mux == selector[:, None])
+                if short:
+                    # The padding after a short frame's data is not a reading
+                    present_signals &= table.byte_counts <= dlc[:, None]
+                out_rows.append(np.broadcast_to(rows[:, None], shape)[present_signals])
+                out_channels.append(np.broadcast_to(table.channels, shape)[present_signals])
+                out_values.append(values[present_signals])
+            else:
+                out_rows.append(np.repeat(rows, shape[1]))
+                out_channels.append(np.tile(table.channels, shape[0]))
+                out_values.append(values.ravel())
+
+        if not out_rows:
+            return np.empty(0, np.intp), np.empty(0, np.intp), np.empty(0)
+        rows = np.concatenate(out_rows)
+        order = np.argsort(rows, kind="stable")
+        return rows[order], np.concatenate(out_channels)[order], np.concatenate(out_values)[order]
+
+    def _decode_scalar(self, ids, dlcs, le, be):
+        """decode() of a few frames, as a loop over each frame's signals."""
+        out_rows, out_channels, out_values = [], [], []
+        tables = self.tables_by_id
+        for row, frame_id in enumerate(ids):
+            table = tables.get(frame_id)
+            if table is None:
+                self.unknown += 1
+                continue
+            selector = -1
+            if table.mux_field is not None:
+                big, shift, mask = table.mux_field
+                selector = ((be[row] if big else le[row]) >> shift) & mask
+            dlc = dlcs[row]
+            for big, shift, mask, sign_bit, span, scale, offset, channel, mux, byte_count in table.rows:
+                if (mux >= 0 and mux != selector) or byte_count > dlc:
+                    continue
+                raw = ((be[row] if big else le[row]) >> shift) & mask
+                value = float(raw)
+                if raw & sign_bit:
+                    value -= span
+                out_rows.append(row)
+                out_channels.append(channel)
+                out_values.append(value * scale + offset)
+        return (np.array(out_rows, dtype=np.intp), np.array(out_channels, dtype=np.intp),
+                np.array(out_values, dtype=np.float64))
+
+    def message(self, frame_id):
+        """The CanMessage with ID frame_id. Raises KeyError if there is none."""
+        slot = int(np.searchsorted(self.ids, frame_id))
+        if slot == len(self.ids) or self.ids[slot] != frame_id:
+            raise KeyError(f"No CAN message defined with ID 0x{frame_id:X}")
+        return self.messages[slot]
+
+    def latest(self, channels, values):
+        """{channel name: value} of the last sample of each channel in a decode() result."""
+        if len(channels) == 0:
+            return {}
+        reversed_channels = channels[::-1]
+        found, first = np.unique(reversed_channels, return_index=True)
+        last = len(channels) - 1 - first
+        return {self.channels[c]: v for c, v in zip(found.tolist(), values[last].tolist())}
+
+    def encode(self, frame_id, values, mux=None):
+        """Data bytes of frames of message frame_id: the inverse of decode(), for test buses.
+
+        Args:
+            frame_id (int): message ID; KeyError if no message has it.
+            values (dict): physical values by signal name, each a scalar or an array (one per
+                frame). Signals left out are sent as raw 0.
+            mux (int, optional): multiplexor value; only its signals are encoded. Defaults to None.
+
+        Returns:
+            np.ndarray: (frames, 8) uint8 data.
+        """
+        message = self.message(frame_id)
+        count = max((np.size(v) for v in values.values()), default=1)
+        le = np.zeros(count, dtype=np.uint64)
+        be = np.zeros(count, dtype=np.uint64)
+        fields = [(s, values.get(s.name)) for s in message.signals if s.mux is None or s.mux == mux]
+        if message.multiplexor is not None and mux is not None:
+            m = message.multiplexor
+            fields.append((m, mux * m.scale + m.offset))
+        for signal, value in fields:
+            if value is None:
+                continue
+            raw = np.rint((np.asarray(value, dtype=np.float64) - signal.offset) / signal.scale)
+            if signal.signed:
+                raw = np.clip(raw, -(2.0 ** (signal.length - 1)), 2.0 ** (signal.length - 1) - 1)
+                raw = np.where(raw < 0, raw + 2.0 ** signal.length, raw)
+            else:
+                raw = np.clip(raw, 0, 2.0 ** signal.length - 1)
+            field = (raw.astype(np.uint64) & np.uint64((1 << signal.length) - 1)) << np.uint64(signal.shift)
+            if signal.byte_order == "big":
+                be |= field
+            else:
+                le |= field
+        data = le.astype("<u8").view(np.uint8).reshape(count, 8)
+        return data | be.astype(">u8").view(np.uint8).reshape(count, 8)
+
+
+# ===================== Buses =====================
+class CanBus:
+    """A CAN interface through python-can, such as socketcan:can0 or pcan:PCAN_USBBUS1."""
+    def __init__(self, interface, channel, bitrate=None, batch=256):
+        self.interface = interface
+        self.channel = channel
+        self.bitrate = bitrate
+        self.batch = batch
+        self.bus = None
+
+    def open(self):
+        import can  # optional dependency, only needed for real CAN interfaces
+        options = {} if self.bitrate is None else {"bitrate": self.bitrate}
+        self.bus = can.Bus(interface=self.interface, channel=self.channel, **options)
+
+    def read_frames(self):
+        """Wait up to 0.2 s for a frame, then take whatever else has arrived, up to batch frames."""
+        frames = empty_frames(self.batch)
+        count = 0
+        message = self.bus.recv(0.2)
+        while message is not None:
+            if not (message.is_error_frame or message.is_remote_frame):
+                frame = frames[count]
+                frame["timestamp"] = message.timestamp
+                frame["id"] = message.arbitration_id
+                frame["dlc"] = min(message.dlc, 8)
+                frame["data"][:frame["dlc"]] = message.data[:8]
+                count += 1
+                if count == self.batch:
+                    break
+            message = self.bus.recv(0)
+        return frames[:count]
+
+    def close(self):
+        if self.bus is not None:
+            self.bus.shutdown()
+            self.bus = None
+
+
+class VirtualBus:
+    """Stand-in for a CAN interface that sends every message of a decoder's definitions in
+    turn (each multiplexor value of a multiplexed one), with every signal sweeping slowly
+    between its minimum and maximum."""
+    def __init__(self, decoder, rate=1000):
+        """_summary_
+
+        Args:
+            decoder (CanDecoder): definitions of the messages sent.
+            rate (float, optional): frames per second sent by read_frames(). Defaults to 1000.
+        """
+        self.decoder = decoder
+        self.rate = rate
+        self.schedule = [(m.id, mux) for m in decoder.messages for mux in m.mux_values()]
+        self.sent = 0
+        self._start = None
+
+    def open(self):
+        self._start = time.monotonic()
+        self.sent = 0
+
+    def generate(self, count, first=0):
+        """Frames first to first + count of the sequence, timestamped at the bus rate."""
+        frames = empty_frames(count)
+        index = np.arange(first, first + count)
+        frames["timestamp"] = index / self.rate
+        if not self.schedule:
+            return frames
+        for turn, (frame_id, mux) in enumerate(self.schedule):
+            rows = np.flatnonzero(index % len(self.schedule) == turn)
+            if len(rows) == 0:
+                continue
+            t = index[rows] / self.rate
+            message = self.decoder.message(frame_id)
+            values = {}
+            for i, signal in enumerate(message.signals):
+                if signal.mux is None or signal.mux == mux:
+                    middle = (signal.minimum + signal.maximum) / 2
+                    half = (signal.maximum - signal.minimum) / 2
+                    values[signal.name] = middle + half * np.sin(2 * math.pi * t / (7.0 + 3.0 * i))
+            frames["id"][rows] = frame_id
+            frames["dlc"][rows] = 8
+            frames["data"][rows] = self.decoder.encode(frame_id, values, mux)
+        return frames
+
+    def read_frames(self):
+        """The frames due since the last call, after waiting 10 ms."""
+        time.sleep(0.01)
+        due = int((time.monotonic() - self._start) * self.rate)
+        frames = self.generate(due - self.sent, self.sent)
+        self.sent = due
+        return frames
+
+    def close(self):
+        pass
+
+
+def parse_candump_line(line):
+    """Parse a candump -l line, "(1436509053.850870) can0 0C9#8000000000000000".
+
+    Returns (timestamp, id, data bytes) or None for anything else (CAN FD, remote frames, junk).
+    """
+    parts = line.split()
+    if len(parts) != 3 or not parts[0].startswith("("):
+        return None
+    frame_id, sep, data = parts[2].partition("#")
+    if not sep or data.startswith(("#", "R")) or len(data) > 16 or len(data) % 2:
+        return None
+    try:
+        return float(parts[0].strip("()")), int(frame_id, 16), bytes.fromhex(data)
+    except ValueError:
+        return None
+
+
+class CandumpFile:
+    """Stand-in for a CAN interface that replays a log written by candump -l.
+
+    speed 1.0 replays in real time, 4.0 four times as fast, and 0 as fast as possible.
+    """
+    def __init__(self, path, speed=1.0, loop=True, batch=256):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.batch = batch
+        self.file = None
+        self.finished = False
+        self.malformed = 0
+        self._pending = None
+        self._start_wall = None
+        self._start_time = None
+
+    def open(self):
+        self.file = open(self.path, "r")
+        self._restart()
+
+    def _restart(self):
+        self.file.seek(0)
+        self._pending = None
+        self._start_wall = time.monotonic()
+        self._start_time = None
+
+    def _next_frame(self):
+        while True:
+            line = self.file.readline()
+            if not line:
+                return None
+            frame = parse_candump_line(line)
+            if frame is not None:
+                return frame
+            if line.strip():
+                self.malformed += 1
+
+    def read_frames(self):
+        frames = empty_frames(self.batch)
+        count = 0
+        while count < self.batch:
+            frame = self._pending or self._next_frame()
+            self._pending = None
+            if frame is None:
+                if self.loop and self._start_time is not None:
+                    self._restart()
+                    continue
+                self.finished = True
+                time.sleep(0.05)
+                break
+            t, frame_id, data = frame
+            if self._start_time is None:
+                self._start_time = t
+            if self.speed:
+                wait = (t - self._start_time) / self.speed - (time.monotonic() - self._start_wall)
+                if wait > 0:
+                    self._pending = frame
+                    if not count:
+                        time.sleep(min(wait, 0.05))
+                    break
+            record = frames[count]
+            record["timestamp"] = t
+            record["id"] = frame_id
+            record["dlc"] = len(data)
+            record["data"][:len(data)] = np.frombuffer(data, dtype=np.uint8)
+            count += 1
+        return frames[:count]
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def write_candump(path, frames, interface="can0"):
+    """Write a FRAME_DTYPE array as a candump -l log, e.g. VirtualBus frames for CandumpFile."""
+    with open(path, "w") as f:
+        for frame in frames:
+            data = bytes(frame["data"][:frame["dlc"]]).hex().upper()
+            f.write(f"({frame['timestamp']:.6f}) {interface} {int(frame['id']):03X}#{data}\n")
+
+
+# ===================== Telemetry Source =====================
+class CanSource(TelemetrySource):
+    """Reads frames from a bus in batches and hands their decoded samples to a TelemetryIngestor."""
+    def __init__(self, decoder, bus, latest_only=False):
+        """_summary_
+
+        Args:
+            decoder (CanDecoder): signal definitions.
+            bus (CanBus | VirtualBus | CandumpFile): where frames come from.
+            latest_only (bool, optional): pass on only the last sample of each channel per
+                batch. The gauges only show that one, but a recording would miss the others.
+                Defaults to False.
+        """
+        self.decoder = decoder
+        self.bus = bus
+        self.latest_only = latest_only
+        self.frames = 0
+
+    def open(self):
+        self.bus.open()
+
+    def read(self):
+        frames = self.bus.read_frames()
+        self.frames += len(frames)
+        _, channels, values = self.decoder.decode(frames)
+        if self.latest_only:
+            return list(self.decoder.latest(channels, values).items())
+        names = self.decoder.channels
+        return [(names[c], v) for c, v in zip(channels.tolist(), values.tolist())]
+
+    def close(self):
+        self.bus.close()
+
+
+def source_from_spec(arg):
+    """CanSource from the part of a can: spec after the colon: DEFS@virtual[@RATE],
+    DEFS@file:PATH[@SPEED] or DEFS@INTERFACE:CHANNEL[@BITRATE]."""
+    definitions, _, bus_spec = arg.partition("@")
+    if not bus_spec:
+        raise ValueError("can: telemetry needs a bus, e.g. can:signals.json@socketcan:can0")
+    decoder = CanDecoder.from_file(definitions)
+    bus_spec, _, extra = bus_spec.partition("@")
+    kind, _, target = bus_spec.partition(":")
+    if kind == "virtual":
+        bus = VirtualBus(decoder, rate=float(extra or 1000))
+    elif kind == "file":
+        bus = CandumpFile(target, speed=float(extra or 1.0))
+    else:
+        bus = CanBus(kind, target, bitrate=int(extra) if extra else None)
+    return CanSource(decoder, bus)
@@ -0,0 +1,218 @@
+"""Single-surface compositor for the dashboard.
+
+Instead of one QWidget (plus a DraggableGauge wrapper and layout) per instrument,
+every instrument is a lightweight CanvasItem drawn by one DashboardCanvas widget
+in a single paintEvent. Items track their own dirty regions, and the canvas only
+repaints the items that intersect the region being updated.
+
+Items expose the same name, x(), y(), width(), setFixedSize() and set_size()
+as the DraggableGauge wrappers in speedometer_app.py, so dragging, the setup
+dialog and the saved layout file work unchanged.
+"""
+from PySide6.QtWidgets import QWidget
+from PySide6.QtGui import QPainter, QRegion
+from PySide6.QtCore import Qt, QPoint, QRect, QSize, QTimer
+
+from CustomGauge import GaugeDial, TurnSignalArrow, AlertIndicator
+from frame_scheduler import frame_interval_ms, request_update
+
+
+class CanvasItem:
+    """Geometry and invalidation for an instrument drawn on a DashboardCanvas."""
+    def _init_item(self, name, width, height, draggable=True):
+        self.name = name
+        self.canvas = None
+        self.draggable = draggable
+        self.visible = True
+        self._geometry = QRect(0, 0, width, height)
+
+    def x(self):
+        return self._geometry.x()
+
+    def y(self):
+        return self._geometry.y()
+
+    def width(self):
+        return self._geometry.width()
+
+    def height(self):
+        return self._geometry.height()
+
+    def rect(self):
+        return QRect(0, 0, self._geometry.width(), self._geometry.height())
+
+    def geometry(self):
+        return QRect(self._geometry)
+
+    def devicePixelRatioF(self):
+        return self.canvas.devicePixelRatioF() if self.canvas is not None else 1.0
+
+    def move(self, x, y=None):
+        """Move the item's top-left corner to (x, y) or to a QPoint."""
+        if y is None:
+            x, y = x.x(), x.y()
+        old = self.geometry()
+        self._geometry.moveTo(x, y)
+        if self.canvas is not None:
+            request_update(self.canvas, QRegion(old) + QRegion(self._geometry))
+
+    def setFixedSize(self, width, height):
+        old = self.geometry()
+        self._geometry.setSize(QSize(width, height))
+        if self.canvas is not None:
+            request_update(self.canvas, QRegion(old) + QRegion(self._geometry))
+
+    def set_size(self, size):
+        self.setFixedSize(size, size)
+
+    def set_visible(self, visible):
+        """Show or hide the item, repainting the canvas under it."""
+        if visible == self.visible:
+            return
+        self.visible = visible
+        if self.canvas is not None:
+            request_update(self.canvas, self.geometry())
+
+    def _invalidate(self, region=None):
+        """Repaint region (item coordinates) of this item, or all of it."""
+        if self.canvas is not None and self.visible:
+            self.canvas.invalidate_item(self, region)
+
+    def paint(self, painter, region):
+        """Draw the item. painter is translated to the item's top-left and clipped to region."""
+        raise NotImplementedError
+
+
+class GaugeItem(CanvasItem, GaugeDial):
+    """A CustomGauge drawn on a DashboardCanvas."""
+    def __init__(self, name, size=200, draggable=True, **dial_options):
+        """_summary_
+
+        Args:
+            name (str): name used for the saved layout.
+            size (int, optional): width and height in pixels. Defaults to 200.
+            draggable (bool, optional): whether the item can be dragged. Defaults to True.
+            **dial_options: same options as CustomGauge.
+        """
+        self._init_item(name, size, size, draggable)
+        self._init_dial(**dial_options)
+
+    def set_visible(self, visible):
+        super().set_visible(visible)
+        self._set_shown(visible)
+
+    def paint(self, painter, region):
+        self.paint_dial(painter, region)
+
+
+class SignalItem(CanvasItem, TurnSignalArrow):
+    """A TurnSignal drawn on a DashboardCanvas."""
+    def __init__(self, name, direction="left", color="green", size=60, draggable=True):
+        self._init_item(name, size, size, draggable)
+        self._init_signal(direction, color)
+
+    def paint(self, painter, region):
+        self.paint_signal(painter)
+
+
+class AlertItem(CanvasItem, AlertIndicator):
+    """An AlertIcon drawn on a DashboardCanvas."""
+    def __init__(self, name, icon_path, label="", active_color="red", inactive_color="gray", draggable=True):
+        self._init_item(name, 50, 65, draggable)
+        self._init_alert(icon_path, label, active_color, inactive_color)
+
+    def paint(self, painter, region):
+        self.paint_alert(painter)
+
+
+class DashboardCanvas(QWidget):
+    """One widget that composites every dashboard item in a single paint pass."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.items = []  # in paint order, last on top
+        self._drag_item = None
+        self._drag_offset = QPoint()
+        self._drag_start = QPoint()
+        self._drag_target = None
+        self.on_item_moved = []  # callbacks receiving each item a drag has moved
+        # A drag moves its item at most once per frame, to the latest mouse position
+        self._drag_timer = QTimer(self)
+        self._drag_timer.setSingleShot(True)
+        self._drag_timer.timeout.connect(self._apply_drag)
+        # The canvas paints its own background, so Qt can skip erasing it
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def add_item(self, item, x=0, y=0):
+        item.canvas = self
+        item.move(x, y)
+        self.items.append(item)
+        return item
+
+    def item(self, name):
+        return next((i for i in self.items if i.name == name), None)
+
+    def invalidate_item(self, item, region=None):
+        """Schedule a repaint of region (item coordinates) of item, or the whole item, when the
+        item's refresh class lets it."""
+        geometry = item.geometry()
+        if region is None:
+            request_update(self, geometry, item)
+        elif isinstance(region, QRect):
+            request_update(self, region.translated(geometry.topLeft()).intersected(geometry), item)
+        else:
+            request_update(self, QRegion(region).translated(geometry.x(), geometry.y()).intersected(geometry),
+                           item)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        region = event.region()
+        background = self.palette().window()
+        for r in region:
+            painter.fillRect(r, background)
+
+        for item in self.items:
+            if not item.visible:
+                continue
+            geometry = item.geometry()
+            if not region.intersects(geometry):
+                continue
+            local = region.intersected(geometry).translated(-geometry.x(), -geometry.y())
+            painter.save()
+            painter.translate(geometry.x(), geometry.y())
+            painter.setClipRegion(local)
+            item.paint(painter, local)
+            painter.restore()
+
+    # ===================== Dragging =====================
+    def mousePressEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            return
+        pos = event.position().toPoint()
+        for item in reversed(self.items):
+            if item.visible and item.draggable and item.geometry().contains(pos):
+                self._drag_item = item
+                self._drag_start = QPoint(item.x(), item.y())
+                self._drag_offset = pos - self._drag_start
+                return
+
+    def mouseMoveEvent(self, event):
+        if self._drag_item is not None and event.buttons() & Qt.LeftButton:
+            self._drag_target = event.position().toPoint() - self._drag_offset
+            if not self._drag_timer.isActive():
+                self._drag_timer.start(frame_interval_ms())
+
+    def _apply_drag(self):
+        if self._drag_item is not None and self._drag_target is not None:
+            self._drag_item.move(self._drag_target)
+        self._drag_target = None
+
+    def mouseReleaseEvent(self, event):
+        item = self._drag_item
+        if item is None:
+            return
+        self._drag_timer.stop()
+        self._apply_drag()
+        self._drag_item = None
+        if QPoint(item.x(), item.y()) != self._drag_start:
+            for callback in self.on_item_moved:
+                callback(item)
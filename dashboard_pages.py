@@ -0,0 +1,293 @@
+"""Multi-page dashboards with lazily built pages.
+
+A dashboard is a list of Pages (say a driving view, an engine view and a track
+view), each a list of instruments. Pages come from a JSON config file; without
+one there is a single page holding every built-in instrument.
+
+A page's widgets (or canvas items) are only built the first time it is shown,
+and only the visible page's instruments receive updates. Every channel's latest
+value lives in a ChannelValue, which telemetry feeds whatever page is showing,
+so a hidden page costs one attribute store per sample and is brought up to
+date the moment it is shown.
+
+Config file:
+
+    {"pages": [
+        {"name": "drive", "instruments": ["MPH", "RPM", "LEFT_SIGNAL", "RIGHT_SIGNAL"]},
+        {"name": "engine", "instruments": [
+            "OIL", "WATER", {"name": "RPM", "size": 300, "pos": [500, 60]},
+            {"name": "BOOST", "gauge": {"label": "BOOST", "units": "PSI", "min_value": -15,
+                                        "max_value": 30, "major_tick": 5, "minor_tick": 1}}
+        ]}
+    ]}
+
+An instrument is the name of a built-in one, or an object naming one with any of
+"size", "pos" and "channel" overridden. An object with "gauge" options defines a
+new gauge (or changes a built-in one); colors are given as color names.
+"""
+import json
+import os
+
+from PySide6.QtGui import QColor
+
+from gauge_history import GaugeHistory, history_spec
+
+# Name of the only page when there is no config file
+DEFAULT_PAGE = "main"
+
+# Channel carrying the odometer total, shown by every gauge built with odometer=True
+ODOMETER_CHANNEL = "ODOMETER"
+
+COLOR_OPTIONS = ("needle_color", "dial_color")
+
+
+def _set_signal(signal, on):
+    if on:
+        signal.start()
+    else:
+        signal.stop()
+
+
+# How a channel's value is applied to an instrument showing it, by instrument kind
+APPLY = {
+    "gauge": lambda gauge, value: gauge.set_value(value),
+    "alert": lambda alert, active: alert.set_active(bool(active)),
+    "signal": _set_signal,
+    "odometer": lambda gauge, distance: gauge.set_odometer(distance),
+}
+
+
+class ChannelValue:
+    """Latest value of one channel, passed on to the instruments of the visible page.
+
+    If history is set, the channel records it and its gauges show that history,
+    so peaks and sparklines keep running while their page is hidden.
+    """
+    def __init__(self, name, kind="gauge", value=None, history=None):
+        self.name = name
+        self.kind = kind
+        self.value = value
+        self.history = history
+        self.instruments = []  # bound instruments on the visible page
+
+    def set_value(self, value, timestamp=None):
+        """Store value and show it on the bound instruments. timestamp (default now) is
+        what the history records it at; an offscreen export passes the frame's time."""
+        self.value = value
+        if self.history is not None:
+            self.history.add(value, timestamp)
+        apply = APPLY[self.kind]
+        for instrument in self.instruments:
+            apply(instrument, value)
+
+    def bind(self, instrument):
+        self.instruments.append(instrument)
+        if self.history is not None and instrument.history is not None:
+            instrument.use_history(self.history)
+        if self.value is None:
+            return
+        APPLY[self.kind](instrument, self.value)
+        if self.kind == "gauge" and instrument.animator is not None:
+            # A page being shown jumps straight to the current value
+            instrument.animator.snap(instrument)
+
+    def unbind(self, instrument):
+        if instrument in self.instruments:
+            self.instruments.remove(instrument)
+
+
+class PageEntry:
+    """One instrument on a page: what to build, what feeds it and where it goes."""
+    def __init__(self, kind, name, options, size=None, pos=(0, 0), channel=None):
+        """_summary_
+
+        Args:
+            kind (str): "gauge", "alert" or "signal".
+            name (str): name used for the saved layout, unique within the page.
+            options (dict): constructor options of the instrument.
+            size (int, optional): default width and height. None keeps the instrument's own.
+            pos (tuple, optional): default position. Defaults to (0, 0).
+            channel (str, optional): channel shown by the instrument. Defaults to name.
+        """
+        self.kind = kind
+        self.name = name
+        self.options = options
+        self.size = size
+        self.pos = tuple(pos)
+        self.channel = channel or name
+
+    def channels(self):
+        """(channel, kind) pairs this instrument is bound to."""
+        bound = [(self.channel, self.kind)]
+        if self.kind == "gauge" and self.options.get("odometer"):
+            bound.append((ODOMETER_CHANNEL, "odometer"))
+        return bound
+
+
+class Page:
+    """A named set of instruments, built on first show."""
+    def __init__(self, name, entries):
+        self.name = name
+        self.entries = entries
+        self.built = False
+        self.visible = False
+        self.container = None  # QWidget holding the page in widget mode
+        self.placed = []       # draggable wrappers (or canvas items) in save order
+        self.instruments = {}  # by entry name
+        self.scales = {}
+        self.draggable = False
+
+    def bindings(self):
+        """(channel, kind, instrument) for every instrument of a built page."""
+        for entry in self.entries:
+            instrument = self.instruments[entry.name]
+            for channel, kind in entry.channels():
+                yield channel, kind, instrument
+
+    def instruments_of(self, kind):
+        return [self.instruments[e.name] for e in self.entries if e.kind == kind and self.built]
+
+
+class PageManager:
+    """Owns the pages and channel values, and switches the visible page.
+
+    build(page) constructs the page's instruments and fills in page.placed,
+    page.instruments, page.scales and page.draggable. show(page) and hide(page)
+    make them visible or not (a QStackedLayout page, or canvas item visibility).
+    """
+    def __init__(self, pages, build, show, hide):
+        if not pages:
+            raise ValueError("A dashboard needs at least one page")
+        self.pages = pages
+        self._build = build
+        self._show = show
+        self._hide = hide
+        self.current = None
+        self.on_built = []  # callbacks receiving each page right after it is built
+
+        self.channels = {}
+        specs = {}  # channel -> history_spec() of each gauge showing it
+        for page in pages:
+            for entry in page.entries:
+                for channel, kind in entry.channels():
+                    if channel not in self.channels:
+                        initial = False if kind in ("alert", "signal") else None
+                        self.channels[channel] = ChannelValue(channel, kind, initial)
+                    if kind == "gauge":
+                        spec = history_spec(**entry.options)
+                        if spec is not None:
+                            specs.setdefault(channel, []).append(spec)
+        for channel, channel_specs in specs.items():
+            # One history per channel, covering what every gauge on it shows
+            windows = sorted({w for spec in channel_specs for w in spec[0]})
+            trail = max(spec[1] for spec in channel_specs)
+            self.channels[channel].history = GaugeHistory(windows, trail)
+
+    def page(self, name):
+        return next((p for p in self.pages if p.name == name), None)
+
+    def channel(self, name):
+        return self.channels.get(name)
+
+    def add_channel(self, name):
+        """The value channel name, created if no page shows it (say, one only alert rules read)."""
+        if name not in self.channels:
+            self.channels[name] = ChannelValue(name)
+        return self.channels[name]
+
+    def value_channels(self):
+        """Names of the channels fed by telemetry (everything shown on a gauge)."""
+        return [name for name, c in self.channels.items() if c.kind == "gauge"]
+
+    def set_value(self, channel, value, timestamp=None):
+        target = self.channels.get(channel)
+        if target is not None:
+            target.set_value(value, timestamp)
+
+    def show_page(self, page):
+        """Make page (a Page, name or index) the visible one, building it if needed."""
+        if isinstance(page, int):
+            page = self.pages[page % len(self.pages)]
+        elif isinstance(page, str):
+            page = self.page(page)
+        if page is None or page is self.current:
+            return self.current
+
+        old = self.current
+        if old is not None:
+            for channel, kind, instrument in old.bindings():
+                self.channels[channel].unbind(instrument)
+                if kind == "gauge" and instrument.animator is not None:
+                    instrument.animator.snap(instrument)
+                elif kind == "signal":
+                    instrument.stop()  # stop blinking, so a hidden page never wakes the clock
+            old.visible = False
+            self._hide(old)
+
+        if not page.built:
+            self._build(page)
+            page.built = True
+            for callback in self.on_built:
+                callback(page)
+        for channel, kind, instrument in page.bindings():
+            self.channels[channel].bind(instrument)
+        page.visible = True
+        self.current = page
+        self._show(page)
+        return page
+
+    def next_page(self, step=1):
+        index = self.pages.index(self.current) if self.current is not None else -step
+        return self.show_page(index + step)
+
+    def built_pages(self):
+        return [p for p in self.pages if p.built]
+
+
+def entry_from_config(item, catalog):
+    """Turn one "instruments" item of the config into a PageEntry.
+
+    Args:
+        item (str | dict): a catalog name, or an object as described in the module docstring.
+        catalog (dict): built-in instruments by name, as PageEntry objects.
+    """
+    if isinstance(item, str):
+        item = {"name": item}
+    name = item["name"]
+    base = catalog.get(name)
+    if base is None and "gauge" not in item:
+        raise ValueError(f"Unknown instrument {name!r}: not built in and no gauge options given")
+
+    kind = base.kind if base is not None else "gauge"
+    options = dict(base.options) if base is not None else {}
+    if "gauge" in item:
+        if kind != "gauge":
+            raise ValueError(f"Instrument {name!r} is not a gauge")
+        overrides = dict(item["gauge"])
+        for key in COLOR_OPTIONS:
+            if key in overrides:
+                overrides[key] = QColor(overrides[key])
+        options.update(overrides)
+    default_size = base.size if base is not None else 200
+    default_pos = base.pos if base is not None else (0, 0)
+    return PageEntry(kind, name, options, size=item.get("size", default_size),
+                     pos=item.get("pos", default_pos),
+                     channel=item.get("channel", base.channel if base is not None else name))
+
+
+def load_pages(path, catalog):
+    """Read the page config at path. Without one, returns a single page of the whole catalog."""
+    if not path or not os.path.exists(path):
+        return [Page(DEFAULT_PAGE, list(catalog.values()))]
+    with open(path, "r") as f:
+        data = json.load(f)
+    pages = []
+    for page in data.get("pages", []):
+        entries = [entry_from_config(item, catalog) for item in page.get("instruments", [])]
+        names = [e.name for e in entries]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Page {page['name']!r} lists an instrument twice")
+        pages.append(Page(page["name"], entries))
+    if len({p.name for p in pages}) != len(pages):
+        raise ValueError(f"{path}: page names must be unique")
+    return pages
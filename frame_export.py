@@ -0,0 +1,334 @@
+"""Render a recorded drive into dashboard frames, offscreen and in parallel.
+
+Takes a recording made with speedometer_app.py --record and renders the
+dashboard's canvas layout (positions and sizes from gauge_positions.json) at a
+fixed frame rate, as PNG files or one raw video stream:
+
+    python frame_export.py drive.gtrc --png frames/
+    python frame_export.py drive.gtrc --raw drive.bgra --fps 30 --start 60 --end 120
+    python frame_export.py drive.gtrc --raw - | ffmpeg -f rawvideo -pix_fmt bgra -s 1200x500 -r 30 -i - drive.mp4
+
+Frame k shows every channel's last sample at or before k / fps seconds into the
+drive. Time never comes from the wall clock: needles and blinkers run on a
+manual AnimationClock stepped one frame at a time, and histories and alert rules
+are given each frame's time, so the same recording and options always produce
+the same pixels. A SHA-256 of every frame is written with --manifest, and
+--compare checks a new export against one, which makes an export double as a
+visual regression test (on the same Qt version and fonts).
+
+The frames are split into chunks rendered by a pool of processes. A worker
+replays the frames before its chunk without painting them, so the needles,
+histories and odometer are where they would be in a full run.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6 import __version__ as pyside_version
+from PySide6.QtCore import QPoint, qVersion
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QApplication
+
+from alert_rules import AlertEngine, load_rules, parse_rule
+from animation import AnimationClock, NeedleAnimator, install_clock
+from dashboard_canvas import DashboardCanvas
+from dashboard_pages import PageManager, load_pages, ODOMETER_CHANNEL
+from recorder import Recording
+from speedometer_app import (ALERT_RULES, PAGES_FILE, POSITIONS_FILE, build_canvas_page,
+                             builtin_catalog, load_positions_and_scales)
+
+NAN = float("nan")
+
+
+# ===================== Frame Table =====================
+def frame_table(path, fps):
+    """Sample the recording at path once per frame.
+
+    Returns (frames, {channel: array("d")}) where column[k] is the channel's last
+    value at or before k / fps seconds after the first sample, or NaN before its first.
+    """
+    recording = Recording(path)
+    try:
+        columns = {name: array("d") for name in recording.channels}
+        if not recording.chunks:
+            return 0, columns
+        current = {name: NAN for name in recording.channels}
+        t0 = None
+        frames = 0
+
+        def emit_until(t, inclusive):
+            nonlocal frames
+            while t0 + frames / fps < t or (inclusive and t0 + frames / fps == t):
+                for name, value in current.items():
+                    columns[name].append(value)
+                frames += 1
+
+        for index in range(len(recording.chunks)):
+            times, values = recording.columns(index)
+            chunk_columns = list(values.items())
+            if t0 is None:
+                t0 = times[0]
+            for row, t in enumerate(times):
+                emit_until(t, False)
+                for name, column in chunk_columns:
+                    value = column[row]
+                    if value == value:
+                        # float32 in the file; keep 88.4 from reading as 88.40000152587891
+                        current[name] = float(f"{value:.7g}")
+            last = times[-1]
+            for view in (times, *values.values()):
+                view.release()
+        emit_until(last, True)
+        return frames, columns
+    finally:
+        recording.close()
+
+
+# ===================== Renderer =====================
+class DashboardRenderer:
+    """One offscreen dashboard page that is stepped through a frame table."""
+    def __init__(self, columns, options):
+        """_summary_
+
+        Args:
+            columns (dict): frame table columns by channel, from frame_table().
+            options (dict): export options; see export_options().
+        """
+        self.fps = options["fps"]
+        self.t = 0.0  # drive time of the frame last stepped, in seconds
+        self.clock = AnimationClock(fps=self.fps, manual=True)
+        install_clock(self.clock)
+        animator = None
+        if options["needle"] != "off":
+            animator = NeedleAnimator(self.clock, mode=options["needle"])
+
+        self.canvas = DashboardCanvas()
+        self.canvas.resize(*options["size"])
+
+        def build(page):
+            setup_data = load_positions_and_scales(page.name, options["layout"])
+            page.draggable = False
+            page.placed, page.instruments, page.scales = build_canvas_page(page, self.canvas, setup_data, False)
+            for gauge in page.instruments_of("gauge"):
+                if animator is not None:
+                    animator.attach(gauge)
+
+        pages = load_pages(options["pages"], builtin_catalog())
+        self.pages = PageManager(pages, build, lambda page: None, lambda page: None)
+        for channel in self.pages.channels.values():
+            if channel.history is not None:
+                # Histories are fed the drive's time, so their windows must expire by it too
+                channel.history.clock = lambda: self.t
+        self.pages.show_page(options["page"] or 0)
+
+        rules = load_rules(options["alert_rules"]) if options["alert_rules"] else ALERT_RULES
+        for _, rule in rules:
+            self.pages.add_channel(parse_rule(rule)[0])
+        self.alert_engine = AlertEngine(rules, self.pages.channels, self.pages.set_value)
+
+        self.columns = [(name, column) for name, column in columns.items() if name in self.pages.channels]
+        # Without a recorded odometer it is integrated from the speed, like the live dashboard does
+        self.odometer = None if ODOMETER_CHANNEL in columns else options["odometer"]
+        self.speed = self.pages.channel("MPH")
+        self.frame = 0
+        self.image = QImage(options["size"][0], options["size"][1], QImage.Format_ARGB32)
+
+    def step(self):
+        """Advance the dashboard to the next frame without painting it."""
+        k = self.frame
+        t = self.t = k / self.fps
+        if k:
+            self.clock.advance(1 / self.fps)
+        for name, column in self.columns:
+            value = column[k]
+            if value == value:
+                self.pages.set_value(name, value, t)
+        if self.odometer is not None:
+            if k and self.speed is not None:
+                self.odometer += (self.speed.value or 0.0) / self.fps / 3600
+            self.pages.set_value(ODOMETER_CHANNEL, self.odometer)
+        self.alert_engine.evaluate(t)
+        self.frame += 1
+
+    def render(self):
+        """Paint the current frame into self.image and return its SHA-256."""
+        self.image.fill(0)
+        painter = QPainter(self.image)
+        self.canvas.render(painter, QPoint())
+        painter.end()
+        return hashlib.sha256(self.image.constBits()).hexdigest()
+
+
+# ===================== Workers =====================
+_worker = {}
+
+
+def _init_worker(columns, options):
+    _worker["app"] = QApplication.instance() or QApplication(sys.argv[:1])
+    _worker["columns"] = columns
+    _worker["options"] = options
+    _worker["renderer"] = None
+
+
+def _render_chunk(start, end):
+    """Render frames [start, end). Returns their hashes. Chunks are handed out in order, so a
+    worker usually only replays the frames other workers rendered since its last chunk."""
+    options = _worker["options"]
+    renderer = _worker["renderer"]
+    if renderer is None or renderer.frame > start:
+        renderer = _worker["renderer"] = DashboardRenderer(_worker["columns"], options)
+    while renderer.frame < start:
+        renderer.step()
+
+    hashes = []
+    raw = None
+    if options["parts"] is not None:
+        raw = open(os.path.join(options["parts"], f"{start:08d}.part"), "wb")
+    try:
+        for k in range(start, end):
+            renderer.step()
+            hashes.append(renderer.render())
+            if raw is not None:
+                raw.write(renderer.image.constBits())
+            if options["png"] is not None:
+                renderer.image.save(os.path.join(options["png"], f"frame_{k:06d}.png"), "PNG")
+    finally:
+        if raw is not None:
+            raw.close()
+    return hashes
+
+
+# ===================== Export =====================
+def export_options(args, parts=None):
+    """The options every worker needs, as a plain (picklable) dict."""
+    width, _, height = args.size.partition("x")
+    return {
+        "fps": args.fps, "size": (int(width), int(height)), "needle": args.needle,
+        "pages": args.pages, "page": args.page, "layout": args.layout,
+        "alert_rules": args.alert_rules, "odometer": args.odometer,
+        "png": args.png, "parts": parts,
+    }
+
+
+def export(columns, first, last, options, workers, chunk):
+    """Render frames [first, last). Yields (start, hashes) per chunk, in frame order."""
+    chunks = [(start, min(start + chunk, last)) for start in range(first, last, chunk)]
+    if workers <= 1 or len(chunks) <= 1:
+        _init_worker(columns, options)
+        for start, end in chunks:
+            yield start, _render_chunk(start, end)
+        return
+    pool = ProcessPoolExecutor(min(workers, len(chunks)), mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_worker, initargs=(columns, options))
+    with pool:
+        starts = [start for start, _ in chunks]
+        ends = [end for _, end in chunks]
+        yield from zip(starts, pool.map(_render_chunk, starts, ends))
+
+
+def compare(manifest, meta, hashes):
+    """Frame numbers whose hash differs from those in manifest (or that it does not have)."""
+    if any(manifest["meta"].get(key) != meta[key] for key in ("fps", "size", "page", "first_frame")):
+        raise ValueError("manifest was made with a different fps, size, page or start")
+    if manifest["meta"].get("qt") != meta["qt"]:
+        print(f"warning: manifest made with Qt {manifest['meta'].get('qt')}, this is Qt {meta['qt']}",
+              file=sys.stderr)
+    expected = manifest["frames"]
+    first = meta["first_frame"]
+    differing = [first + i for i, h in enumerate(hashes) if i >= len(expected) or expected[i] != h]
+    differing += [first + i for i in range(len(hashes), len(expected))]
+    return differing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a recorded drive into dashboard frames")
+    parser.add_argument("recording", help="recording made with speedometer_app.py --record")
+    parser.add_argument("--png", metavar="DIR", help="write frame_NNNNNN.png files to DIR")
+    parser.add_argument("--raw", metavar="PATH",
+                        help="write every frame as raw BGRA pixels to PATH ('-' for stdout)")
+    parser.add_argument("--fps", type=int, default=30, help="frames per second of drive time")
+    parser.add_argument("--start", type=float, default=0.0, help="first second of the drive exported")
+    parser.add_argument("--end", type=float, help="last second of the drive exported (default the end)")
+    parser.add_argument("--size", default="1200x500", help="frame size WIDTHxHEIGHT")
+    parser.add_argument("--pages", default=PAGES_FILE, metavar="PATH", help="page config")
+    parser.add_argument("--page", metavar="NAME", help="page rendered (default the first)")
+    parser.add_argument("--layout", default=POSITIONS_FILE, metavar="PATH",
+                        help="saved positions and sizes (default gauge_positions.json)")
+    parser.add_argument("--alert-rules", metavar="PATH", help="alert rules replacing the built-in ones")
+    parser.add_argument("--needle", choices=["spring", "slew", "off"], default="spring",
+                        help="needle smoothing")
+    parser.add_argument("--odometer", type=float, default=0.0,
+                        help="odometer reading at the start of the drive, if it was not recorded")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="rendering processes")
+    parser.add_argument("--chunk", type=int, default=300, help="frames rendered per task")
+    parser.add_argument("--manifest", metavar="PATH", help="write the hash of every frame to PATH")
+    parser.add_argument("--compare", metavar="PATH",
+                        help="compare frame hashes with a manifest; exit code 1 if any differ")
+    args = parser.parse_args(argv)
+    if not (args.png or args.raw or args.manifest or args.compare):
+        parser.error("nothing to do: give --png, --raw, --manifest or --compare")
+
+    frames, columns = frame_table(args.recording, args.fps)
+    first = max(0, round(args.start * args.fps))
+    last = frames if args.end is None else min(frames, round(args.end * args.fps) + 1)
+    if first >= last:
+        parser.error(f"no frames between --start and --end; the drive has {frames / args.fps:.1f} s")
+
+    if args.page and args.page not in [p.name for p in load_pages(args.pages, builtin_catalog())]:
+        parser.error(f"no page named {args.page!r} in {args.pages}")
+
+    if args.png:
+        os.makedirs(args.png, exist_ok=True)
+    parts = tempfile.mkdtemp(prefix="frame_export_") if args.raw else None
+    options = export_options(args, parts)
+
+    hashes = []
+    out = None
+    if args.raw:
+        out = sys.stdout.buffer if args.raw == "-" else open(args.raw, "wb")
+    try:
+        for start, chunk_hashes in export(columns, first, last, options, args.workers, args.chunk):
+            hashes += chunk_hashes
+            if out is not None:
+                part = os.path.join(parts, f"{start:08d}.part")
+                with open(part, "rb") as f:
+                    shutil.copyfileobj(f, out)
+                os.remove(part)
+            print(f"{len(hashes)}/{last - first} frames", file=sys.stderr)
+    finally:
+        if out is not None and out is not sys.stdout.buffer:
+            out.close()
+        if parts is not None:
+            shutil.rmtree(parts, ignore_errors=True)
+
+    meta = {
+        "recording": os.path.basename(args.recording),
+        "fps": args.fps, "size": list(options["size"]), "page": args.page, "first_frame": first,
+        "qt": qVersion(), "pyside": pyside_version,
+    }
+    if args.manifest:
+        with open(args.manifest, "w") as f:
+            json.dump({"meta": meta, "frames": hashes}, f, indent=1)
+    if args.compare:
+        with open(args.compare, "r") as f:
+            differing = compare(json.load(f), meta, hashes)
+        if differing:
+            shown = ", ".join(str(k) for k in differing[:10])
+            print(f"{len(differing)} frames differ from {args.compare}: {shown}"
+                  f"{' ...' if len(differing) > 10 else ''}", file=sys.stderr)
+            return 1
+        print(f"all {len(hashes)} frames match {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+"""Dashboard-wide frame scheduler.
+
+Widgets do not call update() themselves. They call request_update(), which marks
+them dirty with the installed FrameScheduler. On each tick the scheduler issues
+update() for every dirty widget together, so Qt repaints them in a single
+backing-store pass per window. Ticks with nothing dirty are skipped entirely:
+the timer stops until the next request.
+
+Instruments can have a refresh class (their refresh_class attribute) limiting
+how often they are repainted: a water temperature gauge does not need 60 frames
+a second. Repaints asked for sooner are held back and merged until the
+instrument is due. The scheduler's quality level, set by a QualityController
+when frames run over budget, drops antialiasing from the moving parts of
+degradable instruments and then lowers their refresh rates.
+
+If no scheduler is installed, request_update() falls back to a plain update().
+"""
+import json
+import time
+import weakref
+from collections import deque
+
+from PySide6.QtCore import QObject, QTimer, Qt
+from PySide6.QtGui import QRegion
+
+# Refresh classes: (repaints per second, None for every frame; whether the quality level slows it down)
+REFRESH_CLASSES = {
+    "realtime": (None, False),  # primary instruments such as speed and RPM
+    "normal": (None, True),
+    "slow": (2.0, True),        # slowly changing values such as water temperature and fuel
+}
+
+# Quality levels, best first: (antialias degradable instruments, factor on their refresh rates)
+QUALITY_LEVELS = (
+    (True, 1.0),
+    (False, 1.0),
+    (False, 0.5),
+    (False, 0.25),
+)
+
+
+def refresh_rate(refresh):
+    """(Hz or None, degradable) for a refresh class name, or for a rate in Hz (degradable)."""
+    if refresh is None:
+        return None, False
+    if isinstance(refresh, str):
+        return REFRESH_CLASSES[refresh]
+    return float(refresh), True
+
+
+class FrameScheduler(QObject):
+    """Coalesces widget repaints into one flush per frame at a target rate."""
+    def __init__(self, fps=60, parent=None):
+        """_summary_
+
+        Args:
+            fps (int, optional): target frame rate. Defaults to 60.
+            parent (any, optional): Parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self._dirty = {}  # widget -> QRegion, or None for the whole widget
+        self._flush_times = deque(maxlen=240)
+        self.frames = 0
+        self.skipped_ticks = 0
+        self.missed_frames = 0  # ticks that arrived more than one frame late
+        self.last_flush_ms = 0.0
+        self.last_frame_ms = 0.0
+        self.quality = 0  # index into QUALITY_LEVELS
+        self.frame_listeners = []  # called with each frame's time in ms, see _frame_done()
+        self._last_tick = None
+
+        # Refresh classes: when each instrument may be repainted next, and repaints held back
+        self._due = {}       # owner -> perf_counter time
+        self._deferred = {}  # owner -> (widget, QRegion or None)
+        self._admitted = set()  # owners already let through this frame
+        # Every owner ever marked dirty, so a quality change can repaint the degradable ones
+        self._owners = weakref.WeakKeyDictionary()  # owner -> widget, None if the owner is the widget
+
+        # Frame time is measured from a flush until the event loop gets back to
+        # timers, by which time the paint events the flush posted have run
+        self._flush_start = 0.0
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(0)
+        self._frame_timer.timeout.connect(self._frame_done)
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+        self.set_fps(fps)
+
+    def set_fps(self, fps):
+        """Change the target frame rate."""
+        self.fps = fps
+        self.timer.setInterval(max(1, round(1000 / fps)))
+
+    @property
+    def frame_budget_ms(self):
+        """Time available per frame at the target rate."""
+        return 1000.0 / self.fps
+
+    @property
+    def achieved_fps(self):
+        """Flushes performed during the last second."""
+        now = time.perf_counter()
+        return sum(1 for t in self._flush_times if now - t <= 1.0)
+
+    def set_quality(self, level):
+        """Switch to QUALITY_LEVELS[level]; 0 is full quality.
+
+        Degradable instruments are repainted on the next frame, so they all change
+        quality together, and repaints held back at the old refresh rates are let through.
+        """
+        level = max(0, min(level, len(QUALITY_LEVELS) - 1))
+        if level == self.quality:
+            return
+        self.quality = level
+        self._due.clear()
+        for widget, region in self._deferred.values():
+            self._dirty[widget] = self._merged(self._dirty.get(widget, QRegion()), region)
+        self._deferred.clear()
+        for owner, widget in list(self._owners.items()):
+            if refresh_rate(getattr(owner, "refresh_class", None))[1]:
+                self.mark_dirty(owner if widget is None else widget, owner=owner)
+        if self._dirty:
+            self._start()
+
+    def antialias(self, owner):
+        """Whether owner's moving parts are antialiased at the current quality level."""
+        if self.quality == 0:
+            return True
+        return not refresh_rate(getattr(owner, "refresh_class", None))[1]
+
+    def refresh_interval(self, owner):
+        """Least seconds between repaints of owner at the current quality level, 0 for every frame."""
+        hz, degradable = refresh_rate(getattr(owner, "refresh_class", None))
+        hz = hz or self.fps
+        if degradable:
+            hz *= QUALITY_LEVELS[self.quality][1]
+        return 0.0 if hz >= self.fps else 1.0 / hz
+
+    @staticmethod
+    def _merged(region, rect):
+        """region grown by rect, where None stands for the whole widget."""
+        if rect is None or region is None:
+            return None
+        return region.united(QRegion(rect))
+
+    def mark_dirty(self, widget, rect=None, owner=None):
+        """Schedule widget for repaint on the next tick, or once owner is due if it has a refresh class.
+
+        Args:
+            widget (QWidget): widget to repaint.
+            rect (QRect | QRegion, optional): part of the widget to repaint. Defaults to
+                the whole widget.
+            owner (any, optional): what is being repainted, if not the whole widget (say, a
+                canvas item); its refresh_class applies. Defaults to widget.
+        """
+        owner = widget if owner is None else owner
+        if owner not in self._owners:
+            self._owners[owner] = None if owner is widget else widget
+        if owner not in self._admitted:
+            interval = self.refresh_interval(owner)
+            if interval:
+                now = time.perf_counter()
+                if now < self._due.get(owner, 0.0):
+                    _, region = self._deferred.get(owner, (widget, QRegion()))
+                    self._deferred[owner] = (widget, self._merged(region, rect))
+                    self._start()
+                    return
+                self._due[owner] = now + interval
+                self._admitted.add(owner)
+        self._dirty[widget] = self._merged(self._dirty.get(widget, QRegion()), rect)
+        self._start()
+
+    def _start(self):
+        if not self.timer.isActive():
+            self._last_tick = None
+            self.timer.start()
+
+    def is_dirty(self, widget):
+        return widget in self._dirty
+
+    def flush(self):
+        """Repaint every dirty widget now."""
+        dirty, self._dirty = self._dirty, {}
+        self._admitted.clear()
+        start = time.perf_counter()
+        for widget, region in dirty.items():
+            try:
+                if region is None:
+                    widget.update()
+                else:
+                    widget.update(region)
+            except RuntimeError:
+                pass  # widget was deleted while queued
+        self.frames += 1
+        self._flush_times.append(start)
+        self.last_flush_ms = (time.perf_counter() - start) * 1000
+        if self.frame_listeners:
+            self._flush_start = start
+            self._frame_timer.start()
+
+    def _frame_done(self):
+        self.last_frame_ms = (time.perf_counter() - self._flush_start) * 1000
+        for listener in self.frame_listeners:
+            listener(self.last_frame_ms)
+
+    def _release_due(self, now):
+        """Move held back repaints whose owner is due into this frame."""
+        for owner, (widget, region) in list(self._deferred.items()):
+            if now >= self._due.get(owner, 0.0):
+                del self._deferred[owner]
+                self._due[owner] = now + self.refresh_interval(owner)
+                self._admitted.add(owner)
+                self._dirty[widget] = self._merged(self._dirty.get(widget, QRegion()), region)
+
+    def _tick(self):
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            late = (now - self._last_tick) * 1000 / self.frame_budget_ms
+            if late >= 1.5:
+                self.missed_frames += int(late - 0.5)
+        self._last_tick = now
+        if self._deferred:
+            self._release_due(now)
+        if not self._dirty:
+            self.skipped_ticks += 1
+            if not self._deferred:
+                # Nothing changed: stop ticking until the next mark_dirty()
+                self.timer.stop()
+            return
+        self.flush()
+
+
+_scheduler = None
+
+
+def install_scheduler(scheduler):
+    """Route every request_update() through scheduler. Pass None to uninstall."""
+    global _scheduler
+    _scheduler = scheduler
+
+
+def current_scheduler():
+    return _scheduler
+
+
+def frame_interval_ms():
+    """Milliseconds per frame of the installed scheduler, or at 60 fps without one."""
+    return round(_scheduler.frame_budget_ms) if _scheduler is not None else 16
+
+
+def request_update(widget, rect=None, owner=None):
+    """Repaint widget (or rect within it) on the next frame that owner (default widget) is due."""
+    if _scheduler is None:
+        if rect is None:
+            widget.update()
+        else:
+            widget.update(rect)
+    else:
+        _scheduler.mark_dirty(widget, rect, owner)
+
+
+def antialias(owner):
+    """Whether owner should antialias its moving parts at the installed scheduler's quality level."""
+    return _scheduler is None or _scheduler.antialias(owner)
+
+
+# ===================== Adaptive Quality =====================
+class QualityController:
+    """Lowers the scheduler's quality level while frames run over budget, and raises it
+    again once there is headroom.
+
+    Every `window` frames, the 90th percentile frame time is compared with the
+    frame budget. Above degrade_at of the budget, quality drops one level. Below
+    restore_at for restore_windows windows in a row, it comes back one level; the
+    gap between the two keeps it from flapping.
+    """
+    def __init__(self, scheduler, degrade_at=0.9, restore_at=0.5, window=30, restore_windows=3,
+                 log_path=None):
+        """_summary_
+
+        Args:
+            scheduler (FrameScheduler): scheduler whose frames are measured and quality set.
+            degrade_at (float, optional): fraction of the budget that lowers quality. Defaults to 0.9.
+            restore_at (float, optional): fraction of the budget that raises it. Defaults to 0.5.
+            window (int, optional): frames per evaluation. Defaults to 30.
+            restore_windows (int, optional): calm windows needed to raise quality. Defaults to 3.
+            log_path (str, optional): JSON lines file every change is appended to. Defaults to
+                None, which prints changes instead.
+        """
+        self.scheduler = scheduler
+        self.degrade_at = degrade_at
+        self.restore_at = restore_at
+        self.window = window
+        self.restore_windows = restore_windows
+        self.log_path = log_path
+        self.changes = []  # every change, as logged
+        self._frames = []
+        self._calm = 0
+        scheduler.frame_listeners.append(self.frame)
+
+    def frame(self, ms):
+        self._frames.append(ms)
+        if len(self._frames) < self.window:
+            return
+        frames = sorted(self._frames)
+        self._frames.clear()
+        p90 = frames[int(len(frames) * 0.9)]
+        budget = self.scheduler.frame_budget_ms
+        level = self.scheduler.quality
+        if p90 > budget * self.degrade_at:
+            self._calm = 0
+            if level < len(QUALITY_LEVELS) - 1:
+                self._change(level + 1, p90, budget)
+        elif p90 < budget * self.restore_at and level > 0:
+            self._calm += 1
+            if self._calm >= self.restore_windows:
+                self._calm = 0
+                self._change(level - 1, p90, budget)
+        else:
+            self._calm = 0
+
+    def _change(self, level, p90, budget):
+        change = {
+            "time": time.time(),
+            "from": self.scheduler.quality,
+            "to": level,
+            "p90_frame_ms": round(p90, 3),
+            "budget_ms": round(budget, 3),
+            "degrade_at": self.degrade_at,
+            "restore_at": self.restore_at,
+        }
+        self.scheduler.set_quality(level)
+        self.changes.append(change)
+        if self.log_path is None:
+            print(f"quality {change['from']} -> {level}: p90 frame {p90:.1f} ms of {budget:.1f} ms budget")
+        else:
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(change) + "\n")
@@ -0,0 +1,52 @@
+"""GUI-side draining of a TelemetryIngestor, once per display frame."""
+from PySide6.QtCore import QObject, QTimer
+
+
+class GaugeFeeder(QObject):
+    """Drains an ingestor once per display frame and pushes values into bound gauges."""
+    def __init__(self, ingestor, fps=60, parent=None):
+        super().__init__(parent)
+        self.ingestor = ingestor
+        self.bindings = {}  # channel -> (mode, gauges fed from it)
+        self.before_drain = []  # callables run once per frame before the rings are drained
+        self.after_drain = []   # callables run once per frame after the gauges are fed
+        self.timer = QTimer(self)
+        self.timer.setInterval(max(1, round(1000 / fps)))
+        self.timer.timeout.connect(self.drain)
+
+    def bind(self, channel, gauge, mode="latest"):
+        """Feed channel into gauge.set_value(), reducing each frame's samples with mode.
+
+        gauge can be anything with set_value(), such as a dashboard_pages.ChannelValue.
+        A channel can feed several gauges, all with the same mode: its ring is drained
+        once per frame and the value handed to each of them.
+        """
+        binding = self.bindings.get(channel)
+        if binding is None:
+            self.bindings[channel] = (mode, [gauge])
+        elif binding[0] != mode:
+            raise ValueError(f"Channel {channel} is already bound with mode {binding[0]!r}, not {mode!r}")
+        else:
+            binding[1].append(gauge)
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def drain(self):
+        """Hand at most one value per channel to its gauge."""
+        for callback in self.before_drain:
+            callback()
+        rings = self.ingestor.rings
+        for channel, (mode, gauges) in self.bindings.items():
+            ring = rings.get(channel)
+            if ring is None:
+                continue
+            value = ring.drain(mode)
+            if value is not None:
+                for gauge in gauges:
+                    gauge.set_value(value)
+        for callback in self.after_drain:
+            callback()
@@ -0,0 +1,201 @@
+"""Fixed-memory value history for gauges.
+
+GaugeHistory keeps, for one gauge or channel:
+
+- the all-time peak and low since the last reset_peaks(),
+- RollingWindows giving the min, max and mean of the last N seconds,
+- a trail of recent values, sampled at a fixed interval, for a sparkline.
+
+Everything lives in arrays allocated up front, so memory stays the same however
+long the car runs. A RollingWindow tracks its min and max with monotonic deques
+(stored as rings of sample numbers), so add() is amortized O(1) and min(), max()
+and mean() are O(1). Stored samples can be read through memoryviews of the ring
+with segments(), without copying.
+"""
+import time
+from array import array
+
+
+def _segments(ring, start, end, capacity):
+    """Memoryviews covering ring positions start (inclusive) to end (exclusive), oldest first."""
+    view = memoryview(ring)
+    if end - start >= capacity:
+        start = end - capacity
+    first, last = start % capacity, end % capacity
+    if start == end:
+        return view[0:0], view[0:0]
+    if first < last:
+        return view[first:last], view[0:0]
+    return view[first:], view[:last]
+
+
+class RollingWindow:
+    """Min, max and mean of the samples added in the last `seconds`.
+
+    At most capacity samples are kept; if more than that arrive within the window,
+    the oldest drop out early.
+    """
+    def __init__(self, seconds, capacity=1024):
+        self.seconds = seconds
+        self.capacity = capacity
+        self.values = array("d", bytes(8 * capacity))
+        self.times = array("d", bytes(8 * capacity))
+        self.head = 0  # samples added
+        self.tail = 0  # oldest sample still in the window
+        self.total = 0.0
+        self._evicted = 0  # evictions since total was last summed from scratch
+        # Sample numbers in decreasing (max) / increasing (min) order of value
+        self._max = array("q", bytes(8 * capacity))
+        self._min = array("q", bytes(8 * capacity))
+        self._max_head = self._max_tail = 0
+        self._min_head = self._min_tail = 0
+
+    def __len__(self):
+        return self.head - self.tail
+
+    def add(self, value, timestamp):
+        cap = self.capacity
+        if self.head - self.tail == cap:
+            self._evict()
+        n = self.head
+        self.values[n % cap] = value
+        self.times[n % cap] = timestamp
+
+        values, ring = self.values, self._max
+        while self._max_head > self._max_tail and values[ring[(self._max_head - 1) % cap] % cap] <= value:
+            self._max_head -= 1
+        ring[self._max_head % cap] = n
+        self._max_head += 1
+
+        ring = self._min
+        while self._min_head > self._min_tail and values[ring[(self._min_head - 1) % cap] % cap] >= value:
+            self._min_head -= 1
+        ring[self._min_head % cap] = n
+        self._min_head += 1
+
+        self.total += value
+        self.head = n + 1
+        self.expire(timestamp)
+
+    def expire(self, now):
+        """Drop the samples older than the window as of now."""
+        cutoff = now - self.seconds
+        while self.tail < self.head and self.times[self.tail % self.capacity] < cutoff:
+            self._evict()
+
+    def _evict(self):
+        cap = self.capacity
+        n = self.tail
+        if self._max_head > self._max_tail and self._max[self._max_tail % cap] == n:
+            self._max_tail += 1
+        if self._min_head > self._min_tail and self._min[self._min_tail % cap] == n:
+            self._min_tail += 1
+        self.tail = n + 1
+        self.total -= self.values[n % cap]
+        self._evicted += 1
+        if self._evicted >= cap:
+            # Re-sum now and then so subtraction errors cannot build up
+            older, newer = self.segments()[0]
+            self.total = sum(older) + sum(newer)
+            self._evicted = 0
+
+    def max(self):
+        if self._max_head == self._max_tail:
+            return None
+        return self.values[self._max[self._max_tail % self.capacity] % self.capacity]
+
+    def min(self):
+        if self._min_head == self._min_tail:
+            return None
+        return self.values[self._min[self._min_tail % self.capacity] % self.capacity]
+
+    def mean(self):
+        count = self.head - self.tail
+        return self.total / count if count else None
+
+    def segments(self):
+        """((older values, newer values), (older times, newer times)) as memoryviews, oldest first."""
+        return (_segments(self.values, self.tail, self.head, self.capacity),
+                _segments(self.times, self.tail, self.head, self.capacity))
+
+
+def history_spec(peak_hold=False, min_hold=False, sparkline=False, sparkline_seconds=30.0,
+                 history_windows=(), **_):
+    """What history a gauge with these options needs, as (window seconds, trail seconds), or
+    None if it needs none. Other gauge options are ignored, so a gauge's options can be passed."""
+    windows = {float(seconds) for seconds in history_windows}
+    for hold in (peak_hold, min_hold):
+        if hold and not isinstance(hold, bool):
+            windows.add(float(hold))  # a hold of N seconds is the max/min of an N second window
+    if not (peak_hold or min_hold or sparkline or windows):
+        return None
+    return tuple(sorted(windows)), (sparkline_seconds if sparkline else 0.0)
+
+
+class GaugeHistory:
+    """Peaks, rolling windows and a sparkline trail for one value."""
+    def __init__(self, windows=(), trail_seconds=30.0, trail_length=120, capacity=1024, clock=time.monotonic):
+        """_summary_
+
+        Args:
+            windows (tuple, optional): seconds of each RollingWindow to keep. Defaults to ().
+            trail_seconds (float, optional): time covered by the trail, 0 for none. Defaults to 30.0.
+            trail_length (int, optional): points in the trail. Defaults to 120.
+            capacity (int, optional): samples kept per rolling window. Defaults to 1024.
+            clock (callable, optional): current time, in the timestamps' units. Windows expire by
+                it, so it must match the timestamps passed to add(). Defaults to time.monotonic.
+        """
+        self.clock = clock
+        self.windows = {float(s): RollingWindow(float(s), capacity) for s in windows}
+        self.trail_length = trail_length if trail_seconds else 0
+        self.trail_interval = trail_seconds / trail_length if trail_seconds else 0.0
+        self.trail = array("d", bytes(8 * self.trail_length))
+        self.trail_count = 0  # points ever added to the trail
+        self._next_trail = None
+        self.peak = None
+        self.low = None
+        self.samples = 0
+
+    def add(self, value, timestamp=None):
+        if timestamp is None:
+            timestamp = self.clock()
+        self.samples += 1
+        if self.peak is None or value > self.peak:
+            self.peak = value
+        if self.low is None or value < self.low:
+            self.low = value
+        for window in self.windows.values():
+            window.add(value, timestamp)
+        if self.trail_length and (self._next_trail is None or timestamp >= self._next_trail):
+            # One point per interval, so a sparkline only needs redrawing that often
+            self.trail[self.trail_count % self.trail_length] = value
+            self.trail_count += 1
+            self._next_trail = timestamp + self.trail_interval
+
+    def window(self, seconds):
+        """The RollingWindow of seconds, brought up to date."""
+        window = self.windows[float(seconds)]
+        window.expire(self.clock())
+        return window
+
+    def hold(self, hold, highest=True):
+        """The peak (or low) shown for a peak_hold/min_hold option: all-time if hold is True,
+        else over the last hold seconds. None before any sample, or when the window has emptied."""
+        if not hold:
+            return None
+        if isinstance(hold, bool):
+            return self.peak if highest else self.low
+        window = self.window(hold)  # expired, so a peak cannot outlive its window if the value stops
+        return window.max() if highest else window.min()
+
+    def reset_peaks(self):
+        self.peak = None
+        self.low = None
+
+    def trail_segments(self):
+        """(older, newer) memoryviews of the trail, oldest first."""
+        if not self.trail_length:
+            empty = memoryview(self.trail)
+            return empty, empty
+        return _segments(self.trail, max(0, self.trail_count - self.trail_length),
+                         self.trail_count, self.trail_length)
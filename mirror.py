@@ -0,0 +1,528 @@
+"""Streams dashboard state to remote mirror displays.
+
+A MirrorPublisher broadcasts the value of every dashboard channel (gauge values,
+odometer, alert and signal states) to any number of receivers, such as a pit-lane
+laptop or a second cabin screen. A MirrorSubscriber receives them and hands them
+to a local dashboard. Both run an asyncio event loop in a background thread, so
+the GUI thread only copies channel values in (capture) or out (take) once per
+frame.
+
+Each receiver asks for an update rate when it subscribes and is served at that
+rate (capped by the publisher), independently of the others. It first gets a
+snapshot of every channel by name, then only the channels that changed since
+its previous message, by index into the snapshot:
+
+    header   magic "GD", version u8, type u8, sequence u32, captured f64, count u16
+    snapshot count x (name length u8, name utf-8, value f32)
+    delta    count x (index u16, value f32)
+    request  count (1) x rate f32, in updates per second; 0 for the publisher's maximum
+
+captured is the wall clock time the publisher took the state the message
+carries, so a receiver's latency covers waiting for its next update as well as
+the network. Values are little-endian float32; a channel without a value yet is NaN, alerts
+and signals are 0 or 1. A receiver that sees a gap in the sequence numbers
+(a lost UDP datagram) asks for a new snapshot, and every receiver gets one every
+keyframe_seconds anyway. Quiet channels are not resent; an empty delta is sent
+once a second so receivers can tell the publisher is alive.
+
+Transports are UDP (receivers subscribe by sending a datagram and keep their
+subscription alive by sending another every couple of seconds) and WebSocket,
+which needs the optional websockets package.
+"""
+import asyncio
+import math
+import struct
+import threading
+import time
+from collections import deque
+
+DEFAULT_PORT = 5006
+
+MAGIC = b"GD"
+VERSION = 2
+HEADER = struct.Struct("<2sBBIdH")
+SNAPSHOT, DELTA, SUBSCRIBE, KEEPALIVE = range(1, 5)
+VALUE = struct.Struct("<f")
+CHANGE = struct.Struct("<Hf")
+
+NAN = math.nan
+
+
+# ===================== Wire Format =====================
+def encode_snapshot(seq, names, values, captured):
+    parts = [HEADER.pack(MAGIC, VERSION, SNAPSHOT, seq, captured, len(names))]
+    for name, value in zip(names, values):
+        encoded = name.encode("utf-8")
+        parts.append(bytes((len(encoded),)) + encoded + VALUE.pack(value))
+    return b"".join(parts)
+
+
+def encode_delta(seq, changes, captured):
+    """changes is a list of (channel index, value)."""
+    parts = [HEADER.pack(MAGIC, VERSION, DELTA, seq, captured, len(changes))]
+    parts.extend(CHANGE.pack(i, value) for i, value in changes)
+    return b"".join(parts)
+
+
+def encode_request(kind, rate=0):
+    """A SUBSCRIBE (asking for a snapshot, at rate updates per second) or KEEPALIVE message.
+    The rate is a float, so a slow mirror can ask for one update every few seconds."""
+    return HEADER.pack(MAGIC, VERSION, kind, 0, time.time(), 1) + VALUE.pack(rate)
+
+
+def decode(data):
+    """Returns (type, sequence, captured, payload), or None if data is not a valid message.
+
+    The payload is a list of (name, value) for a snapshot, of (index, value) for a
+    delta, and the requested rate for a subscription.
+    """
+    if len(data) < HEADER.size:
+        return None
+    magic, version, kind, seq, captured, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    try:
+        if kind == SNAPSHOT:
+            payload, offset = [], HEADER.size
+            for _ in range(count):
+                length = data[offset]
+                name = bytes(data[offset + 1:offset + 1 + length]).decode("utf-8")
+                offset += 1 + length
+                payload.append((name, VALUE.unpack_from(data, offset)[0]))
+                offset += VALUE.size
+        elif kind == DELTA:
+            payload = list(CHANGE.iter_unpack(data[HEADER.size:HEADER.size + count * CHANGE.size]))
+            if len(payload) != count:
+                return None
+        else:
+            payload = VALUE.unpack_from(data, HEADER.size)[0] if count else 0.0
+    except (IndexError, struct.error, UnicodeDecodeError):
+        return None
+    return kind, seq, captured, payload
+
+
+def check_channel_names(names):
+    """Raise ValueError if names cannot all go into a snapshot: at most 65535 channels,
+    each name at most 255 bytes of UTF-8."""
+    if len(names) > 0xFFFF:
+        raise ValueError(f"A mirror carries at most {0xFFFF} channels, not {len(names)}")
+    for name in names:
+        if len(name.encode("utf-8")) > 0xFF:
+            raise ValueError(f"Channel name longer than 255 bytes of UTF-8: {name[:40]}...")
+
+
+def parse_spec(spec, host):
+    """Split udp:[HOST:]PORT or ws:[HOST:]PORT into (transport, host, port)."""
+    transport, _, rest = spec.partition(":")
+    if transport not in ("udp", "ws"):
+        raise ValueError(f"Unknown mirror transport: {spec}")
+    spec_host, _, port = rest.rpartition(":")
+    return transport, spec_host or host, int(port or DEFAULT_PORT)
+
+
+def latency_summary(samples):
+    """p50, p99 and max of latency samples in seconds, as milliseconds."""
+    if not samples:
+        return {"p50_ms": None, "p99_ms": None, "max_ms": None}
+    ordered = sorted(samples)
+    pick = lambda pct: ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+    return {"p50_ms": round(pick(50) * 1000, 3), "p99_ms": round(pick(99) * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3)}
+
+
+# ===================== Event Loop Thread =====================
+class _LoopThread(threading.Thread):
+    """Runs _open(), then the event loop until stop(), then _close(), in a daemon thread."""
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.loop = None
+        self.error = None
+        self._ready = threading.Event()
+        self._stopping = None
+
+    def run(self):
+        try:
+            asyncio.run(self._main())
+        except Exception as error:
+            self.error = error
+        finally:
+            self._ready.set()
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        await self._open()
+        self._ready.set()
+        try:
+            await self._stopping.wait()
+        finally:
+            await self._close()
+
+    async def _open(self):
+        pass
+
+    async def _close(self):
+        pass
+
+    def start(self, timeout=5.0):
+        """Start the thread and wait until it is listening. Raises what stopped it from starting."""
+        super().start()
+        self._ready.wait(timeout)
+        if self.error is not None:
+            raise self.error
+
+    def call(self, callback, *args):
+        """Run callback(*args) on the event loop thread. Ignored before start and after stop."""
+        if self.loop is None or not self._ready.is_set() or self.error is not None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # the loop has already closed
+
+    def stop(self, timeout=1.0):
+        if self.is_alive() and self._stopping is not None:
+            self.call(self._stopping.set)
+            self.join(timeout)
+
+
+# ===================== Publisher =====================
+class _Receiver:
+    """One subscribed mirror display, as seen by the publisher."""
+    __slots__ = ("name", "send", "interval", "seq", "generation", "keyframe_at", "quiet_until",
+                 "messages", "bytes", "since", "last_seen", "task")
+
+    def __init__(self, name, send, rate):
+        self.name = name
+        self.send = send          # coroutine function sending one message
+        self.interval = 1.0 / rate
+        self.seq = 0
+        self.generation = None    # publisher generation last sent; None = snapshot due
+        self.keyframe_at = 0.0
+        self.quiet_until = 0.0
+        self.messages = 0
+        self.bytes = 0
+        self.since = self.last_seen = time.monotonic()
+        self.task = None
+
+
+class _UdpServer(asyncio.DatagramProtocol):
+    def __init__(self, publisher):
+        self.publisher = publisher
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        async def send(message):
+            self.transport.sendto(message, addr)
+        self.publisher._request(f"{addr[0]}:{addr[1]}", data, send)
+
+    def error_received(self, exc):
+        pass  # a receiver went away; it is dropped once it stops sending keepalives
+
+
+class MirrorPublisher(_LoopThread):
+    """Broadcasts channel values to mirror displays, sending each only what changed."""
+    def __init__(self, channels, spec=f"udp:{DEFAULT_PORT}", max_rate=30.0, keyframe_seconds=5.0,
+                 receiver_timeout=10.0):
+        """_summary_
+
+        Args:
+            channels (list): channel names, in the order capture() gets their values.
+            spec (str, optional): where to listen, udp:[HOST:]PORT or ws:[HOST:]PORT.
+                Defaults to udp:5006 on every interface.
+            max_rate (float, optional): most updates per second sent to any receiver. Defaults to 30.0.
+            keyframe_seconds (float, optional): how often every receiver gets a full snapshot,
+                so one that lost a datagram recovers. Defaults to 5.0.
+            receiver_timeout (float, optional): UDP receivers not heard from for this many
+                seconds are dropped. Defaults to 10.0.
+        """
+        super().__init__()
+        self.transport, self.host, self.port = parse_spec(spec, "0.0.0.0")
+        self.names = list(channels)
+        check_channel_names(self.names)
+        self.max_rate = max_rate
+        self.keyframe_seconds = keyframe_seconds
+        self.receiver_timeout = receiver_timeout
+        # Owned by the event loop thread
+        self.values = [NAN] * len(self.names)
+        self.stamps = [0] * len(self.names)  # generation at which each value last changed
+        self.generation = 0
+        self.captured = time.time()
+        self.receivers = {}
+        self.rejected = 0  # malformed requests
+        self._server = None
+
+    async def _open(self):
+        if self.transport == "udp":
+            transport, _ = await self.loop.create_datagram_endpoint(
+                lambda: _UdpServer(self), local_addr=(self.host, self.port))
+            self._server = transport
+            self.port = transport.get_extra_info("sockname")[1]
+            self.loop.create_task(self._expire())
+        else:
+            import websockets  # optional dependency, only needed for WebSocket mirrors
+            self._server = await websockets.serve(self._serve_websocket, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _close(self):
+        for receiver in list(self.receivers.values()):
+            receiver.task.cancel()
+        self._server.close()
+        if self.transport == "ws":
+            await self._server.wait_closed()
+
+    def capture(self, values):
+        """Take the current channel values (None for no value yet), in channel order.
+        Called from the GUI thread; the comparison happens on the event loop thread."""
+        self.call(self._capture, list(values), time.time())
+
+    def _capture(self, values, captured):
+        self.captured = captured
+        changed = False
+        current, stamps = self.values, self.stamps
+        for i, value in enumerate(values):
+            value = NAN if value is None else float(value)
+            old = current[i]
+            if value == old or (value != value and old != old):
+                continue
+            if not changed:
+                self.generation += 1
+                changed = True
+            current[i] = value
+            stamps[i] = self.generation
+
+    def _request(self, name, data, send):
+        """Handle a SUBSCRIBE or KEEPALIVE message from receiver name."""
+        message = decode(data)
+        if message is None or message[0] not in (SUBSCRIBE, KEEPALIVE):
+            self.rejected += 1
+            return
+        kind, _, _, rate = message
+        receiver = self.receivers.get(name)
+        if receiver is None:
+            # A keepalive from an unknown receiver (say, after a publisher restart) subscribes it
+            rate = min(rate, self.max_rate) if 0 < rate < math.inf else self.max_rate
+            receiver = self.receivers[name] = _Receiver(name, send, rate)
+            receiver.task = self.loop.create_task(self._feed(receiver))
+        elif kind == SUBSCRIBE:
+            if 0 < rate < math.inf:
+                receiver.interval = 1.0 / min(rate, self.max_rate)
+            receiver.generation = None
+        receiver.last_seen = time.monotonic()
+
+    def _message(self, receiver, now):
+        """The next message for receiver, or None if it has nothing to be told."""
+        if receiver.generation is None or now >= receiver.keyframe_at:
+            receiver.keyframe_at = now + self.keyframe_seconds
+            message = encode_snapshot(receiver.seq, self.names, self.values, self.captured)
+        elif self.generation > receiver.generation:
+            last, values = receiver.generation, self.values
+            message = encode_delta(receiver.seq, [(i, values[i]) for i, stamp in enumerate(self.stamps)
+                                                  if stamp > last], self.captured)
+        elif now >= receiver.quiet_until:
+            message = encode_delta(receiver.seq, [], self.captured)  # heartbeat
+        else:
+            return None
+        receiver.generation = self.generation
+        receiver.quiet_until = now + 1.0
+        receiver.seq = (receiver.seq + 1) & 0xFFFFFFFF
+        return message
+
+    async def _feed(self, receiver):
+        """Send receiver its updates at its own rate until it goes away."""
+        next_send = self.loop.time()
+        try:
+            while True:
+                message = self._message(receiver, time.monotonic())
+                if message is not None:
+                    await receiver.send(message)
+                    receiver.messages += 1
+                    receiver.bytes += len(message)
+                next_send += receiver.interval
+                await asyncio.sleep(max(0.0, next_send - self.loop.time()))
+        except Exception:
+            # The receiver went away (OSError, or websockets' ConnectionClosed)
+            self.receivers.pop(receiver.name, None)
+
+    async def _expire(self):
+        while True:
+            await asyncio.sleep(1.0)
+            cutoff = time.monotonic() - self.receiver_timeout
+            for name, receiver in list(self.receivers.items()):
+                if receiver.last_seen < cutoff:
+                    receiver.task.cancel()
+                    del self.receivers[name]
+
+    async def _serve_websocket(self, websocket, *_):
+        address = websocket.remote_address
+        name = f"ws {address[0]}:{address[1]}"
+        try:
+            async for data in websocket:
+                self._request(name, data, websocket.send)
+        except Exception:
+            pass  # the connection dropped
+        finally:
+            receiver = self.receivers.pop(name, None)
+            if receiver is not None:
+                receiver.task.cancel()
+
+    def snapshot_size(self):
+        """Bytes in a full snapshot: what every update would cost without delta encoding."""
+        return len(encode_snapshot(0, self.names, self.values, 0.0))
+
+    def stats(self):
+        """Per receiver: rate, messages, bytes and bandwidth since it subscribed."""
+        now = time.monotonic()
+        receivers = {}
+        for name, receiver in list(self.receivers.items()):
+            elapsed = max(now - receiver.since, 1e-9)
+            receivers[name] = {
+                "rate": round(1.0 / receiver.interval, 3),
+                "messages": receiver.messages,
+                "bytes": receiver.bytes,
+                "bytes_per_s": round(receiver.bytes / elapsed, 1),
+            }
+        return {"receivers": receivers, "snapshot_bytes": self.snapshot_size(), "rejected": self.rejected}
+
+
+# ===================== Subscriber =====================
+class _UdpClient(asyncio.DatagramProtocol):
+    def __init__(self, subscriber):
+        self.subscriber = subscriber
+
+    def datagram_received(self, data, addr):
+        self.subscriber._receive(data)
+
+    def error_received(self, exc):
+        pass  # publisher not up (yet); the next keepalive subscribes again
+
+
+class MirrorSubscriber(_LoopThread):
+    """Receives a publisher's channel values for a local dashboard."""
+    def __init__(self, spec, rate=30.0, keepalive=2.0, latency_samples=1024):
+        """_summary_
+
+        Args:
+            spec (str): publisher to mirror, udp:HOST:PORT or ws:HOST:PORT.
+            rate (float, optional): updates per second asked for. Defaults to 30.0.
+            keepalive (float, optional): seconds between UDP keepalives. Defaults to 2.0.
+            latency_samples (int, optional): latest latencies kept for stats(). Defaults to 1024.
+        """
+        super().__init__()
+        self.transport, self.host, self.port = parse_spec(spec, "127.0.0.1")
+        self.rate = rate
+        self.keepalive = keepalive
+        self.names = None  # channel names of the last snapshot
+        self.pending = {}  # values received since the last take()
+        self._lock = threading.Lock()
+        self._send = None
+        self._expected = None  # next sequence number
+        self.latency = deque(maxlen=latency_samples)
+        self.messages = 0
+        self.bytes = 0
+        self.snapshots = 0
+        self.gaps = 0
+        self.since = time.monotonic()
+        self._connection = None
+
+    async def _open(self):
+        if self.transport == "udp":
+            transport, _ = await self.loop.create_datagram_endpoint(
+                lambda: _UdpClient(self), remote_addr=(self.host, self.port))
+            self._connection = transport
+
+            async def send(message):
+                transport.sendto(message)
+            self._send = send
+            await send(encode_request(SUBSCRIBE, self.rate))
+            self.loop.create_task(self._keep_alive())
+        else:
+            import websockets  # optional dependency, only needed for WebSocket mirrors
+            self._connection = self.loop.create_task(self._read_websocket(websockets))
+
+    async def _close(self):
+        if self.transport == "udp":
+            self._connection.close()
+        else:
+            self._connection.cancel()
+
+    async def _keep_alive(self):
+        while True:
+            await asyncio.sleep(self.keepalive)
+            await self._send(encode_request(KEEPALIVE, self.rate))
+
+    async def _read_websocket(self, websockets):
+        """Receive from the publisher, reconnecting a second after it goes away."""
+        uri = f"ws://{self.host}:{self.port}"
+        while True:
+            try:
+                async with websockets.connect(uri) as websocket:
+                    self._send = websocket.send
+                    self._expected = None
+                    await websocket.send(encode_request(SUBSCRIBE, self.rate))
+                    async for data in websocket:
+                        self._receive(data)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass  # refused or dropped
+            await asyncio.sleep(1.0)
+
+    def _request_snapshot(self):
+        if self._send is not None:
+            self.loop.create_task(self._send(encode_request(SUBSCRIBE, self.rate)))
+
+    def _receive(self, data):
+        message = decode(data)
+        if message is None:
+            return
+        kind, seq, captured, payload = message
+        self.messages += 1
+        self.bytes += len(data)
+        self.latency.append(time.time() - captured)
+        if kind == SNAPSHOT:
+            self.snapshots += 1
+            self.names = [name for name, _ in payload]
+            updates = payload
+        elif kind == DELTA:
+            if self._expected is not None and seq != self._expected:
+                self.gaps += 1
+                self._request_snapshot()
+            if self.names is None:
+                self._expected = (seq + 1) & 0xFFFFFFFF
+                return
+            names = self.names
+            updates = [(names[i], value) for i, value in payload if i < len(names)]
+        else:
+            return
+        self._expected = (seq + 1) & 0xFFFFFFFF
+        with self._lock:
+            for name, value in updates:
+                if value == value:  # NaN: the channel has no value yet
+                    self.pending[name] = value
+
+    def take(self):
+        """Channel values received since the last call, as {name: value}. Called from the GUI thread."""
+        with self._lock:
+            pending, self.pending = self.pending, {}
+        return pending
+
+    def stats(self):
+        """Messages, bandwidth, snapshots, sequence gaps and end-to-end latency.
+
+        Latency runs from the publisher capturing a state to it arriving here, by the
+        publisher's wall clock, so between two machines it includes their clock difference.
+        """
+        elapsed = max(time.monotonic() - self.since, 1e-9)
+        stats = {
+            "messages": self.messages,
+            "bytes": self.bytes,
+            "bytes_per_s": round(self.bytes / elapsed, 1),
+            "snapshots": self.snapshots,
+            "gaps": self.gaps,
+        }
+        stats.update(latency_summary(list(self.latency)))
+        return stats
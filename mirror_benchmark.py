@@ -0,0 +1,111 @@
+"""Measure dashboard mirroring over loopback: bandwidth per receiver and end-to-end latency.
+
+Starts a MirrorPublisher and one MirrorSubscriber per requested rate on this
+machine, drives the publisher with a synthetic dashboard (gauges moving every
+frame, signals blinking, alerts changing now and then) and reports what each
+receiver got:
+
+    python mirror_benchmark.py
+    python mirror_benchmark.py --transport ws --rates 60,30,5 --output mirror.json
+
+"full_bytes_per_s" is what sending a full snapshot at the same rate would cost.
+At the end, every receiver is checked to hold the publisher's final values.
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+
+from mirror import MirrorPublisher, MirrorSubscriber, VALUE
+
+GAUGES = ["MPH", "RPM", "OIL", "WATER", "VOLTS", "FUEL"]
+ALERTS = ["check_engine", "oil", "abs"]
+SIGNALS = ["LEFT_SIGNAL", "RIGHT_SIGNAL"]
+CHANNELS = GAUGES + ["ODOMETER"] + ALERTS + SIGNALS
+
+
+def dashboard_state(t, moving):
+    """Channel values at t seconds. Only the first `moving` gauges change every frame."""
+    values = [50 + 40 * math.sin(t * (0.3 + 0.2 * i)) if i < moving else 50.0 for i in range(len(GAUGES))]
+    values.append(12000.0 + t * 0.02)                       # odometer
+    values += [int(t / 7) % 2 == 1, int(t / 11) % 2 == 1, False]  # alerts
+    values += [int(t * 1.5) % 2 == 0, False]                 # left signal blinking
+    return values
+
+
+def as_sent(value):
+    return VALUE.unpack(VALUE.pack(float(value)))[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dashboard mirroring bandwidth and latency over loopback")
+    parser.add_argument("--transport", choices=["udp", "ws"], default="udp")
+    parser.add_argument("--rates", default="30,10,2", help="comma separated update rates, one receiver each")
+    parser.add_argument("--fps", type=int, default=60, help="rate the dashboard state is captured at")
+    parser.add_argument("--moving", type=int, default=2, help="gauges changing every frame")
+    parser.add_argument("--seconds", type=float, default=5.0, help="measured time")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    rates = [float(r) for r in args.rates.split(",")]
+    publisher = MirrorPublisher(CHANNELS, f"{args.transport}:127.0.0.1:0", max_rate=max(rates))
+    publisher.start()
+    subscribers = [MirrorSubscriber(f"{args.transport}:127.0.0.1:{publisher.port}", rate=rate)
+                   for rate in rates]
+    for subscriber in subscribers:
+        subscriber.start()
+
+    mirrored = [{} for _ in subscribers]
+    start = time.perf_counter()
+    interval = 1.0 / args.fps
+    next_frame = start
+    # Run the dashboard for --seconds, then hold its last state while the slowest receiver catches up
+    settle = args.seconds + 2.5 / min(rates) + 0.1
+    while next_frame - start < settle:
+        if next_frame - start < args.seconds:
+            state = dashboard_state(next_frame - start, args.moving)
+        publisher.capture(state)
+        for values, subscriber in zip(mirrored, subscribers):
+            values.update(subscriber.take())  # what a mirror display would apply this frame
+        next_frame += interval
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+
+    expected = {name: as_sent(value) for name, value in zip(CHANNELS, state)}
+    publisher_stats = publisher.stats()
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "transport": args.transport, "fps": args.fps, "moving": args.moving,
+            "channels": len(CHANNELS), "snapshot_bytes": publisher_stats["snapshot_bytes"],
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "receivers": [],
+    }
+    in_sync = True
+    for rate, values, subscriber in zip(rates, mirrored, subscribers):
+        values.update(subscriber.take())
+        stats = subscriber.stats()
+        stats["rate"] = rate
+        stats["full_bytes_per_s"] = round(publisher_stats["snapshot_bytes"] * rate, 1)
+        stats["in_sync"] = values == expected
+        in_sync = in_sync and stats["in_sync"]
+        results["receivers"].append(stats)
+        print(f"{rate:5.1f} Hz  {stats['bytes_per_s']:8.1f} B/s (full snapshots {stats['full_bytes_per_s']:8.1f})  "
+              f"latency p50 {stats['p50_ms']} ms  p99 {stats['p99_ms']} ms  max {stats['max_ms']} ms  "
+              f"gaps {stats['gaps']}  {'in sync' if stats['in_sync'] else 'OUT OF SYNC'}")
+
+    for subscriber in subscribers:
+        subscriber.stop()
+    publisher.stop()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0 if in_sync else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
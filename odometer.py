@@ -0,0 +1,183 @@
+"""Odometer and trip meter with power-loss safe, SD-card friendly persistence.
+
+Odometer.update() integrates speed samples into distance on the GUI thread; it
+only does arithmetic. A background writer thread appends the current totals to
+an append-only journal every flush_interval seconds, and only if they changed,
+so the card sees one small write (and one fsync) per interval at most.
+
+Every journal record holds the absolute totals, a sequence number and a CRC32,
+and all records have the same size. Restoring therefore only reads the latest
+checkpoint and the last valid record of the journal, however long the car has
+been driven. A record torn by a power cut fails its CRC and is skipped.
+
+Once the journal holds compact_every records it is compacted: the latest record
+is written as the new checkpoint (to a temporary file that atomically replaces
+the old one) and the journal is truncated.
+"""
+import os
+import struct
+import threading
+import time
+import zlib
+
+# seq, timestamp, total distance, trip distance
+RECORD = struct.Struct("<Qddd")
+CRC = struct.Struct("<I")
+RECORD_SIZE = RECORD.size + CRC.size
+
+
+def pack_record(seq, timestamp, total, trip):
+    body = RECORD.pack(seq, timestamp, total, trip)
+    return body + CRC.pack(zlib.crc32(body))
+
+
+def unpack_record(data):
+    """Return (seq, timestamp, total, trip), or None if data is short or fails its CRC."""
+    if len(data) != RECORD_SIZE:
+        return None
+    body = data[:RECORD.size]
+    if CRC.unpack(data[RECORD.size:])[0] != zlib.crc32(body):
+        return None
+    return RECORD.unpack(body)
+
+
+class OdometerStore:
+    """Checkpoint file plus journal in one directory. Only the writer thread writes."""
+    def __init__(self, directory, name="odometer"):
+        self.checkpoint_path = os.path.join(directory, name + ".ckpt")
+        self.journal_path = os.path.join(directory, name + ".journal")
+        self.records = 0  # records in the journal
+        self.journal = None
+
+    def restore(self):
+        """Read the newest valid state. Returns (seq, timestamp, total, trip)."""
+        state = (0, 0.0, 0.0, 0.0)
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, "rb") as f:
+                state = unpack_record(f.read()) or state
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as f:
+                size = f.seek(0, os.SEEK_END)
+                count = size // RECORD_SIZE
+                # Walk back from the end past any torn records
+                for i in range(count - 1, -1, -1):
+                    f.seek(i * RECORD_SIZE)
+                    record = unpack_record(f.read(RECORD_SIZE))
+                    if record is not None:
+                        if record[0] > state[0]:
+                            state = record
+                        break
+        return state
+
+    def open(self):
+        """Open the journal for appending, cutting off a partially written last record."""
+        self.journal = open(self.journal_path, "ab")
+        size = self.journal.seek(0, os.SEEK_END)
+        if size % RECORD_SIZE:
+            self.journal.truncate(size - size % RECORD_SIZE)
+        self.records = size // RECORD_SIZE
+
+    def append(self, record):
+        self.journal.write(record)
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+        self.records += 1
+
+    def compact(self, record):
+        """Make record the checkpoint and empty the journal."""
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.checkpoint_path)
+        # The checkpoint is durable before the journal is emptied, so a crash in
+        # between only leaves stale records with lower sequence numbers
+        self.journal.truncate(0)
+        self.journal.seek(0)
+        os.fsync(self.journal.fileno())
+        self.records = 0
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+
+class Odometer:
+    """Integrates speed into a total and a resettable trip distance, and persists both."""
+    def __init__(self, directory=".", flush_interval=30.0, compact_every=1000, max_gap=5.0):
+        """_summary_
+
+        Args:
+            directory (str, optional): where the checkpoint and journal live. Defaults to ".".
+            flush_interval (float, optional): seconds between journal writes. Defaults to 30.0.
+            compact_every (int, optional): journal records before compaction. Defaults to 1000.
+            max_gap (float, optional): samples further apart than this many seconds are not
+                integrated, so a stalled feed does not invent distance. Defaults to 5.0.
+        """
+        self.store = OdometerStore(directory)
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        self.max_gap = max_gap
+
+        self.seq, _, self.total, self.trip = self.store.restore()
+        self.writes = 0
+        self._last_time = None
+        self._last_speed = 0.0
+        self._written = (self.total, self.trip)
+        self._stop_event = threading.Event()
+        self._writer = None
+
+    def update(self, speed, timestamp=None):
+        """Add the distance covered since the previous sample. speed is in distance units per hour."""
+        now = time.monotonic() if timestamp is None else timestamp
+        if self._last_time is not None:
+            dt = now - self._last_time
+            if 0 < dt <= self.max_gap:
+                # Trapezoidal rule between the two samples
+                distance = (self._last_speed + speed) / 2 * dt / 3600
+                if distance > 0:
+                    self.total += distance
+                    self.trip += distance
+        self._last_time = now
+        self._last_speed = speed
+
+    def reset_trip(self):
+        self.trip = 0.0
+
+    # ===================== Persistence =====================
+    def start(self):
+        """Start the background writer."""
+        self.store.open()
+        self._stop_event.clear()
+        self._writer = threading.Thread(target=self._run, daemon=True)
+        self._writer.start()
+
+    def stop(self, timeout=2.0):
+        """Write the final totals and stop the writer."""
+        self._stop_event.set()
+        if self._writer is not None:
+            self._writer.join(timeout)
+            self._writer = None
+
+    def _run(self):
+        try:
+            while not self._stop_event.wait(self.flush_interval):
+                self.flush()
+            self.flush()
+        finally:
+            self.store.close()
+
+    def flush(self):
+        """Journal the current totals if they changed. Called from the writer thread."""
+        totals = (self.total, self.trip)
+        if totals == self._written:
+            return
+        self.seq += 1
+        record = pack_record(self.seq, time.time(), *totals)
+        self.store.append(record)
+        self._written = totals
+        self.writes += 1
+        if self.store.records >= self.compact_every:
+            self.store.compact(record)
@@ -0,0 +1,296 @@
+"""Optional performance instrumentation for the dashboard.
+
+PerfMonitor records, per widget (or per DashboardCanvas), a histogram of paintEvent durations and of the
+latency from CustomGauge.set_value() to the paint that shows it, and how many
+values each gauge skipped repainting because they changed nothing visible. In
+compositor mode the same is recorded per canvas item: GaugeItem.set_value() is
+wrapped too, and an item's latency ends when the canvas has painted that item. It also tracks
+the achieved frame rate and missed frames from the FrameScheduler, and the
+event loop lag, which grows when queued events back up.
+
+Instrumentation is installed by wrapping the widget classes' methods in
+enable() and removed again in disable(). While disabled, the widgets run their
+original, unwrapped methods, so the cost is nil.
+
+PerfOverlay shows a snapshot on screen, and MetricsExporter appends snapshots
+as JSON lines to a file that is rotated once it grows past a size limit.
+"""
+import bisect
+import json
+import os
+import time
+
+from PySide6.QtWidgets import QWidget
+from PySide6.QtGui import QPainter, QFont, QColor
+from PySide6.QtCore import QObject, QTimer, Qt, QRectF
+
+from CustomGauge import CustomGauge, AlertIcon, TurnSignal
+from dashboard_canvas import AlertItem, CanvasItem, DashboardCanvas, GaugeItem, SignalItem
+
+INSTRUMENTED_CLASSES = (CustomGauge, TurnSignal, AlertIcon, DashboardCanvas)
+INSTRUMENTED_ITEMS = (GaugeItem, SignalItem, AlertItem)  # painted by a DashboardCanvas
+GAUGE_CLASSES = (CustomGauge, GaugeItem)
+
+
+class Histogram:
+    """Fixed-bucket histogram of millisecond durations."""
+    EDGES_MS = (0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 133)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.EDGES_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(self.EDGES_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, pct):
+        """Upper edge of the bucket holding the pct-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = self.count * pct / 100
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.EDGES_MS[i] if i < len(self.EDGES_MS) else self.max
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max, 3),
+            "buckets": self.counts,
+        }
+
+
+def widget_key(widget):
+    """Key of a widget's metrics: its object name, or a canvas item's name."""
+    if isinstance(widget, CanvasItem):
+        return widget.name
+    return widget.objectName() or f"{type(widget).__name__}@{id(widget):x}"
+
+
+class PerfMonitor(QObject):
+    """Collects paint and frame metrics while enabled."""
+    def __init__(self, scheduler=None, parent=None):
+        """_summary_
+
+        Args:
+            scheduler (FrameScheduler, optional): scheduler to read frame rate and missed
+                frames from. Defaults to None.
+            parent (any, optional): Parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self.enabled = False
+        self.paint = {}     # widget key -> Histogram of paintEvent durations
+        self.latency = {}   # widget key -> Histogram of set_value -> paint latency
+        self.suppressed = {}  # gauge key -> [set_value calls, calls that needed no repaint]
+        self.event_loop_lag_ms = 0.0
+        self.max_event_loop_lag_ms = 0.0
+        self._originals = {}
+
+        # Probe: a timer that should fire every 100 ms. Any extra delay is time
+        # the event loop spent working through queued events.
+        self._probe = QTimer(self)
+        self._probe.setInterval(100)
+        self._probe.timeout.connect(self._measure_lag)
+        self._probe_last = None
+
+    def enable(self):
+        if self.enabled:
+            return
+        for cls in INSTRUMENTED_CLASSES:
+            self._originals[(cls, "paintEvent")] = cls.paintEvent
+            cls.paintEvent = self._wrap_paint(cls.paintEvent)
+        for cls in INSTRUMENTED_ITEMS:
+            self._originals[(cls, "paint")] = cls.paint
+            cls.paint = self._wrap_item_paint(cls.paint)
+        for cls in GAUGE_CLASSES:
+            self._originals[(cls, "set_value")] = cls.set_value
+            cls.set_value = self._wrap_set_value(cls.set_value)
+        self._probe_last = time.perf_counter()
+        self._probe.start()
+        self.enabled = True
+
+    def disable(self):
+        if not self.enabled:
+            return
+        for (cls, name), method in self._originals.items():
+            setattr(cls, name, method)
+        self._originals.clear()
+        self._probe.stop()
+        self.enabled = False
+
+    def toggle(self):
+        self.disable() if self.enabled else self.enable()
+
+    def reset(self):
+        self.paint.clear()
+        self.latency.clear()
+        self.suppressed.clear()
+        self.max_event_loop_lag_ms = 0.0
+
+    def _wrap_paint(self, paint_event):
+        monitor = self
+
+        def paintEvent(widget, event):
+            start = time.perf_counter()
+            paint_event(widget, event)
+            monitor._painted(widget, start, time.perf_counter())
+        return paintEvent
+
+    def _wrap_item_paint(self, paint):
+        monitor = self
+
+        def wrapped(item, painter, region):
+            start = time.perf_counter()
+            paint(item, painter, region)
+            monitor._painted(item, start, time.perf_counter())
+        return wrapped
+
+    def _painted(self, widget, start, end):
+        """Record a paint of widget (or canvas item), and the latency of the value it shows."""
+        key = widget_key(widget)
+        hist = self.paint.get(key)
+        if hist is None:
+            hist = self.paint[key] = Histogram()
+        hist.add((end - start) * 1000)
+        set_at = widget.__dict__.pop("_perf_set_at", None)
+        if set_at is not None:
+            hist = self.latency.get(key)
+            if hist is None:
+                hist = self.latency[key] = Histogram()
+            hist.add((end - set_at) * 1000)
+
+    def _wrap_set_value(self, set_value):
+        monitor = self
+
+        def wrapped(gauge, value):
+            now = time.perf_counter()
+            before = gauge.suppressed_updates
+            set_value(gauge, value)
+            counts = monitor.suppressed.get(widget_key(gauge))
+            if counts is None:
+                counts = monitor.suppressed[widget_key(gauge)] = [0, 0]
+            counts[0] += 1
+            if gauge.suppressed_updates != before:
+                counts[1] += 1
+                return  # nothing to paint, so no latency to measure
+            # Keep the oldest pending stamp, so coalesced updates report their full wait
+            gauge.__dict__.setdefault("_perf_set_at", now)
+        return wrapped
+
+    def _measure_lag(self):
+        now = time.perf_counter()
+        lag = max(0.0, (now - self._probe_last) * 1000 - self._probe.interval())
+        self._probe_last = now
+        self.event_loop_lag_ms = lag
+        self.max_event_loop_lag_ms = max(self.max_event_loop_lag_ms, lag)
+
+    def snapshot(self):
+        """Current metrics as a JSON-serialisable dict."""
+        data = {
+            "time": time.time(),
+            "event_loop_lag_ms": round(self.event_loop_lag_ms, 3),
+            "max_event_loop_lag_ms": round(self.max_event_loop_lag_ms, 3),
+            "paint": {key: hist.summary() for key, hist in self.paint.items()},
+            "latency": {key: hist.summary() for key, hist in self.latency.items()},
+            "suppressed": {key: {"updates": updates, "suppressed": suppressed}
+                           for key, (updates, suppressed) in self.suppressed.items()},
+        }
+        if self.scheduler is not None:
+            data["fps"] = self.scheduler.achieved_fps
+            data["target_fps"] = self.scheduler.fps
+            data["missed_frames"] = self.scheduler.missed_frames
+            data["last_flush_ms"] = round(self.scheduler.last_flush_ms, 3)
+            data["quality"] = self.scheduler.quality
+        return data
+
+
+class MetricsExporter(QObject):
+    """Appends monitor snapshots to a JSON lines file, keeping one rotated backup."""
+    def __init__(self, monitor, path="perf_metrics.jsonl", interval_ms=5000, max_bytes=1_000_000, parent=None):
+        super().__init__(parent)
+        self.monitor = monitor
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.write)
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def write(self):
+        if not self.monitor.enabled:
+            return
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+            os.replace(self.path, self.path + ".1")
+        with open(self.path, "a") as f:
+            f.write(json.dumps(self.monitor.snapshot()) + "\n")
+
+
+class PerfOverlay(QWidget):
+    """A translucent panel showing the monitor's numbers, refreshed twice a second."""
+    def __init__(self, monitor, parent=None):
+        super().__init__(parent)
+        self.monitor = monitor
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setFixedSize(380, 220)
+        self.text_font = QFont("Consolas", 9)
+        self.lines = []
+        self.timer = QTimer(self)
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def toggle(self):
+        """Show or hide the overlay. Showing it also enables the monitor."""
+        if self.isVisible():
+            self.timer.stop()
+            self.hide()
+        else:
+            self.monitor.enable()
+            self.refresh()
+            self.raise_()
+            self.show()
+            self.timer.start()
+
+    def refresh(self):
+        data = self.monitor.snapshot()
+        lines = []
+        if "fps" in data:
+            lines.append(f"FPS {data['fps']}/{data['target_fps']}  missed {data['missed_frames']}  "
+                         f"quality {data['quality']}")
+        lines.append(f"loop lag {data['event_loop_lag_ms']:.1f} ms (max {data['max_event_loop_lag_ms']:.1f})")
+        lines.append("paint p50/p99/max ms    latency p50  skipped")
+        for key, paint in sorted(data["paint"].items()):
+            latency = data["latency"].get(key)
+            lat = f"{latency['p50_ms']:>6}" if latency else "     -"
+            counts = data["suppressed"].get(key)
+            skipped = f"{100 * counts['suppressed'] / counts['updates']:>7.0f}%" if counts else "       -"
+            lines.append(f"{key[:14]:<14} {paint['p50_ms']:>5}/{paint['p99_ms']:>5}/{paint['max_ms']:>6} {lat} {skipped}")
+        self.lines = lines
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 180))
+        painter.setPen(QColor("lime"))
+        painter.setFont(self.text_font)
+        line_h = painter.fontMetrics().height()
+        for i, line in enumerate(self.lines):
+            painter.drawText(QRectF(6, 4 + i * line_h, self.width() - 12, line_h), Qt.AlignLeft, line)
@@ -0,0 +1,229 @@
+"""Compact columnar telemetry recordings and a replay source for them.
+
+A Recorder taps a TelemetryIngestor and writes every sample it accepts into a
+binary file laid out in columns: one float64 timestamp column and one float32
+column per channel. Samples arriving within merge_window of each other (say,
+the lines of one UDP datagram) share a row; a channel without a sample in a
+row holds NaN. Rows are buffered in fixed-size chunks, so recording uses the
+same memory however long the drive.
+
+File layout (little endian):
+
+    b"GTRC", version u16, channel count u16, names length u32, names (UTF-8, "\\n" separated)
+    then chunks of: b"CHNK", rows u32, timestamps f64[rows], then f32[rows] per channel
+
+A Recording memory-maps the file and reads only the chunk headers up front.
+Columns are returned as memoryviews into the map, so nothing is copied and a
+file of any length can be replayed. A truncated last chunk (from a power cut
+while recording) is ignored.
+
+RecordingSource replays a recording into a TelemetryIngestor at real time, N
+times real time, or as fast as the ingestor takes it.
+"""
+import math
+import mmap
+import struct
+import time
+from array import array
+
+from telemetry import TelemetrySource
+
+MAGIC = b"GTRC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+CHUNK = struct.Struct("<4sI")
+CHUNK_MAGIC = b"CHNK"
+
+
+class Recorder:
+    """Writes samples for a fixed set of channels to a columnar recording."""
+    def __init__(self, path, channels, chunk_rows=4096, merge_window=0.001):
+        """_summary_
+
+        Args:
+            path (str): file to write.
+            channels (list): channel names, in column order.
+            chunk_rows (int, optional): rows buffered before a chunk is written. Defaults to 4096.
+            merge_window (float, optional): seconds within which samples share a row.
+                Defaults to 0.001.
+        """
+        self.channels = list(channels)
+        self.column = {name: i for i, name in enumerate(self.channels)}
+        self.chunk_rows = chunk_rows
+        self.merge_window = merge_window
+        self.rows = 0
+
+        self.file = open(path, "wb")
+        names = "\n".join(self.channels).encode("utf-8")
+        self.file.write(HEADER.pack(MAGIC, VERSION, len(self.channels), len(names)))
+        self.file.write(names)
+
+        self._times = array("d")
+        self._values = [array("f") for _ in self.channels]
+        self._row_time = None
+        self._row = [math.nan] * len(self.channels)
+
+    def add(self, channel, value, timestamp):
+        """Record one sample. Samples for unknown channels are ignored."""
+        i = self.column.get(channel)
+        if i is None:
+            return
+        if self._row_time is not None and (timestamp - self._row_time > self.merge_window
+                                           or not math.isnan(self._row[i])):
+            self._end_row()
+        if self._row_time is None:
+            self._row_time = timestamp
+        self._row[i] = value
+
+    def _end_row(self):
+        self._times.append(self._row_time)
+        for column, value in zip(self._values, self._row):
+            column.append(value)
+        self._row_time = None
+        self._row = [math.nan] * len(self.channels)
+        self.rows += 1
+        if len(self._times) >= self.chunk_rows:
+            self._write_chunk()
+
+    def _write_chunk(self):
+        if not self._times:
+            return
+        self.file.write(CHUNK.pack(CHUNK_MAGIC, len(self._times)))
+        self._times.tofile(self.file)
+        for column in self._values:
+            column.tofile(self.file)
+        self.file.flush()
+        self._times = array("d")
+        self._values = [array("f") for _ in self.channels]
+
+    def close(self):
+        """Write the buffered rows and close the file."""
+        if self.file is None:
+            return
+        if self._row_time is not None:
+            self._end_row()
+        self._write_chunk()
+        self.file.close()
+        self.file = None
+
+
+class Recording:
+    """Read-only, memory-mapped view of a recording."""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self._map
+        magic, version, count, names_len = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a telemetry recording: {path}")
+        offset = HEADER.size
+        names = bytes(data[offset:offset + names_len]).decode("utf-8")
+        self.channels = names.split("\n") if count else []
+        offset += names_len
+
+        # (offset of the timestamp column, rows) per chunk
+        self.chunks = []
+        width = 8 + 4 * count
+        size = len(data)
+        while offset + CHUNK.size <= size:
+            magic, rows = CHUNK.unpack_from(data, offset)
+            start = offset + CHUNK.size
+            if magic != CHUNK_MAGIC or start + rows * width > size:
+                break
+            self.chunks.append((start, rows))
+            offset = start + rows * width
+        self.rows = sum(rows for _, rows in self.chunks)
+
+    def columns(self, index):
+        """Return (timestamps, {channel: values}) of chunk index as memoryviews into the file."""
+        start, rows = self.chunks[index]
+        view = memoryview(self._map)
+        times = view[start:start + 8 * rows].cast("d")
+        values = {}
+        offset = start + 8 * rows
+        for name in self.channels:
+            values[name] = view[offset:offset + 4 * rows].cast("f")
+            offset += 4 * rows
+        return times, values
+
+    def samples(self):
+        """Yield (timestamp, channel, value) for every recorded sample, chunk by chunk."""
+        for index in range(len(self.chunks)):
+            times, values = self.columns(index)
+            columns = list(values.items())
+            for row, t in enumerate(times):
+                for name, column in columns:
+                    value = column[row]
+                    if value == value:  # skip NaN: no sample for this channel in this row
+                        yield t, name, value
+
+    @property
+    def duration(self):
+        if not self.chunks:
+            return 0.0
+        first, _ = self.columns(0)
+        last, _ = self.columns(len(self.chunks) - 1)
+        return last[-1] - first[0]
+
+    def close(self):
+        self._map.close()
+
+
+class RecordingSource(TelemetrySource):
+    """Replays a Recording into a TelemetryIngestor.
+
+    speed 1.0 replays in real time, 4.0 four times as fast, and 0 as fast as possible.
+    """
+    def __init__(self, path, speed=1.0, loop=False, batch=256):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.batch = batch  # samples handed over per read() when not pacing
+        self.recording = None
+        self.finished = False
+        self._samples = None
+        self._pending = None
+        self._start_wall = None
+        self._start_time = None
+
+    def open(self):
+        self.recording = Recording(self.path)
+        self._restart()
+
+    def _restart(self):
+        self._samples = self.recording.samples()
+        self._pending = None
+        self._start_wall = time.monotonic()
+        self._start_time = None
+
+    def read(self):
+        out = []
+        while len(out) < self.batch:
+            sample = self._pending or next(self._samples, None)
+            self._pending = None
+            if sample is None:
+                if self.loop and self.recording.rows:
+                    self._restart()
+                    continue
+                self.finished = True
+                time.sleep(0.05)
+                break
+            t, channel, value = sample
+            if self._start_time is None:
+                self._start_time = t
+            if self.speed:
+                wait = (t - self._start_time) / self.speed - (time.monotonic() - self._start_wall)
+                if wait > 0:
+                    # Hand over what is due now; sleep briefly so stop() is never held up
+                    self._pending = sample
+                    if not out:
+                        time.sleep(min(wait, 0.05))
+                    break
+            out.append((channel, value))
+        return out
+
+    def close(self):
+        if self.recording is not None:
+            self._samples = None
+            self.recording.close()
+            self.recording = None
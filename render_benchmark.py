@@ -0,0 +1,262 @@
+"""Headless rendering benchmark for CustomGauge, TurnSignal and AlertIcon.
+
+Runs under the offscreen Qt platform, so no display or GPU is needed:
+
+    python render_benchmark.py --output bench.json
+    python render_benchmark.py --baseline bench.json --tolerance 0.15
+
+Every case renders its widgets into an offscreen image for a number of frames,
+changing the value (or blink/alert state) each frame. Results hold paint time
+percentiles, frames per second and peak memory, and are written as JSON. With
+--baseline, cases whose median paint time got slower than the tolerance allows
+are reported and the exit code is 1.
+
+With --recording, gauges are driven by the samples of a drive recorded with
+speedometer_app.py --record (one sample per frame, from --channel) instead of
+a synthetic sweep.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6 import __version__ as pyside_version
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QColor, QImage, QPainter
+from PySide6.QtCore import QPoint, Qt
+
+from CustomGauge import CustomGauge, AlertIcon, TurnSignal
+from recorder import Recording
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# ===================== Case Matrix =====================
+GAUGE_SIZES = [200, 400, 800]
+GAUGE_TICKS = [("coarse", 10), ("dense", 1)]  # minor_tick over a 0-160 range
+ANTIALIASING = [True, False]
+GAUGE_COUNTS = [1, 6]
+ICON_SIZES = [60, 120]
+
+
+def build_cases(quick=False):
+    """Return a list of (name, factory, count) where factory(i) builds one widget."""
+    sizes = GAUGE_SIZES[:2] if quick else GAUGE_SIZES
+    counts = GAUGE_COUNTS[:1] if quick else GAUGE_COUNTS
+    cases = []
+    for size, (density, minor), aa, count in itertools.product(sizes, GAUGE_TICKS, ANTIALIASING, counts):
+        def factory(i, size=size, minor=minor, aa=aa):
+            gauge = CustomGauge(label="MPH", units="MPH", needle_color=QColor("red"),
+                                dial_color=QColor("red"), min_value=0, max_value=160,
+                                major_tick=20, minor_tick=minor, odometer=True, antialiasing=aa)
+            gauge.setFixedSize(size, size)
+            return gauge
+        name = f"CustomGauge/size={size}/ticks={density}/aa={'on' if aa else 'off'}/count={count}"
+        cases.append((name, factory, count))
+
+    for size in sizes:
+        def history_factory(i, size=size):
+            gauge = CustomGauge(label="OIL", units="PSI", needle_color=QColor("red"),
+                                dial_color=QColor("red"), min_value=0, max_value=160,
+                                major_tick=20, minor_tick=10, peak_hold=True, min_hold=10,
+                                sparkline=True, sparkline_seconds=2.0)
+            gauge.setFixedSize(size, size)
+            return gauge
+        cases.append((f"CustomGauge/size={size}/history=on/count=1", history_factory, 1))
+
+    for size, aa in itertools.product(ICON_SIZES, ANTIALIASING):
+        def signal_factory(i, size=size, aa=aa):
+            signal = TurnSignal("left" if i % 2 == 0 else "right")
+            signal.antialiasing = aa
+            signal.setFixedSize(size, size)
+            signal.on = True
+            return signal
+        cases.append((f"TurnSignal/size={size}/aa={'on' if aa else 'off'}/count=2", signal_factory, 2))
+
+    for aa in ANTIALIASING:
+        def alert_factory(i, aa=aa):
+            icon = ("check_engine.png", "oil.png", "abs.png")[i % 3]
+            alert = AlertIcon(os.path.join(HERE, "icons", icon), icon.split(".")[0].upper())
+            alert.antialiasing = aa
+            return alert
+        cases.append((f"AlertIcon/aa={'on' if aa else 'off'}/count=3", alert_factory, 3))
+    return cases
+
+
+# Recorded gauge values, one per frame, set by --recording
+WORKLOAD = []
+
+
+def load_workload(path, channel, limit):
+    """Return up to limit recorded values of channel, read chunk by chunk."""
+    recording = Recording(path)
+    if channel not in recording.channels:
+        recording.close()
+        raise ValueError(f"{path} has no channel {channel!r} (has {', '.join(recording.channels)})")
+    values = []
+    for index in range(len(recording.chunks)):
+        column = recording.columns(index)[1][channel]
+        values.extend(v for v in column if v == v)  # NaN: no sample in that row
+        column.release()
+        if len(values) >= limit:
+            break
+    recording.close()
+    return values[:limit]
+
+
+def advance(widget, frame):
+    """Change what the widget shows, the way live data would."""
+    if isinstance(widget, CustomGauge):
+        if WORKLOAD:
+            widget.set_value(WORKLOAD[frame % len(WORKLOAD)])
+        else:
+            widget.set_value(widget.min_value + (frame * 7.3) % (widget.max_value - widget.min_value))
+    elif isinstance(widget, TurnSignal):
+        widget.visible_state = frame % 2 == 0
+    elif isinstance(widget, AlertIcon):
+        widget.active = frame % 2 == 0
+
+
+def advance_all(widgets, frame):
+    for widget in widgets:
+        advance(widget, frame)
+
+
+def render_frame(widgets, targets):
+    """Paint every widget into its offscreen image. Returns the elapsed seconds."""
+    start = time.perf_counter()
+    for widget, image in zip(widgets, targets):
+        painter = QPainter(image)
+        widget.render(painter, QPoint())
+        painter.end()
+    return time.perf_counter() - start
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def run_case(factory, count, frames, warmup):
+    widgets = [factory(i) for i in range(count)]
+    targets = []
+    for widget in widgets:
+        image = QImage(widget.size(), QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        targets.append(image)
+
+    # First frame includes building any cached layers
+    advance_all(widgets, 0)
+    first_frame_ms = render_frame(widgets, targets) * 1000
+
+    for frame in range(1, warmup + 1):
+        advance_all(widgets, frame)
+        render_frame(widgets, targets)
+
+    times = []
+    for frame in range(warmup + 1, warmup + 1 + frames):
+        advance_all(widgets, frame)
+        times.append(render_frame(widgets, targets) * 1000)
+
+    # Separate pass for memory, since tracing slows rendering down
+    tracemalloc.start()
+    for frame in range(min(frames, 50)):
+        advance_all(widgets, frame)
+        render_frame(widgets, targets)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times.sort()
+    mean = sum(times) / len(times)
+    return {
+        "widgets": count,
+        "frames": frames,
+        "first_frame_ms": round(first_frame_ms, 4),
+        "p50_ms": round(percentile(times, 50), 4),
+        "p90_ms": round(percentile(times, 90), 4),
+        "p99_ms": round(percentile(times, 99), 4),
+        "max_ms": round(times[-1], 4),
+        "mean_ms": round(mean, 4),
+        "fps": round(1000 / mean, 1) if mean else None,
+        "peak_python_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of (case, baseline p50, current p50) for cases that regressed."""
+    regressions = []
+    for name, current in results["cases"].items():
+        before = baseline.get("cases", {}).get(name)
+        if before and current["p50_ms"] > before["p50_ms"] * (1 + tolerance):
+            regressions.append((name, before["p50_ms"], current["p50_ms"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless rendering benchmark")
+    parser.add_argument("--frames", type=int, default=200, help="timed frames per case")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed frames per case")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="smaller matrix")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="compare against a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="allowed median slowdown before flagging a regression (0.15 = 15%%)")
+    parser.add_argument("--recording", help="drive gauges with values from this recording")
+    parser.add_argument("--channel", default="MPH", help="recorded channel to use with --recording")
+    args = parser.parse_args(argv)
+
+    if args.recording:
+        WORKLOAD[:] = load_workload(args.recording, args.channel, args.warmup + 1 + args.frames)
+        if not WORKLOAD:
+            parser.error(f"no {args.channel} samples in {args.recording}")
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "pyside": pyside_version,
+            "machine": platform.machine(),
+            "platform": app.platformName(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "workload": args.recording or "sweep",
+        },
+        "cases": {},
+    }
+    for name, factory, count in build_cases(args.quick):
+        if args.filter not in name:
+            continue
+        case = run_case(factory, count, args.frames, args.warmup)
+        results["cases"][name] = case
+        print(f"{name:<58} p50 {case['p50_ms']:8.3f} ms  p99 {case['p99_ms']:8.3f} ms  {case['fps']:>8} fps")
+    results["meta"]["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: p50 {before:.3f} ms -> {after:.3f} ms")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
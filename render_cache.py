@@ -0,0 +1,143 @@
+"""On-disk cache of pre-rendered dial backgrounds and tinted alert icons.
+
+Rendering every dial face and decoding and recoloring every icon dominates the
+time from launch to a fully drawn dashboard on slow hardware. With a RenderCache
+installed, GaugeDial and tinted_icon() look their pixmaps up on disk before
+rendering, and store whatever they had to render for the next launch.
+
+Entries are keyed by a hash of everything the pixmap depends on (the gauge's
+parameters and size, or the icon file, color and size) plus the Qt and PySide
+versions and CACHE_VERSION, so stale entries are simply never looked up again.
+They are stored as raw premultiplied ARGB32 pixels behind a small header, which
+loads without any image decoding.
+
+StartupTimer records how long each startup phase takes.
+"""
+import hashlib
+import os
+import struct
+import time
+
+from PySide6 import __version__ as pyside_version
+from PySide6.QtCore import qVersion
+from PySide6.QtGui import QImage, QPixmap
+
+# Bump whenever the drawing code changes what a cached pixmap looks like
+CACHE_VERSION = 1
+
+# magic, width, height, bytes per line, device pixel ratio
+HEADER = struct.Struct("<4sIIId")
+MAGIC = b"GDRC"
+
+
+class RenderCache:
+    """A directory of cached pixmaps."""
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def key(self, kind, *parts):
+        """Hash kind and parts, plus the versions the rendering depends on, into a file name."""
+        text = repr((CACHE_VERSION, qVersion(), pyside_version, kind) + parts)
+        return f"{kind}-{hashlib.sha1(text.encode()).hexdigest()}"
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".px")
+
+    def load(self, key):
+        """Return the cached pixmap for key, or None."""
+        try:
+            with open(self.path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        if len(data) < HEADER.size:
+            self.misses += 1
+            return None
+        magic, width, height, stride, dpr = HEADER.unpack_from(data)
+        if magic != MAGIC or len(data) != HEADER.size + stride * height:
+            self.misses += 1
+            return None
+        image = QImage(data[HEADER.size:], width, height, stride, QImage.Format_ARGB32_Premultiplied)
+        pixmap = QPixmap.fromImage(image.copy())  # copy: the QImage does not own data
+        pixmap.setDevicePixelRatio(dpr)
+        self.hits += 1
+        return pixmap
+
+    def store(self, key, pixmap):
+        """Write pixmap under key. The file is replaced atomically, so readers never see half of it."""
+        image = pixmap.toImage().convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        header = HEADER.pack(MAGIC, image.width(), image.height(), image.bytesPerLine(),
+                             pixmap.devicePixelRatio())
+        path = self.path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(header)
+                f.write(bytes(image.constBits()))
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"⚠️ Could not write render cache entry: {e}")
+            return
+        self.stores += 1
+
+    def prune(self, max_bytes=32_000_000):
+        """Delete the least recently written entries until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".px"):
+                st = os.stat(os.path.join(self.directory, name))
+                entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+
+_cache = None
+
+
+def install_render_cache(cache):
+    """Look pixmaps up in cache from now on. Pass None to uninstall."""
+    global _cache
+    _cache = cache
+
+
+def render_cache():
+    """The installed RenderCache, or None."""
+    return _cache
+
+
+class StartupTimer:
+    """Wall time of each named startup phase, measured from start."""
+    def __init__(self, start=None):
+        """_summary_
+
+        Args:
+            start (float, optional): time.perf_counter() value the first phase began at,
+                e.g. taken before the imports. Defaults to now.
+        """
+        self.start = time.perf_counter() if start is None else start
+        self._last = self.start
+        self.phases = []  # (name, ms)
+
+    def mark(self, name):
+        """End the current phase, naming it name."""
+        now = time.perf_counter()
+        self.phases.append((name, (now - self._last) * 1000))
+        self._last = now
+
+    @property
+    def total_ms(self):
+        return (self._last - self.start) * 1000
+
+    def report(self):
+        lines = [f"{name:<16} {ms:8.1f} ms" for name, ms in self.phases]
+        lines.append(f"{'total':<16} {self.total_ms:8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,227 @@
+"""The shared memory block behind AcquisitionProcess, and the child process that fills it.
+
+Nothing here imports Qt, so a spawned acquisition child only pays for Python,
+the telemetry source and this module before it starts producing.
+
+Block layout (native byte order, 8-byte fields):
+
+    header: sequence, samples published, heartbeat (monotonic seconds), producer pid
+            (set once its source is open), drops
+    then value f64[channels], timestamp f64[channels], started u64[channels], count u64[channels]
+
+Writes are guarded by a sequence lock: the producer makes the sequence odd,
+writes a batch of samples and makes it even again. A reader copies the columns
+between two reads of the sequence and retries if they differ or are odd, so it
+never sees half of a batch.
+
+Python offers no memory barriers, so this relies on the stores of one process
+becoming visible to the other in the order they were made. CPython makes them
+in program order, and x86 keeps that order between cores; weakly ordered CPUs
+such as the ARM in a Raspberry Pi do not promise it. As a second line of
+defence each slot carries its own check: the producer bumps the slot's
+"started" count before writing its value and its "count" after, and the reader
+copies them in the opposite order (count, value, started) and rejects a
+snapshot in which they differ. A value whose stores were seen out of order is
+then caught in all but the rarest interleavings, and at worst a frame shows
+one channel's previous or next sample.
+"""
+import os
+import time
+from array import array
+from multiprocessing import shared_memory
+
+HEADER_FIELDS = 5
+SEQ, SAMPLES, HEARTBEAT, PID, DROPS = range(HEADER_FIELDS)
+
+
+def block_size(channel_count):
+    return 8 * (HEADER_FIELDS + 4 * channel_count)
+
+
+class SharedChannels:
+    """Typed views of a shared channel block. Used by the producer to write and the GUI to read."""
+    def __init__(self, channels, name=None, create=False):
+        """_summary_
+
+        Args:
+            channels (list): channel names, in slot order. Both sides must agree on it.
+            name (str, optional): block to attach to. Defaults to None (a new name).
+            create (bool, optional): create the block rather than attach to it. Defaults to False.
+        """
+        self.channels = list(channels)
+        self.index = {name: i for i, name in enumerate(self.channels)}
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=block_size(len(channels)))
+        else:
+            self.shm = _attach(name)
+        n = len(self.channels)
+        buf = self.shm.buf
+        header = 8 * HEADER_FIELDS
+        self.header = buf[:header].cast("Q")
+        self.heartbeat = buf[8 * HEARTBEAT:8 * HEARTBEAT + 8].cast("d")
+        self.values = buf[header:header + 8 * n].cast("d")
+        self.times = buf[header + 8 * n:header + 16 * n].cast("d")
+        self.started = buf[header + 16 * n:header + 24 * n].cast("Q")
+        self.counts = buf[header + 24 * n:header + 32 * n].cast("Q")
+        if create:
+            buf[:block_size(n)] = bytes(block_size(n))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def publish(self, samples):
+        """Write (channel, value, timestamp) samples as one batch. Samples of unknown channels
+        are skipped and counted as drops."""
+        index = self.index
+        header = self.header
+        header[SEQ] += 1  # odd: write in progress
+        published = 0
+        dropped = 0
+        for channel, value, timestamp in samples:
+            i = index.get(channel)
+            if i is None:
+                dropped += 1
+                continue
+            count = self.counts[i] + 1
+            self.started[i] = count
+            self.values[i] = value
+            self.times[i] = timestamp
+            self.counts[i] = count
+            published += 1
+        header[SAMPLES] += published
+        header[DROPS] += dropped
+        header[SEQ] += 1  # even: consistent again
+
+    def beat(self):
+        self.heartbeat[0] = time.monotonic()
+
+    def repair(self):
+        """Make the block consistent again after a producer died in the middle of a batch."""
+        if self.header[SEQ] % 2:
+            self.header[SEQ] += 1
+        self.started[:] = self.counts
+
+    def close(self):
+        # The views must be released before the mapping can be closed
+        for view in (self.header, self.heartbeat, self.values, self.times, self.started, self.counts):
+            view.release()
+        self.shm.close()
+
+
+def _attach(name):
+    """Attach to an existing block without tracking it, so the child never unlinks it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always tracks, but a spawned child shares the parent's
+        # resource tracker, where the block is already registered
+        return shared_memory.SharedMemory(name=name)
+
+
+def acquire(source_factory, channels, block_name, stop_event):
+    """Child process: read the source and publish every batch of samples into the block."""
+    block = SharedChannels(channels, name=block_name)
+    # Alive: opening the source (a serial port, say) may take a while of its own
+    block.beat()
+    source = source_factory()
+    source.open()
+    block.header[PID] = os.getpid()  # started: from now on, missing heartbeats count
+    block.beat()
+    parse_line = None
+    try:
+        while not stop_event.is_set():
+            items = source.read()
+            block.beat()
+            now = time.monotonic()
+            batch = []
+            malformed = 0
+            for item in items:
+                if isinstance(item, str):
+                    if not item.strip():
+                        continue
+                    if parse_line is None:
+                        from telemetry import parse_line  # only line-based sources need it
+                    item = parse_line(item)
+                    if item is None:
+                        malformed += 1
+                        continue
+                batch.append((item[0], item[1], now))
+            if malformed:
+                block.header[DROPS] += malformed
+            if batch:
+                block.publish(batch)
+    finally:
+        source.close()
+        block.close()
+
+
+class SharedSlot:
+    """One channel of a SharedChannelReader, drained like a ChannelRing."""
+    __slots__ = ("reader", "i", "seen", "overruns")
+
+    def __init__(self, reader, i):
+        self.reader = reader
+        self.i = i
+        self.seen = 0       # sample count at the last drain
+        self.overruns = 0   # samples replaced by a newer one before a frame read them
+
+    def drain(self, mode="latest"):
+        """Return the latest value if the channel has a new sample since the last drain, else None.
+
+        Only the latest value is shared, so every mode behaves like "latest".
+        """
+        reader = self.reader
+        count = reader.counts[self.i]
+        if count == self.seen:
+            return None
+        self.overruns += count - self.seen - 1
+        self.seen = count
+        return reader.values[self.i]
+
+
+class SharedChannelReader:
+    """GUI-side reader that takes one consistent snapshot of the block per frame."""
+    def __init__(self, block, retries=100):
+        self.block = block
+        self.retries = retries
+        n = len(block.channels)
+        self.values = array("d", bytes(8 * n))
+        self.counts = array("Q", bytes(8 * n))
+        self._started = array("Q", bytes(8 * n))
+        self._values_view = memoryview(self.values)
+        self._counts_view = memoryview(self.counts)
+        self._started_view = memoryview(self._started)
+        # Last consistent snapshot, kept when a new one cannot be taken
+        self._good_values = array("d", self.values)
+        self._good_counts = array("Q", self.counts)
+        self.samples = 0
+        self.drops = 0
+        self.torn = 0  # snapshots abandoned because the producer kept writing
+        self.rings = {name: SharedSlot(self, i) for i, name in enumerate(block.channels)}
+
+    def poll(self):
+        """Copy the block into values/counts. Keeps the previous snapshot if it cannot get a
+        consistent one within retries attempts."""
+        block = self.block
+        header = block.header
+        for _ in range(self.retries):
+            seq = header[SEQ]
+            if seq % 2:
+                continue
+            # Opposite order to publish(): count, value, then started
+            self._counts_view[:] = block.counts
+            self._values_view[:] = block.values
+            self._started_view[:] = block.started
+            samples = header[SAMPLES]
+            drops = header[DROPS]
+            if header[SEQ] == seq and self._started == self.counts:
+                self.samples = samples
+                self.drops = drops
+                self._good_values[:] = self.values
+                self._good_counts[:] = self.counts
+                return True
+        self.values[:] = self._good_values
+        self.counts[:] = self._good_counts
+        self.torn += 1
+        return False
@@ -1,17 +1,41 @@
+import time
+_launched = time.perf_counter()  # taken before the imports, so the startup report counts them
+
+import argparse
+import functools
 import json
 import os
 import sys
 import math
 from PySide6.QtWidgets import (
     QApplication, QWidget, QHBoxLayout, QVBoxLayout, QDialog, QLabel,
-    QPushButton, QLineEdit, QCheckBox
+    QPushButton, QLineEdit, QCheckBox, QStackedLayout
 )
 from PySide6.QtGui import QPainter, QPen, QFont, QColor, QPolygonF
-from PySide6.QtCore import QPoint, Qt, QRectF, QPointF, QTimer
-
-from CustomGauge import CustomGauge, AlertIcon, TurnSignal
+from PySide6.QtCore import QObject, QPoint, Qt, QRectF, QPointF, QTimer
+
+from CustomGauge import CustomGauge, AlertIcon, TurnSignal, GaugeDial
+from dashboard_canvas import DashboardCanvas, GaugeItem, AlertItem, SignalItem
+from animation import AnimationClock, NeedleAnimator, install_clock
+from frame_scheduler import FrameScheduler, QualityController, frame_interval_ms, install_scheduler
+from perf_monitor import PerfMonitor, PerfOverlay, MetricsExporter
+from telemetry import TelemetryIngestor, source_from_spec
+from gauge_feeder import GaugeFeeder
+from recorder import Recorder
+from acquisition import AcquisitionProcess
+from mirror import MirrorPublisher, MirrorSubscriber
+from odometer import Odometer
+from render_cache import RenderCache, StartupTimer, install_render_cache
+from alert_rules import AlertEngine, load_rules, parse_rule
+from dashboard_pages import PageEntry, PageManager, load_pages, DEFAULT_PAGE, ODOMETER_CHANNEL
 
 POSITIONS_FILE = "gauge_positions.json"
+PAGES_FILE = "dashboard_pages.json"
+
+# Quiet time after the last +/- click before a resized gauge is rendered crisply again
+RESIZE_SETTLE_MS = 400
+# Quiet time after the last layout change before it is written
+LAYOUT_SAVE_DELAY_MS = 1000
 
 # ===================== Draggable Wrapper =====================
 class DraggableGauge(QWidget):
@@ -21,32 +45,97 @@ class DraggableGauge(QWidget):
         self.name = name
         self.draggable = draggable
         self.offset = QPoint()
+        self.on_moved = []  # callbacks run when a drag has moved the gauge
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(gauge)
         self.setFixedSize(gauge.width(), gauge.height())
 
+        # A drag moves the gauge at most once per frame, to the latest mouse position
+        self._drag_start = QPoint()
+        self._drag_target = None
+        self._drag_timer = QTimer(self)
+        self._drag_timer.setSingleShot(True)
+        self._drag_timer.timeout.connect(self._apply_drag)
+
     def mousePressEvent(self, event):
         if self.draggable and event.button() == Qt.LeftButton:
             self.offset = event.pos()
+            self._drag_start = self.pos()
 
     def mouseMoveEvent(self, event):
         if self.draggable and event.buttons() & Qt.LeftButton:
-            self.move(self.mapToParent(event.pos() - self.offset))
+            self._drag_target = self.mapToParent(event.pos() - self.offset)
+            if not self._drag_timer.isActive():
+                self._drag_timer.start(frame_interval_ms())
+
+    def _apply_drag(self):
+        if self._drag_target is not None:
+            self.move(self._drag_target)
+            self._drag_target = None
+
+    def mouseReleaseEvent(self, event):
+        if not self.draggable or event.button() != Qt.LeftButton:
+            return
+        self._drag_timer.stop()
+        self._apply_drag()
+        if self.pos() != self._drag_start:
+            for callback in self.on_moved:
+                callback()
+
+    def set_size(self, size):
+        self.gauge.setFixedSize(size, size)
+        self.setFixedSize(size, size)
 
 
 # ===================== Save/Load =====================
-def save_positions_and_scales(widgets, scales):
+def _read_layout_file(path=POSITIONS_FILE):
+    if not os.path.exists(path):
+        return {"pages": {}}
+    with open(path, "r") as f:
+        data = json.load(f)
+    if "pages" not in data:
+        # Saved before dashboards had pages: it is the layout of the default page
+        data = {"pages": {DEFAULT_PAGE: data}}
+    return data
+
+def save_positions_and_scales(widgets, scales, page=DEFAULT_PAGE):
     positions = {w.name: [w.x(), w.y()] for w in widgets}
-    data = {"positions": positions, "scales": scales}
-    with open(POSITIONS_FILE, "w") as f:
+    data = _read_layout_file()
+    data["pages"][page] = {"positions": positions, "scales": scales}
+    # Written to a temporary file that replaces the old one, so a power cut leaves one or the other
+    tmp = POSITIONS_FILE + ".tmp"
+    with open(tmp, "w") as f:
         json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, POSITIONS_FILE)
+
+def load_positions_and_scales(page=DEFAULT_PAGE, path=POSITIONS_FILE):
+    return _read_layout_file(path)["pages"].get(page)
+
+
+class LayoutSaver(QObject):
+    """Saves a page's layout once it has stopped changing for a moment, rather than only at exit."""
+    def __init__(self, delay_ms=LAYOUT_SAVE_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self.pending = {}  # page name -> Page
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.flush)
 
-def load_positions_and_scales():
-    if os.path.exists(POSITIONS_FILE):
-        with open(POSITIONS_FILE, "r") as f:
-            return json.load(f)
-    return None
+    def schedule(self, page):
+        """Save page after the delay, restarting it if a save is already waiting."""
+        self.pending[page.name] = page
+        self.timer.start()
+
+    def flush(self):
+        """Save every waiting page now."""
+        self.timer.stop()
+        pages, self.pending = self.pending, {}
+        for page in pages.values():
+            save_positions_and_scales(page.placed, page.scales, page.name)
 
 
 # ===================== Setup Dialog =====================
@@ -58,6 +147,15 @@ class DashboardSetupDialog(QDialog):
         self.alerts = alerts
         self.signals = signals
         self.selected_idx = 0
+        self.on_changed = []  # callbacks run after a gauge is resized
+
+        # A run of +/- clicks is one resize gesture: gauges show a scaled snapshot
+        # until the clicks stop, then render once at their final size
+        self.previewing = []
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(RESIZE_SETTLE_MS)
+        self.settle_timer.timeout.connect(self.end_resize)
 
         self.setWindowTitle("Dashboard Setup")
         self.setMinimumWidth(400)
@@ -105,12 +203,12 @@ class DashboardSetupDialog(QDialog):
         nav_layout.addWidget(self.next_btn)
         nav_layout.addWidget(self.ok_btn)
 
-        # --- Alerts checkboxes ---
+        # --- Alerts checkboxes (alerts and signals are ChannelValues shared by every page) ---
         self.alert_checks = {}
         for name, alert in alerts.items():
-            cb = QCheckBox(f"{name.upper()}")
-            cb.setChecked(alert.active)
-            cb.stateChanged.connect(lambda state, a=alert: a.set_active(bool(state)))
+            cb = QCheckBox(name.upper().replace("_", " "))
+            cb.setChecked(bool(alert.value))
+            cb.stateChanged.connect(lambda state, a=alert: a.set_value(bool(state)))
             self.alert_checks[name] = cb
 
         alerts_layout = QVBoxLayout()
@@ -121,9 +219,9 @@ class DashboardSetupDialog(QDialog):
         # --- Signals checkboxes ---
         self.signal_checks = {}
         for name, signal in signals.items():
-            cb = QCheckBox(f"{name.upper()} SIGNAL")
-            cb.setChecked(signal.on)
-            cb.stateChanged.connect(lambda state, s=signal: s.start() if state else s.stop())
+            cb = QCheckBox(name.upper().replace("_", " "))
+            cb.setChecked(bool(signal.value))
+            cb.stateChanged.connect(lambda state, s=signal: s.set_value(bool(state)))
             self.signal_checks[name] = cb
 
         signals_layout = QVBoxLayout()
@@ -146,11 +244,23 @@ class DashboardSetupDialog(QDialog):
         base = self.default_sizes[idx]
         size = int(base * factor)
 
-        # FIX: use .gauge not .widget
-        self.widgets[idx].gauge.setFixedSize(size, size)  
-        self.widgets[idx].setFixedSize(size, size)       
+        widget = self.widgets[idx]
+        dial = getattr(widget, "gauge", widget)  # the gauge in a DraggableGauge, or a canvas item
+        if isinstance(dial, GaugeDial):
+            dial.begin_resize_preview()
+            if dial not in self.previewing:
+                self.previewing.append(dial)
+            self.settle_timer.start()
+        widget.set_size(size)
+
+        self.scales[widget.name] = size
+        for callback in self.on_changed:
+            callback()
 
-        self.scales[self.widgets[idx].name] = size
+    def end_resize(self):
+        previewing, self.previewing = self.previewing, []
+        for dial in previewing:
+            dial.end_resize_preview()
 
     def decrease_scale(self):
         idx = self.selected_idx
@@ -191,117 +301,403 @@ class DashboardSetupDialog(QDialog):
         self.custom_box.setText("")
 
 
+# ===================== Dashboard Definition =====================
+# (name, CustomGauge options, default size)
+GAUGE_DEFS = [
+    ("OIL", dict(label="OIL", units="PSI", needle_color=QColor("red"), dial_color=QColor("red"), min_value=0, max_value=100, major_tick=25, minor_tick=5, start_angle=210, end_angle=-30, decimals=0), 200),
+    ("WATER", dict(label="WATER", units="°F", needle_color=QColor("red"), dial_color=QColor("red"), min_value=100, max_value=250, major_tick=50, minor_tick=10, start_angle=210, end_angle=-30, decimals=0, refresh="slow"), 200),
+    ("VOLTS", dict(label="VOLTS", units="V", needle_color=QColor("red"), dial_color=QColor("red"), min_value=8, max_value=18, major_tick=2, minor_tick=1, start_angle=210, end_angle=-30, decimals=1, refresh="slow"), 200),
+    ("FUEL", dict(label="FUEL", units="F", needle_color=QColor("red"), dial_color=QColor("red"), min_value=0, max_value=10, major_tick=10, minor_tick=1, start_angle=210, end_angle=-30, fuel_ticks=True, decimals=1, refresh="slow"), 200),
+    ("MPH", dict(label="MPH", units="MPH", needle_color=QColor("red"), dial_color=QColor("red"), min_value=0, max_value=160, major_tick=20, minor_tick=10, start_angle=210, end_angle=-30, odometer=True, decimals=0, refresh="realtime"), 400),
+    ("RPM", dict(label="RPM", units="x1000", needle_color=QColor("red"), dial_color=QColor("red"), min_value=0, max_value=10, major_tick=1, minor_tick=1, start_angle=210, end_angle=-30, decimals=1, refresh="realtime"), 400),
+]
+# (name, icon path, label)
+ALERT_DEFS = [
+    ("check_engine", "icons/check_engine.png", "ENGINE"),
+    ("oil", "icons/oil.png", "OIL"),
+    ("abs", "icons/abs.png", "ABS"),
+]
+# (name, direction, default size)
+SIGNAL_DEFS = [
+    ("LEFT_SIGNAL", "left", 60),
+    ("RIGHT_SIGNAL", "right", 60),
+]
+# (alert name, rule) used without --alert-rules; see alert_rules.py for the syntax
+ALERT_RULES = [
+    ("oil", "OIL < 10 for 2s hysteresis 2"),
+    ("check_engine", "WATER > 230 hysteresis 5"),
+    ("check_engine", "VOLTS outside 11.5-15 for 1s hysteresis 0.2"),
+]
+# Default positions, in the order gauges, alerts, signals are built
+DEFAULT_POSITIONS = [
+    (20, 20), (240, 20), (20, 240), (240, 240), (500, 60), (950, 60),  # gauges
+    (850, 20), (1050, 20),  # turn signals
+    (700, 350), (770, 350), (840, 350),  # alert icons
+]
+
+
+def builtin_catalog():
+    """The built-in instruments as PageEntry objects by name, with their default positions."""
+    entries = [PageEntry("gauge", name, options, size) for name, options, size in GAUGE_DEFS]
+    entries += [PageEntry("alert", name, dict(icon_path=icon_path, label=label))
+                for name, icon_path, label in ALERT_DEFS]
+    entries += [PageEntry("signal", name, dict(direction=direction), size)
+                for name, direction, size in SIGNAL_DEFS]
+    for entry, pos in zip(entries, DEFAULT_POSITIONS):
+        entry.pos = pos
+    return {entry.name: entry for entry in entries}
+
+
+def saved_size(setup_data, name, default_size):
+    if setup_data and "scales" in setup_data and name in setup_data["scales"]:
+        return setup_data["scales"][name]
+    return default_size
+
+
+def place(placed, entries, setup_data):
+    """Move each placed widget/item to its saved position, or its entry's default one."""
+    positions = setup_data.get("positions", {}) if setup_data else {}
+    for g, entry in zip(placed, entries):
+        pos = positions.get(g.name, entry.pos)
+        g.move(pos[0], pos[1])
+
+
+def build_widget_page(page, container, setup_data, draggable):
+    """One widget per instrument of page, each in a DraggableGauge inside container.
+
+    Returns (placed, instruments, scales): the draggable wrappers in save order,
+    the instruments by name, and the size of each.
+    """
+    placed, instruments, scales = [], {}, {}
+    for entry in page.entries:
+        if entry.kind == "gauge":
+            widget = CustomGauge(**entry.options)
+        elif entry.kind == "alert":
+            widget = AlertIcon(**entry.options)
+        else:
+            widget = TurnSignal(**entry.options)
+        widget.setObjectName(entry.name)
+        if entry.size is not None:
+            size = saved_size(setup_data, entry.name, entry.size)
+            widget.setFixedSize(size, size)
+        instruments[entry.name] = widget
+        scales[entry.name] = widget.width()
+
+        dg = DraggableGauge(widget, entry.name, draggable)
+        dg.setParent(container)
+        placed.append(dg)
+    place(placed, page.entries, setup_data)
+    return placed, instruments, scales
+
+
+def build_canvas_page(page, canvas, setup_data, draggable):
+    """Every instrument of page as a lightweight item on one DashboardCanvas. Same
+    return as build_widget_page, with the items doubling as the placed objects."""
+    instruments, scales = {}, {}
+    for entry in page.entries:
+        if entry.kind == "gauge":
+            size = saved_size(setup_data, entry.name, entry.size)
+            item = GaugeItem(entry.name, size, draggable, **entry.options)
+        elif entry.kind == "alert":
+            item = AlertItem(entry.name, draggable=draggable, **entry.options)
+        else:
+            size = saved_size(setup_data, entry.name, entry.size)
+            item = SignalItem(entry.name, size=size, draggable=draggable, **entry.options)
+        instruments[entry.name] = item
+        scales[entry.name] = item.width()
+
+    placed = [canvas.add_item(item) for item in instruments.values()]
+    place(placed, page.entries, setup_data)
+    return placed, instruments, scales
+
+
 # ===================== Main =====================
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = QWidget()
+    parser = argparse.ArgumentParser(description="Draggable gauge dashboard")
+    parser.add_argument("--telemetry", metavar="SPEC",
+                        help="feed gauges from udp:PORT, serial:DEVICE[@BAUD], replay:PATH, "
+                             "recording:PATH[@SPEED] or can:DEFS@BUS")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record every telemetry sample to PATH for later replay")
+    parser.add_argument("--acquisition", choices=["thread", "process"], default="thread",
+                        help="read and decode telemetry in a thread of this process, or in a "
+                             "child process sharing the latest values through shared memory")
+    parser.add_argument("--fps", type=int, default=60, help="target display frame rate")
+    parser.add_argument("--perf", action="store_true",
+                        help="collect performance metrics from startup (F3 toggles the overlay)")
+    parser.add_argument("--perf-log", metavar="PATH",
+                        help="append performance snapshots to PATH every 5 s")
+    parser.add_argument("--compositor", action="store_true",
+                        help="paint every instrument on one canvas instead of one widget each")
+    parser.add_argument("--needle", choices=["spring", "slew", "off"], default="spring",
+                        help="needle smoothing")
+    parser.add_argument("--odometer-dir", default=".", metavar="DIR",
+                        help="directory holding the odometer checkpoint and journal")
+    parser.add_argument("--odometer-flush", type=float, default=30.0, metavar="SECONDS",
+                        help="how often the odometer journal is written")
+    parser.add_argument("--render-cache", metavar="DIR",
+                        help="reuse dial backgrounds and tinted icons rendered by earlier runs from DIR")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print how long each startup phase took")
+    parser.add_argument("--pages", default=PAGES_FILE, metavar="PATH",
+                        help="page config (default dashboard_pages.json; one page of everything if missing)")
+    parser.add_argument("--page", metavar="NAME", help="page shown at startup (default the first)")
+    parser.add_argument("--alert-rules", metavar="PATH",
+                        help='JSON of {"alert": "rule" or ["rule", ...]} replacing the built-in alert rules')
+    parser.add_argument("--mirror-serve", metavar="SPEC",
+                        help="stream this dashboard's values to mirror displays on udp:[HOST:]PORT "
+                             "or ws:[HOST:]PORT")
+    parser.add_argument("--mirror-of", metavar="SPEC",
+                        help="show the values of the dashboard streaming on udp:HOST:PORT or ws:HOST:PORT")
+    parser.add_argument("--mirror-rate", type=float, default=30.0, metavar="HZ",
+                        help="updates per second sent to each mirror at most, or asked for by one")
+    parser.add_argument("--adaptive-quality", action="store_true",
+                        help="lower antialiasing and refresh rates of low-priority gauges while frames "
+                             "run over budget")
+    parser.add_argument("--quality-log", metavar="PATH",
+                        help="append adaptive quality changes to PATH as JSON lines instead of printing them")
+    args, qt_args = parser.parse_known_args()
+    if args.record and args.acquisition == "process":
+        parser.error("--record needs --acquisition thread")
+    if args.mirror_of and args.telemetry:
+        parser.error("--mirror-of and --telemetry are both sources of values; use one")
+    startup = StartupTimer(_launched)
+    startup.mark("imports")
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    startup.mark("qt init")
+
+    if args.render_cache:
+        cache = RenderCache(args.render_cache)
+        install_render_cache(cache)
+
+    # All widget repaints are batched into one flush per frame
+    scheduler = FrameScheduler(fps=args.fps, parent=app)
+    install_scheduler(scheduler)
+    if args.adaptive_quality:
+        quality = QualityController(scheduler, log_path=args.quality_log)
+
+    # One clock drives needle animation and every blinker, and sleeps when they are idle
+    animation_clock = AnimationClock(fps=args.fps, parent=app)
+    install_clock(animation_clock)
+    if args.compositor:
+        # All instruments are painted by one canvas widget in a single pass
+        window = DashboardCanvas()
+    else:
+        window = QWidget()
+        # One child widget per built page; only the current one is shown (and painted)
+        page_stack = QStackedLayout(window)
+        page_stack.setContentsMargins(0, 0, 0, 0)
     window.setGeometry(100, 100, 1200, 500)
     window.setWindowTitle("Draggable Gauges + Turn Signals")
 
-    setup_data = load_positions_and_scales()
-    draggable = setup_data is None
-
-    gauges = []
-    gauge_defs = [
-        ("OIL", CustomGauge(label="OIL", units="PSI", needle_color=QColor("red"), dial_color=QColor("red"), min_value=0, max_value=100, major_tick=25, minor_tick=5, start_angle=210, end_angle=-30), 200),
-        ("WATER", CustomGauge(label="WATER", units="°F", needle_color=QColor("red"), dial_color=QColor("red"), min_value=100, max_value=250, major_tick=50, minor_tick=10, start_angle=210, end_angle=-30), 200),
-        ("VOLTS", CustomGauge(label="VOLTS", units="V", needle_color=QColor("red"), dial_color=QColor("red"), min_value=8, max_value=18, major_tick=2, minor_tick=1, start_angle=210, end_angle=-30), 200),
-        ("FUEL", CustomGauge(label="FUEL", units="F", needle_color=QColor("red"), dial_color=QColor("red"), min_value=0, max_value=10, major_tick=10, minor_tick=1, start_angle=210, end_angle=-30, fuel_ticks=True), 200),
-        ("MPH", CustomGauge(label="MPH", units="MPH", needle_color=QColor("red"), dial_color=QColor("red"), min_value=0, max_value=160, major_tick=20, minor_tick=10, start_angle=210, end_angle=-30, odometer=True), 400),
-        ("RPM", CustomGauge(label="RPM", units="x1000", needle_color=QColor("red"), dial_color=QColor("red"), min_value=0, max_value=10, major_tick=1, minor_tick=1, start_angle=210, end_angle=-30), 400),
-    ]
-    # Add dashboard alert icons
-    alerts = {
-        "check_engine": AlertIcon("icons/check_engine.png", "ENGINE"),
-        "oil": AlertIcon("icons/oil.png", "OIL"),
-        "abs": AlertIcon("icons/abs.png", "ABS"),
-    }
-
-    scales = {}
-    for name, gauge, default_size in gauge_defs:
-        size = default_size
-        if setup_data and "scales" in setup_data and name in setup_data["scales"]:
-            size = setup_data["scales"][name]
-        gauge.setFixedSize(size, size)
-        dg = DraggableGauge(gauge, name, draggable)
-        dg.setParent(window)
-        gauges.append(dg)
-        scales[name] = size
-        
-    for name, widget in alerts.items():
-        dg = DraggableGauge(widget, name, draggable)
-        dg.setParent(window)
-        gauges.append(dg)   # include in same list for saving
-        scales[name] = widget.width()
-
-    # Add turn signals
-    signal_defs = [
-        ("LEFT_SIGNAL", TurnSignal("left"), 60),
-        ("RIGHT_SIGNAL", TurnSignal("right"), 60),
-    ]
-
-    for name, signal, default_size in signal_defs:
-        size = default_size
-        if setup_data and "scales" in setup_data and name in setup_data["scales"]:
-            size = setup_data["scales"][name]
-        signal.setFixedSize(size, size)
-        dg = DraggableGauge(signal, name, draggable)
-        dg.setParent(window)
-        gauges.append(dg)
-        scales[name] = size
-
-    # Default positions
-    default_positions = [
-        (20, 20), (240, 20), (20, 240), (240, 240), (500, 60), (950, 60),  # gauges
-        (850, 20), (1050, 20),  # turn signals
-        (700, 350), (770, 350), (840, 350),  # alert icons
-    ]
-  
-    if setup_data and "positions" in setup_data:
-        for g in gauges:
-            pos = setup_data["positions"].get(g.name,
-                                              default_positions[gauges.index(g)])
-            g.move(pos[0], pos[1])
-    else:
-        for g, pos in zip(gauges, default_positions):
-            g.move(pos[0], pos[1])
-
-
-    left_signal = next((g.gauge for g in gauges if g.name == "LEFT_SIGNAL"), None)
-    right_signal = next((g.gauge for g in gauges if g.name == "RIGHT_SIGNAL"), None)
+    # Needles ease toward their values from the shared clock
+    animator = None
+    if args.needle != "off":
+        animator = NeedleAnimator(animation_clock, mode=args.needle)
+
+    # Performance instrumentation: free until enabled with --perf, --perf-log or F3
+    perf_monitor = PerfMonitor(scheduler, parent=window)
+    perf_overlay = PerfOverlay(perf_monitor, parent=window)
+    perf_overlay.move(10, window.height() - perf_overlay.height() - 10)
+    if args.perf or args.perf_log:
+        perf_monitor.enable()
+    if args.perf_log:
+        perf_exporter = MetricsExporter(perf_monitor, args.perf_log, parent=window)
+        perf_exporter.start()
+
+    # Layout changes are saved shortly after a drag or resize, not only at exit
+    layout_saver = LayoutSaver(parent=window)
+    if args.compositor:
+        window.on_item_moved.append(lambda item: layout_saver.schedule(pages.current))
+
+    # Pages are built the first time they are shown
+    def build_page(page):
+        setup_data = load_positions_and_scales(page.name)
+        page.draggable = setup_data is None
+        if args.compositor:
+            built = build_canvas_page(page, window, setup_data, page.draggable)
+        else:
+            page.container = QWidget()
+            page_stack.addWidget(page.container)
+            built = build_widget_page(page, page.container, setup_data, page.draggable)
+        page.placed, page.instruments, page.scales = built
+        if not args.compositor:
+            for wrapper in page.placed:
+                wrapper.on_moved.append(lambda page=page: layout_saver.schedule(page))
+        for gauge in page.instruments_of("gauge"):
+            if animator is not None:
+                animator.attach(gauge)
+            if window.isVisible():
+                gauge.prepare()
+
+    def show_page(page):
+        if args.compositor:
+            for item in page.placed:
+                item.set_visible(True)
+        else:
+            page_stack.setCurrentWidget(page.container)
+            perf_overlay.raise_()
+
+    def hide_page(page):
+        if args.compositor:
+            for item in page.placed:
+                item.set_visible(False)
+
+    pages = PageManager(load_pages(args.pages, builtin_catalog()), build_page, show_page, hide_page)
+    if args.page and pages.page(args.page) is None:
+        parser.error(f"no page named {args.page!r} in {args.pages}")
+
+    # A page without a saved layout opens the setup dialog the first time it is shown
+    setup_dialogs = {}
+
+    def open_setup(page):
+        if not page.draggable or not page.placed:
+            return
+        alerts = {e.name: pages.channel(e.channel) for e in page.entries if e.kind == "alert"}
+        signals = {e.name: pages.channel(e.channel) for e in page.entries if e.kind == "signal"}
+        dialog = DashboardSetupDialog(page.placed, page.scales, alerts, signals)
+        dialog.setWindowTitle(f"Dashboard Setup: {page.name}")
+        dialog.setWindowModality(Qt.NonModal)
+        dialog.on_changed.append(lambda: layout_saver.schedule(page))
+        setup_dialogs[page.name] = dialog
+        QTimer.singleShot(0, dialog.show)  # after the dashboard window is up
+
+    pages.on_built.append(open_setup)
+    pages.show_page(pages.page(args.page) if args.page else 0)
+
+    # Keyboard controls for signals and pages
+    def toggle_channel(name):
+        channel = pages.channel(name)
+        if channel is not None:
+            channel.set_value(not channel.value)
 
-    # Keyboard controls for signals
     def keyPressEvent(event):
-        
-
-        if event.key() == Qt.Key_A and left_signal:
-            if left_signal.on:
-                left_signal.stop()
-            else:
-                left_signal.start()
-        elif event.key() == Qt.Key_D and right_signal:
-            if right_signal.on:
-                right_signal.stop()
-            else:
-                right_signal.start()
-                
-    alerts["check_engine"].set_active(True)
-    alerts["oil"].set_active(False)
-    alerts["abs"].set_active(True)
+        key = event.key()
+        if key == Qt.Key_F3:
+            perf_overlay.toggle()
+        elif key == Qt.Key_A:
+            toggle_channel("LEFT_SIGNAL")
+        elif key == Qt.Key_D:
+            toggle_channel("RIGHT_SIGNAL")
+        elif key == Qt.Key_PageDown:
+            pages.next_page(1)
+        elif key == Qt.Key_PageUp:
+            pages.next_page(-1)
+        elif Qt.Key_1 <= key <= Qt.Key_9 and key - Qt.Key_1 < len(pages.pages):
+            pages.show_page(key - Qt.Key_1)
+
+    startup.mark("build")
+
+    pages.set_value("check_engine", True)
+    pages.set_value("oil", False)
+    pages.set_value("abs", True)
 
     window.keyPressEvent = keyPressEvent
 
+    # Live telemetry: samples are read off the GUI thread and drained once per frame
+    # into the channel values, which only update gauges on the visible page
+    ingestor = None
+    if args.telemetry:
+        # Alert icons follow threshold rules on the channels, checked once per frame
+        rules = load_rules(args.alert_rules) if args.alert_rules else ALERT_RULES
+        for _, rule in rules:
+            pages.add_channel(parse_rule(rule)[0])
+        alert_engine = AlertEngine(rules, pages.channels, pages.set_value)
+
+        channels = pages.value_channels()
+        if args.acquisition == "process":
+            # Decoding runs in a child process (restarted if it dies); one snapshot per frame
+            ingestor = AcquisitionProcess(functools.partial(source_from_spec, args.telemetry),
+                                          channels, parent=window)
+        else:
+            recorder = Recorder(args.record, channels) if args.record else None
+            ingestor = TelemetryIngestor(source_from_spec(args.telemetry), channels=channels,
+                                         recorder=recorder)
+        feeder = GaugeFeeder(ingestor, fps=args.fps, parent=window)
+        if args.acquisition == "process":
+            feeder.before_drain.append(ingestor.poll)
+        for name in channels:
+            feeder.bind(name, pages.channel(name))
+        feeder.after_drain.append(alert_engine.evaluate)
+        ingestor.start()
+        feeder.start()
+
+    # Mirroring: channel values are streamed to (or received from) other dashboards by an
+    # event loop thread, and copied in or out once per frame
+    mirror_publisher = mirror_subscriber = None
+    mirror_timer = QTimer(window)
+    mirror_timer.setInterval(max(1, round(1000 / args.fps)))
+    if args.mirror_of:
+        mirror_subscriber = MirrorSubscriber(args.mirror_of, rate=args.mirror_rate)
+
+        def apply_mirror():
+            for name, value in mirror_subscriber.take().items():
+                pages.set_value(name, value)
+
+        mirror_timer.timeout.connect(apply_mirror)
+    if args.mirror_serve:
+        mirrored = list(pages.channels.values())
+        mirror_publisher = MirrorPublisher([c.name for c in mirrored], args.mirror_serve,
+                                           max_rate=args.mirror_rate)
+        mirror_timer.timeout.connect(lambda: mirror_publisher.capture([c.value for c in mirrored]))
+    for mirror in (mirror_subscriber, mirror_publisher):
+        if mirror is not None:
+            mirror.start()
+    if mirror_subscriber is not None or mirror_publisher is not None:
+        mirror_timer.start()
+
+    # Odometer: integrates the speed channel and journals the totals off the GUI thread
+    odometer = Odometer(args.odometer_dir, flush_interval=args.odometer_flush)
+    speed_channel = pages.channel("MPH")
+    pages.set_value(ODOMETER_CHANNEL, odometer.total)
+
+    def sample_speed():
+        odometer.update(speed_channel.value or 0.0)
+        pages.set_value(ODOMETER_CHANNEL, odometer.total)
+
+    odometer_timer = QTimer(window)
+    odometer_timer.setInterval(100)
+    odometer_timer.timeout.connect(sample_speed)
+    if ingestor is not None and speed_channel is not None:
+        # Without live data the speed never changes, so there is nothing to integrate
+        odometer.start()
+        odometer_timer.start()
+
     window.show()
 
-    if draggable:
-        setup_dialog = DashboardSetupDialog(gauges, scales, alerts, {"left": left_signal, "right": right_signal})
-        setup_dialog.setWindowModality(Qt.NonModal)
-        setup_dialog.show()
+    # Render (or load from the render cache) the visible page's dial faces up front,
+    # once the window exists and the device pixel ratio is known
+    for gauge in pages.current.instruments_of("gauge"):
+        gauge.prepare()
+    startup.mark("dials")
+
+    def first_frame():
+        startup.mark("first frame")
+        if args.startup_report:
+            print(startup.report())
+            if args.render_cache:
+                print(f"render cache: {cache.hits} hits, {cache.misses} misses, {cache.stores} stored")
 
+    # Runs once the event loop has handled the show and paint events queued above
+    QTimer.singleShot(0, first_frame)
 
     def on_close():
-        if draggable:
-            save_positions_and_scales(gauges, scales)
+        if ingestor is not None:
+            ingestor.stop()
+        mirror_timer.stop()
+        for mirror in (mirror_subscriber, mirror_publisher):
+            if mirror is not None:
+                mirror.stop()
+        if odometer_timer.isActive():
+            odometer_timer.stop()
+            odometer.stop()
+        for page in pages.built_pages():
+            if page.draggable:
+                layout_saver.schedule(page)
+        layout_saver.flush()
+        if args.render_cache:
+            cache.prune()
 
     app.aboutToQuit.connect(on_close)
     sys.exit(app.exec())
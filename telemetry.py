@@ -0,0 +1,279 @@
+"""Background telemetry ingestion for the dashboard gauges.
+
+A TelemetryIngestor thread reads samples from a source (serial port, UDP socket,
+replay file or binary recording) into one preallocated ring buffer per channel.
+The GUI thread never sees individual samples: a GaugeFeeder (gauge_feeder.py)
+drains each channel once per display frame and hands the latest (or aggregated)
+value to its gauge. Nothing here imports Qt, so sources and recordings can be
+used by tools and child processes without it.
+
+Sources speak a simple line protocol, one sample per line:
+
+    MPH,88.4
+    RPM,3.2
+"""
+import socket
+import threading
+import time
+from array import array
+
+
+def parse_line(line):
+    """Parse a "CHANNEL,value" line. Returns (channel, value) or None if malformed."""
+    parts = line.strip().split(",")
+    if len(parts) != 2 or not parts[0]:
+        return None
+    try:
+        return parts[0].strip(), float(parts[1])
+    except ValueError:
+        return None
+
+
+# ===================== Ring Buffer =====================
+class ChannelRing:
+    """Bounded, preallocated single-producer/single-consumer ring buffer of samples.
+
+    The ingestion thread is the only writer of head and the GUI thread the only
+    writer of tail, so no lock is needed. If the producer laps the consumer the
+    oldest samples are lost and counted as overruns.
+    """
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.values = array("d", bytes(8 * capacity))
+        self.times = array("d", bytes(8 * capacity))
+        self.head = 0       # total samples written (producer only)
+        self.tail = 0       # total samples consumed (consumer only)
+        self.overruns = 0   # samples overwritten before they were drained
+
+    def push(self, value, timestamp):
+        """Store a sample. Called from the ingestion thread."""
+        i = self.head % self.capacity
+        self.values[i] = value
+        self.times[i] = timestamp
+        self.head += 1  # publish only after the slot is written
+
+    def pending(self):
+        """Number of samples written but not yet drained."""
+        return min(self.head - self.tail, self.capacity)
+
+    def drain(self, mode="latest"):
+        """Consume every pending sample and return one value, or None if there were none.
+
+        Args:
+            mode (str, optional): "latest", "mean", "min" or "max". Defaults to "latest".
+        """
+        head = self.head
+        start = self.tail
+        if head == start:
+            return None
+        if head - start > self.capacity:
+            self.overruns += head - start - self.capacity
+            start = head - self.capacity
+        self.tail = head
+
+        cap = self.capacity
+        if mode == "latest":
+            return self.values[(head - 1) % cap]
+        values = [self.values[i % cap] for i in range(start, head)]
+        if mode == "mean":
+            return sum(values) / len(values)
+        if mode == "min":
+            return min(values)
+        if mode == "max":
+            return max(values)
+        raise ValueError(f"Unknown drain mode: {mode}")
+
+
+# ===================== Sources =====================
+class TelemetrySource:
+    """Base class for sample sources.
+
+    read() returns an iterable of raw lines, or of (channel, value) pairs for
+    sources that are already parsed.
+    """
+    def open(self):
+        pass
+
+    def read(self):
+        """Block for a short while and return any lines received. Must not block forever."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SerialSource(TelemetrySource):
+    """Reads lines from a serial port. Requires pyserial."""
+    def __init__(self, port, baudrate=115200):
+        self.port = port
+        self.baudrate = baudrate
+        self.serial = None
+
+    def open(self):
+        import serial  # optional dependency, only needed for this source
+        self.serial = serial.Serial(self.port, self.baudrate, timeout=0.2)
+
+    def read(self):
+        line = self.serial.readline()
+        return [line.decode("ascii", "replace")] if line else []
+
+    def close(self):
+        if self.serial is not None:
+            self.serial.close()
+            self.serial = None
+
+
+class UdpSource(TelemetrySource):
+    """Receives datagrams on a UDP port. A datagram may carry several lines."""
+    def __init__(self, host="0.0.0.0", port=5005):
+        self.host = host
+        self.port = port
+        self.sock = None
+
+    def open(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((self.host, self.port))
+        self.sock.settimeout(0.2)
+
+    def read(self):
+        try:
+            data, _ = self.sock.recvfrom(65536)
+        except socket.timeout:
+            return []
+        return data.decode("ascii", "replace").splitlines()
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+class FileReplaySource(TelemetrySource):
+    """Replays a text file of samples, one line every interval seconds (0 = as fast as possible)."""
+    def __init__(self, path, interval=0.0, loop=False):
+        self.path = path
+        self.interval = interval
+        self.loop = loop
+        self.file = None
+        self.finished = False
+
+    def open(self):
+        self.file = open(self.path, "r")
+
+    def read(self):
+        line = self.file.readline()
+        if not line:
+            if not self.loop:
+                self.finished = True
+                time.sleep(0.05)
+                return []
+            self.file.seek(0)
+            line = self.file.readline()
+        if self.interval:
+            time.sleep(self.interval)
+        return [line]
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def source_from_spec(spec):
+    """Build a source from a command line spec: udp:PORT, serial:DEVICE[@BAUD], replay:PATH,
+    recording:PATH[@SPEED] (SPEED 1 = real time, 0 = as fast as possible) or can:DEFS@BUS
+    (see can_decoder.source_from_spec)."""
+    kind, _, arg = spec.partition(":")
+    if kind == "udp":
+        return UdpSource(port=int(arg or 5005))
+    if kind == "serial":
+        port, _, baud = arg.partition("@")
+        return SerialSource(port, int(baud or 115200))
+    if kind == "replay":
+        return FileReplaySource(arg, interval=0.002, loop=True)
+    if kind == "recording":
+        from recorder import RecordingSource
+        path, _, speed = arg.rpartition("@") if "@" in arg else (arg, "", "")
+        return RecordingSource(path, speed=float(speed or 1.0), loop=True)
+    if kind == "can":
+        import can_decoder  # needs numpy, only imported for CAN sources
+        return can_decoder.source_from_spec(arg)
+    raise ValueError(f"Unknown telemetry source: {spec}")
+
+
+# ===================== Ingestion Thread =====================
+class TelemetryIngestor(threading.Thread):
+    """Reads a source off the GUI thread into per-channel ring buffers."""
+    def __init__(self, source, channels=None, capacity=256, recorder=None):
+        """_summary_
+
+        Args:
+            source (TelemetrySource): where samples come from.
+            channels (list, optional): channel names to accept. If None, any channel is
+                accepted and its ring is created on first sight. Defaults to None.
+            capacity (int, optional): samples buffered per channel. Defaults to 256.
+            recorder (Recorder, optional): written every accepted sample from the
+                ingestion thread, and closed when the thread finishes. Defaults to None.
+        """
+        super().__init__(daemon=True)
+        self.source = source
+        self.capacity = capacity
+        self.fixed_channels = channels is not None
+        self.rings = {name: ChannelRing(capacity) for name in (channels or [])}
+        self.recorder = recorder
+        self.received = 0
+        self.drops = 0      # malformed lines and samples for unknown channels
+        self._stop_event = threading.Event()
+
+    def run(self):
+        self.source.open()
+        try:
+            while not self._stop_event.is_set():
+                for item in self.source.read():
+                    if isinstance(item, str):
+                        self.ingest_line(item)
+                    else:
+                        self.ingest(*item)
+        finally:
+            self.source.close()
+            if self.recorder is not None:
+                self.recorder.close()
+
+    def ingest_line(self, line):
+        """Parse one line and store it. Called from the ingestion thread."""
+        if not line.strip():
+            return
+        sample = parse_line(line)
+        if sample is None:
+            self.drops += 1
+            return
+        self.ingest(*sample)
+
+    def ingest(self, channel, value, timestamp=None):
+        """Store one sample for channel."""
+        ring = self.rings.get(channel)
+        if ring is None:
+            if self.fixed_channels:
+                self.drops += 1
+                return
+            ring = self.rings[channel] = ChannelRing(self.capacity)
+        if timestamp is None:
+            timestamp = time.monotonic()
+        ring.push(value, timestamp)
+        if self.recorder is not None:
+            self.recorder.add(channel, value, timestamp)
+        self.received += 1
+
+    def stop(self, timeout=1.0):
+        """Ask the thread to finish and wait for it."""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def stats(self):
+        """Counters for monitoring: samples received, drops, and overruns per channel."""
+        return {
+            "received": self.received,
+            "drops": self.drops,
+            "overruns": {name: ring.overruns for name, ring in list(self.rings.items())},
+        }
@@ -0,0 +1,17 @@
+"""The dashboard's modules live at the top of the repository; make them importable from here.
+
+Qt tests run on the offscreen platform, so they need no display.
+"""
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
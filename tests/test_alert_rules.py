@@ -0,0 +1,77 @@
+import math
+
+import pytest
+
+from alert_rules import AlertEngine, parse_rule
+
+
+class Source:
+    def __init__(self, value=None):
+        self.value = value
+
+
+class Dashboard:
+    """Channel values the engine reads, and the alert writes it makes."""
+    def __init__(self, rules, channels):
+        self.sources = {name: Source() for name in channels}
+        self.writes = []
+        self.engine = AlertEngine(rules, self.sources, lambda alert, active: self.writes.append((alert, active)))
+
+    def feed(self, channel, value, now):
+        self.sources[channel].value = value
+        self.engine.evaluate(now)
+        return self.engine.active
+
+
+@pytest.mark.parametrize("text, parsed", [
+    ("OIL < 10 for 2s", ("OIL", 10.0, math.inf, 2.0, 0.0)),
+    ("WATER > 230 hysteresis 5", ("WATER", -math.inf, 230.0, 0.0, 5.0)),
+    ("VOLTS outside 11.5-15 for 0.5s hysteresis 0.3", ("VOLTS", 11.5, 15.0, 0.5, 0.3)),
+    ("temp outside -10..40", ("temp", -10.0, 40.0, 0.0, 0.0)),
+])
+def test_parse_rule(text, parsed):
+    assert parse_rule(text) == parsed
+
+
+@pytest.mark.parametrize("text", ["OIL <", "OIL = 10", "VOLTS outside 15-11.5", "OIL < 10 for 2"])
+def test_parse_rule_rejects(text):
+    with pytest.raises(ValueError):
+        parse_rule(text)
+
+
+def test_unknown_channel_is_rejected():
+    with pytest.raises(ValueError):
+        AlertEngine([("oil", "OIL < 10")], {}, lambda alert, active: None)
+
+
+def test_hysteresis_keeps_alert_raised_until_value_is_back_inside():
+    dash = Dashboard([("hot", "WATER > 230 hysteresis 5")], ["WATER"])
+    assert not dash.feed("WATER", 220, 0.0)("hot")
+    assert dash.feed("WATER", 231, 1.0)("hot")
+    assert dash.feed("WATER", 228, 2.0)("hot")      # below the limit, not yet 5 back
+    assert dash.feed("WATER", 229.5, 3.0)("hot")
+    assert not dash.feed("WATER", 225, 4.0)("hot")
+    assert not dash.feed("WATER", 229, 5.0)("hot")  # must go over 230 again to trip
+    assert dash.writes == [("hot", False), ("hot", True), ("hot", False)]
+
+
+def test_delay_debounces_short_dips():
+    dash = Dashboard([("oil", "OIL < 10 for 2s hysteresis 2")], ["OIL"])
+    dash.feed("OIL", 8, 0.0)
+    dash.feed("OIL", 11, 1.5)  # back up before 2 s
+    dash.feed("OIL", 8, 2.0)
+    dash.engine.evaluate(3.9)
+    assert not dash.engine.active("oil")
+    dash.engine.evaluate(4.0)  # held below 10 for 2 s, with no new value
+    assert dash.engine.active("oil")
+    assert dash.feed("OIL", 11, 5.0)("oil")
+    assert not dash.feed("OIL", 12, 6.0)("oil")
+
+
+def test_alert_is_active_while_any_rule_is_raised():
+    dash = Dashboard([("check", "WATER > 230"), ("check", "VOLTS outside 11.5-15")], ["WATER", "VOLTS"])
+    dash.feed("WATER", 240, 0.0)
+    assert dash.feed("VOLTS", 10, 1.0)("check")
+    assert dash.feed("WATER", 200, 2.0)("check")
+    assert not dash.feed("VOLTS", 13, 3.0)("check")
+    assert dash.writes == [("check", True), ("check", False)]
@@ -0,0 +1,116 @@
+import pytest
+
+from animation import AnimationClock, NeedleAnimator
+
+
+class Gauge:
+    """The attributes NeedleAnimator reads from a gauge, recording where it draws the needle."""
+    def __init__(self, value=0.0, min_value=0.0, max_value=100.0):
+        self.value = self.display_value = value
+        self.min_value = min_value
+        self.max_value = max_value
+        self.animator = None
+        self.drawn = []
+
+    def set_display_value(self, value):
+        self.display_value = value
+        self.drawn.append(value)
+
+
+def animate(animator, target):
+    gauge = Gauge()
+    animator.attach(gauge)
+    gauge.value = target
+    animator.set_target(gauge, target)
+    return gauge
+
+
+def run(clock, dt=1 / 60, limit=600):
+    steps = 0
+    while clock.advance(dt):
+        steps += 1
+        assert steps < limit, "needle never settled"
+    return steps
+
+
+def test_clock_stops_once_needles_settle(qapp):
+    clock = AnimationClock()
+    animator = NeedleAnimator(clock)
+    assert not clock.running
+    gauge = animate(animator, 80.0)
+    assert clock.running
+    run(clock)
+    assert not clock.running
+    assert animator.settled()
+    assert gauge.display_value == 80.0
+
+
+def test_manual_clock_never_starts_its_timer(qapp):
+    clock = AnimationClock(manual=True)
+    animate(NeedleAnimator(clock), 50.0)
+    assert not clock.running
+    assert clock.advance(0.01)
+
+
+def test_spring_does_not_overshoot():
+    clock = AnimationClock(manual=True)
+    gauge = animate(NeedleAnimator(clock, mode="spring"), 60.0)
+    run(clock)
+    assert gauge.drawn == sorted(gauge.drawn)
+    assert max(gauge.drawn) == 60.0
+
+
+def test_slew_moves_at_its_rate():
+    clock = AnimationClock(manual=True)
+    gauge = animate(NeedleAnimator(clock, mode="slew", slew_rate=1.5), 100.0)
+    clock.advance(0.1)
+    assert gauge.display_value == pytest.approx(15.0)
+    run(clock)
+    steps = [b - a for a, b in zip(gauge.drawn, gauge.drawn[1:])]
+    assert max(steps) == pytest.approx(150.0 / 60)
+    assert gauge.display_value == 100.0
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        NeedleAnimator(AnimationClock(manual=True), mode="bounce")
+
+
+class Blinker:
+    def __init__(self):
+        self.states = []
+
+    def __call__(self, state):
+        self.states.append(state)
+
+
+def test_blinkers_share_the_clock_phase():
+    clock = AnimationClock(manual=True)
+    left = Blinker()
+    clock.subscribe_blink(left, period=1.0)
+    clock.advance(0.2)
+    right = Blinker()
+    clock.subscribe_blink(right, period=1.0)
+    assert left.states == right.states == [True]  # called with the current state straight away
+    clock.advance(0.2)
+    assert left.states == [True]
+    clock.advance(0.2)  # 0.6 s: second half of the period
+    assert left.states == right.states == [True, False]
+    clock.unsubscribe_blink(left)
+    clock.advance(0.5)
+    assert left.states == [True, False]
+    assert right.states == [True, False, True]
+
+
+def test_clock_sleeps_until_the_next_flip(qapp):
+    clock = AnimationClock(fps=50)
+    blinker = Blinker()
+    clock.subscribe_blink(blinker, period=1.0)
+    assert clock.running
+    assert clock.timer.interval() == 500
+    clock.wake()  # a needle starts moving: every frame
+    assert clock.timer.interval() == 20
+    clock.advance(0.1)  # nothing busy any more
+    assert clock.timer.interval() == 400
+    clock.unsubscribe_blink(blinker)
+    assert not clock.running
@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import pytest
+
+from can_decoder import CanDecoder, CanMessage, CanSignal, VirtualBus, empty_frames
+
+OBD_SIGNALS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "obd_signals.json")
+
+
+def frames_of(frame_id, data):
+    frames = empty_frames(len(data))
+    frames["id"] = frame_id
+    frames["dlc"] = 8
+    frames["data"] = data
+    return frames
+
+
+def decoded(decoder, frames):
+    rows, channels, values = decoder.decode(frames)
+    return [(int(r), decoder.channels[c], v) for r, c, v in zip(rows.tolist(), channels.tolist(), values.tolist())]
+
+
+@pytest.fixture(params=["numpy", "scalar"])
+def obd(request):
+    decoder = CanDecoder.from_file(OBD_SIGNALS)
+    decoder.scalar_batch = 0 if request.param == "numpy" else 1 << 30
+    return decoder
+
+
+def test_obd_response_frames(obd):
+    frames = empty_frames(3)
+    frames["id"] = [0x7E8, 0x7E8, 0x123]
+    frames["dlc"] = 8
+    frames["data"][0][:5] = [4, 0x41, 0x0C, 0x1A, 0xF8]  # PID 0C, RPM: 0x1AF8 / 4 rpm, in thousands
+    frames["data"][1][:4] = [3, 0x41, 0x05, 0x7B]        # PID 05, coolant: 0x7B - 40 degrees C
+    samples = decoded(obd, frames)
+    assert [(row, channel) for row, channel, _ in samples] == [(0, "RPM"), (1, "WATER")]
+    assert samples[0][2] == pytest.approx(0x1AF8 / 4 / 1000)
+    assert obd.unknown == 1
+
+
+def test_short_frames_leave_out_missing_signals(obd):
+    frames = frames_of(0x7E8, obd.encode(0x7E8, {"RPM": 3.0}, mux=12))
+    frames = np.concatenate([frames, frames_of(0x7E8, obd.encode(0x7E8, {"WATER": 190.0}, mux=5)),
+                             frames_of(0x360, obd.encode(0x360, {"OIL": 40.0}).repeat(2, axis=0))])
+    frames["dlc"] = [4, 4, 5, 6]  # RPM ends in byte 5 and OIL in byte 6; WATER is in byte 4
+    assert [(row, channel) for row, channel, _ in decoded(obd, frames)] == [(1, "WATER"), (3, "OIL")]
+
+
+@pytest.mark.parametrize("mux, channel, value", [(12, "RPM", 3.25), (13, "MPH", 62.0), (66, "VOLTS", 13.8)])
+def test_multiplexed_round_trip(obd, mux, channel, value):
+    data = obd.encode(0x7E8, {channel: value}, mux=mux)
+    [(row, got_channel, got)] = decoded(obd, frames_of(0x7E8, data))
+    assert got_channel == channel
+    assert got == pytest.approx(value, abs=0.7)  # within one raw step
+
+
+@pytest.mark.parametrize("frame_id", [0x100, 0x500, 0x7FF])
+def test_encode_unknown_id(obd, frame_id):
+    with pytest.raises(KeyError):
+        obd.encode(frame_id, {})
+
+
+def test_signed_and_big_endian_round_trip():
+    message = CanMessage(0x10, [CanSignal("A", 7, 12, "big", True, 0.5), CanSignal("B", 20, 10, "little", True, 1, -3),
+                                CanSignal("C", 55, 16, "big")])
+    decoder = CanDecoder([message])
+    values = {"A": np.array([-100.0, 50.5, 0.0]), "B": np.array([-200.0, 250.0, 5.0]),
+              "C": np.array([1.0, 2.0, 65535.0])}
+    data = decoder.encode(0x10, values)
+    for scalar_batch in (0, 1 << 30):
+        decoder.scalar_batch = scalar_batch
+        _, _, got = decoder.decode(frames_of(0x10, data))
+        assert got.reshape(3, 3).T.tolist() == [values["A"].tolist(), values["B"].tolist(), values["C"].tolist()]
+
+
+def test_scalar_loop_matches_numpy():
+    decoder = CanDecoder.from_file(OBD_SIGNALS)
+    frames = VirtualBus(decoder).generate(2000)
+    decoder.scalar_batch = 0
+    expected = decoder.decode(frames)
+    decoder.scalar_batch = 1 << 30
+    for want, got in zip(expected, decoder.decode(frames)):
+        assert got.dtype == want.dtype
+        assert got.tolist() == want.tolist()
@@ -0,0 +1,117 @@
+import pytest
+
+from animation import AnimationClock, install_clock
+from CustomGauge import CustomGauge
+from dashboard_canvas import DashboardCanvas, GaugeItem
+from gauge_history import GaugeHistory
+
+
+@pytest.fixture
+def gauge(qapp):
+    gauge = CustomGauge(min_value=0, max_value=100, decimals=0)
+    gauge.resize(400, 400)
+    gauge.set_value(50)
+    return gauge
+
+
+def test_unchanged_pixels_are_not_repainted(gauge):
+    gauge.set_value(50.01)  # same readout, needle tip moves well under a pixel
+    assert (gauge.value_updates, gauge.suppressed_updates) == (2, 1)
+    assert gauge.value == 50.01
+    gauge.set_value(50.4)  # readout still "50", but the tip moves about 2 pixels
+    assert gauge.suppressed_updates == 1
+    assert gauge.display_value == 50.4
+
+
+def test_slow_drift_adds_up_to_a_move(gauge):
+    for step in range(1, 40):
+        gauge.set_value(50 + step * 0.01)
+    # Measured from where the needle was last drawn, so it moves every few steps
+    assert 0 < gauge.suppressed_updates < 38
+    assert gauge.display_value == pytest.approx(50.39, abs=0.05)
+
+
+def test_readout_changes_are_always_repainted(qapp):
+    gauge = CustomGauge(needle=False, min_value=0, max_value=100, decimals=1)
+    gauge.resize(400, 400)
+    gauge.set_value(50.0)
+    gauge.set_value(50.04)
+    gauge.set_value(50.06)
+    assert gauge.suppressed_updates == 1
+
+
+def test_zero_deadband_repaints_any_move(qapp):
+    gauge = CustomGauge(min_value=0, max_value=100, decimals=0, deadband=0)
+    gauge.resize(400, 400)
+    gauge.set_value(50)
+    gauge.set_value(50.001)
+    assert gauge.suppressed_updates == 0
+
+
+def test_animation_frames_reuse_one_needle_rect(gauge):
+    rects = []
+    gauge._invalidate = rects.append
+    gauge.set_display_value(52)
+    gauge.set_display_value(53)
+    assert rects[0] is rects[1]
+    # Covers the needle where it was drawn and where it is drawn now
+    assert rects[1].contains(gauge._needle_rect(52)) and rects[1].contains(gauge._needle_rect(53))
+    assert gauge.display_value == 53
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = AnimationClock(manual=True)
+    install_clock(clock)
+    yield clock
+    install_clock(None)
+
+
+def held_peak(dial, clock):
+    """Give dial a 5 s peak hold on a history run by a fake clock, showing a peak of 80."""
+    now = FakeTime()
+    history = GaugeHistory(windows=(5.0,), trail_seconds=0, clock=now)
+    dial.use_history(history)  # recorded by its channel, as on a page
+    for value in (80, 40):
+        history.add(value)
+        dial.set_value(value)
+    assert clock._blinkers  # re-checking the marker until it expires
+    return now
+
+
+def test_hidden_gauge_stops_watching_its_peak(qapp, clock):
+    gauge = CustomGauge(min_value=0, max_value=100, decimals=0, peak_hold=5)
+    gauge.resize(400, 400)
+    gauge.show()
+    now = held_peak(gauge, clock)
+    gauge.hide()
+    assert not clock._blinkers
+    now.now = 3.0
+    gauge.show()  # the peak is still held: watched again
+    assert gauge._drawn_history[0] == 80 and clock._blinkers
+    gauge.hide()
+    now.now = 10.0
+    gauge.show()  # expired while hidden: cleared as soon as it is shown
+    assert gauge._drawn_history[0] is None
+    assert not clock._blinkers
+    gauge.hide()
+
+
+def test_hidden_canvas_item_stops_watching_its_peak(qapp, clock):
+    canvas = DashboardCanvas()
+    item = GaugeItem("OIL", size=200, min_value=0, max_value=100, decimals=0, peak_hold=5)
+    canvas.add_item(item)
+    now = held_peak(item, clock)
+    item.set_visible(False)
+    assert not clock._blinkers
+    now.now = 10.0
+    item.set_visible(True)
+    assert item._drawn_history[0] is None
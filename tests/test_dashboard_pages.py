@@ -0,0 +1,177 @@
+import json
+
+import pytest
+
+from dashboard_pages import DEFAULT_PAGE, ODOMETER_CHANNEL, Page, PageEntry, PageManager, load_pages
+from gauge_history import GaugeHistory, history_spec
+
+
+class Gauge:
+    def __init__(self):
+        self.values = []
+        self.animator = None
+
+    def set_value(self, value):
+        self.values.append(value)
+
+
+class Signal:
+    def __init__(self):
+        self.blinking = False
+
+    def start(self):
+        self.blinking = True
+
+    def stop(self):
+        self.blinking = False
+
+
+INSTRUMENTS = {"gauge": Gauge, "signal": Signal}
+
+
+def ignore(page):
+    pass
+
+
+def build(page):
+    page.instruments = {entry.name: INSTRUMENTS[entry.kind]() for entry in page.entries}
+    page.placed = list(page.instruments.values())
+
+
+def dashboard():
+    drive = Page("drive", [PageEntry("gauge", "MPH", {"odometer": True}), PageEntry("gauge", "RPM", {}),
+                           PageEntry("signal", "LEFT_SIGNAL", {})])
+    engine = Page("engine", [PageEntry("gauge", "RPM", {}), PageEntry("gauge", "OIL", {})])
+    built, shown, hidden = [], [], []
+
+    def record_build(page):
+        built.append(page.name)
+        build(page)
+
+    manager = PageManager([drive, engine], record_build, lambda p: shown.append(p.name),
+                          lambda p: hidden.append(p.name))
+    return manager, built, shown, hidden
+
+
+def test_pages_are_built_on_first_show():
+    manager, built, shown, hidden = dashboard()
+    assert built == [] and manager.built_pages() == []
+    manager.show_page("drive")
+    manager.show_page(1)
+    manager.show_page("drive")
+    assert built == ["drive", "engine"]
+    assert shown == ["drive", "engine", "drive"]
+    assert hidden == ["drive", "engine"]
+    assert manager.current.name == "drive"
+    assert manager.next_page().name == "engine"
+
+
+def test_channels_are_shared_between_pages():
+    manager, *_ = dashboard()
+    assert sorted(manager.channels) == sorted(["MPH", "RPM", "LEFT_SIGNAL", "OIL", ODOMETER_CHANNEL])
+    assert sorted(manager.value_channels()) == ["MPH", "OIL", "RPM"]
+    assert manager.channel("LEFT_SIGNAL").value is False
+
+
+def test_only_the_visible_page_is_fed():
+    manager, *_ = dashboard()
+    drive = manager.show_page("drive")
+    manager.set_value("RPM", 2.0)
+    manager.show_page("engine")
+    engine = manager.current
+    manager.set_value("RPM", 3.0)
+    manager.set_value("RPM", 4.0)
+    assert drive.instruments["RPM"].values == [2.0]
+    assert engine.instruments["RPM"].values == [2.0, 3.0, 4.0]  # caught up on show, then fed
+    manager.show_page("drive")
+    assert drive.instruments["RPM"].values == [2.0, 4.0]  # only the latest value on show
+
+
+def test_hidden_signals_stop_blinking():
+    manager, *_ = dashboard()
+    drive = manager.show_page("drive")
+    manager.set_value("LEFT_SIGNAL", True)
+    assert drive.instruments["LEFT_SIGNAL"].blinking
+    manager.show_page("engine")
+    assert not drive.instruments["LEFT_SIGNAL"].blinking
+    manager.show_page("drive")
+    assert drive.instruments["LEFT_SIGNAL"].blinking  # the channel is still on
+
+
+def test_a_dashboard_needs_a_page():
+    with pytest.raises(ValueError):
+        PageManager([], build, ignore, ignore)
+
+
+CATALOG = {
+    "MPH": PageEntry("gauge", "MPH", {"max_value": 160}, size=400, pos=(10, 20)),
+    "OIL": PageEntry("gauge", "OIL", {"max_value": 100}, size=200),
+}
+
+
+def test_without_a_config_every_instrument_is_on_one_page(tmp_path):
+    pages = load_pages(str(tmp_path / "missing.json"), CATALOG)
+    assert [p.name for p in pages] == [DEFAULT_PAGE]
+    assert [e.name for e in pages[0].entries] == ["MPH", "OIL"]
+
+
+def test_config_overrides_and_new_gauges(tmp_path):
+    path = tmp_path / "pages.json"
+    path.write_text(json.dumps({"pages": [
+        {"name": "track", "instruments": [
+            {"name": "MPH", "size": 300, "gauge": {"max_value": 200, "needle_color": "white"}},
+            {"name": "BOOST", "channel": "MAP", "gauge": {"min_value": -15, "max_value": 30}},
+        ]},
+    ]}))
+    mph, boost = load_pages(str(path), CATALOG)[0].entries
+    assert (mph.size, mph.pos, mph.options["max_value"]) == (300, (10, 20), 200)
+    assert mph.options["needle_color"].name() == "#ffffff"
+    assert CATALOG["MPH"].options["max_value"] == 160
+    assert (boost.kind, boost.channel, boost.size) == ("gauge", "MAP", 200)
+
+
+@pytest.mark.parametrize("pages", [
+    [{"name": "a", "instruments": ["TURBO"]}],
+    [{"name": "a", "instruments": ["MPH", "MPH"]}],
+    [{"name": "a", "instruments": []}, {"name": "a", "instruments": []}],
+])
+def test_bad_configs(tmp_path, pages):
+    path = tmp_path / "pages.json"
+    path.write_text(json.dumps({"pages": pages}))
+    with pytest.raises(ValueError):
+        load_pages(str(path), CATALOG)
+
+
+class HistoryGauge(Gauge):
+    """A gauge recording the history its options ask for, until given a channel's."""
+    def __init__(self, options):
+        super().__init__()
+        spec = history_spec(**options)
+        self.history = GaugeHistory(*spec) if spec else None
+
+    def use_history(self, history):
+        self.history = history
+
+
+def test_one_history_per_channel():
+    peaks = PageEntry("gauge", "MPH", {"peak_hold": 10})
+    trail = PageEntry("gauge", "MPH", {"sparkline": True, "sparkline_seconds": 60.0, "history_windows": [5]})
+    plain = PageEntry("gauge", "RPM", {})
+    pages = [Page("drive", [peaks, plain]), Page("track", [trail])]
+
+    def build(page):
+        page.instruments = {entry.name: HistoryGauge(entry.options) for entry in page.entries}
+
+    manager = PageManager(pages, build, ignore, ignore)
+    history = manager.channel("MPH").history
+    assert sorted(history.windows) == [5.0, 10.0]
+    assert history.trail_interval * history.trail_length == 60.0
+    assert manager.channel("RPM").history is None
+
+    drive = manager.show_page("drive")
+    manager.set_value("MPH", 50.0)
+    track = manager.show_page("track")
+    manager.set_value("MPH", 70.0)
+    assert drive.instruments["MPH"].history is track.instruments["MPH"].history is history
+    assert history.samples == 2  # recorded once per value, whichever page shows it
+    assert drive.instruments["RPM"].history is None
@@ -0,0 +1,183 @@
+import json
+import os
+
+import pytest
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QRegion
+
+import frame_scheduler
+from frame_scheduler import (QUALITY_LEVELS, FrameScheduler, QualityController, install_scheduler,
+                             refresh_rate, request_update)
+
+
+class Widget:
+    """Records the update() calls it receives."""
+    def __init__(self):
+        self.updates = []
+
+    def update(self, region=None):
+        self.updates.append(region)
+
+
+@pytest.fixture
+def scheduler(qapp):
+    scheduler = FrameScheduler(fps=60)
+    yield scheduler
+    scheduler.timer.stop()
+    install_scheduler(None)
+
+
+def test_requests_merge_into_one_update_per_frame(scheduler):
+    widget = Widget()
+    scheduler.mark_dirty(widget, QRect(0, 0, 10, 10))
+    scheduler.mark_dirty(widget, QRect(20, 0, 10, 10))
+    assert widget.updates == []
+    scheduler.flush()
+    assert widget.updates == [QRegion(0, 0, 10, 10).united(QRegion(20, 0, 10, 10))]
+    assert scheduler.frames == 1
+    assert not scheduler.is_dirty(widget)
+
+
+def test_whole_widget_request_covers_any_rect(scheduler):
+    widget = Widget()
+    scheduler.mark_dirty(widget, QRect(0, 0, 10, 10))
+    scheduler.mark_dirty(widget)
+    scheduler.mark_dirty(widget, QRect(20, 0, 10, 10))
+    scheduler.flush()
+    assert widget.updates == [None]
+
+
+def test_timer_stops_once_nothing_is_dirty(scheduler):
+    widget = Widget()
+    scheduler.mark_dirty(widget)
+    assert scheduler.timer.isActive()
+    scheduler._tick()
+    assert widget.updates == [None]
+    assert scheduler.timer.isActive()
+    scheduler._tick()
+    assert not scheduler.timer.isActive()
+    assert scheduler.skipped_ticks == 1
+
+
+def test_request_update_goes_through_the_installed_scheduler(scheduler):
+    widget = Widget()
+    request_update(widget, QRect(0, 0, 5, 5))  # no scheduler: straight to update()
+    assert widget.updates == [QRect(0, 0, 5, 5)]
+    install_scheduler(scheduler)
+    request_update(widget)
+    assert widget.updates == [QRect(0, 0, 5, 5)]
+    assert scheduler.is_dirty(widget)
+
+
+class Clock:
+    """Stands in for time.perf_counter() in frame_scheduler."""
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(frame_scheduler, "time", clock)
+    return clock
+
+
+def instrument(refresh_class):
+    widget = Widget()
+    widget.refresh_class = refresh_class
+    return widget
+
+
+def test_refresh_classes(scheduler):
+    assert refresh_rate(None) == (None, False)
+    assert refresh_rate("realtime") == (None, False)
+    assert refresh_rate(10) == (10.0, True)
+    slow, normal, fast = instrument("slow"), instrument("normal"), instrument("realtime")
+    assert [scheduler.refresh_interval(w) for w in (slow, normal, fast)] == [0.5, 0.0, 0.0]
+    scheduler.set_quality(2)  # degradable rates halved
+    assert scheduler.refresh_interval(slow) == 1.0
+    assert scheduler.refresh_interval(normal) == pytest.approx(1 / 30)
+    assert scheduler.refresh_interval(fast) == 0.0
+    assert not scheduler.antialias(normal)
+    assert scheduler.antialias(fast)
+
+
+def test_early_repaints_are_merged_until_due(scheduler, clock):
+    widget = instrument("slow")
+    scheduler.mark_dirty(widget)
+    scheduler.flush()
+    clock.now += 0.1
+    scheduler.mark_dirty(widget, QRect(0, 0, 10, 10))
+    scheduler.mark_dirty(widget, QRect(20, 0, 10, 10))
+    assert not scheduler.is_dirty(widget)
+    clock.now += 0.1
+    scheduler._tick()
+    assert widget.updates == [None]
+    assert scheduler.timer.isActive()  # still waiting on the deferred repaint
+    clock.now += 0.4
+    scheduler._tick()
+    assert widget.updates == [None, QRegion(0, 0, 10, 10).united(QRegion(20, 0, 10, 10))]
+
+
+def test_one_repaint_per_frame_is_let_through(scheduler, clock):
+    widget = instrument("slow")
+    scheduler.mark_dirty(widget, QRect(0, 0, 10, 10))
+    scheduler.mark_dirty(widget, QRect(20, 0, 10, 10))  # same frame: not held back
+    scheduler.flush()
+    assert widget.updates == [QRegion(0, 0, 10, 10).united(QRegion(20, 0, 10, 10))]
+
+
+def test_quality_change_repaints_degradable_instruments(scheduler, clock):
+    slow, normal, fast = instrument("slow"), instrument("normal"), instrument("realtime")
+    for widget in (slow, normal, fast):
+        scheduler.mark_dirty(widget)
+    scheduler.flush()
+    clock.now += 0.1
+    scheduler.mark_dirty(slow, QRect(0, 0, 10, 10))  # held back until 0.5 s
+    scheduler.set_quality(2)
+    scheduler.set_quality(2)  # no change: nothing more to repaint
+    assert scheduler.timer.isActive()
+    scheduler._tick()
+    assert slow.updates == normal.updates == [None, None]
+    assert fast.updates == [None]
+    clock.now += 0.5
+    scheduler.mark_dirty(slow)  # due again a second after the change, at the new rate
+    assert not scheduler.is_dirty(slow)
+    clock.now += 0.6
+    scheduler._tick()
+    assert slow.updates == [None, None, None]
+
+
+def feed(controller, ms, windows=1):
+    for _ in range(controller.window * windows):
+        controller.frame(ms)
+
+
+def test_quality_degrades_and_restores(scheduler, tmp_path):
+    log = tmp_path / "quality.jsonl"
+    controller = QualityController(scheduler, window=10, restore_windows=2, log_path=str(log))
+    budget = scheduler.frame_budget_ms
+    feed(controller, budget * 0.95, windows=2)
+    assert scheduler.quality == 2
+    feed(controller, budget * 0.7)  # between the thresholds: stays put
+    feed(controller, budget * 0.3)
+    feed(controller, budget * 0.7)  # and the calm count starts over
+    feed(controller, budget * 0.3)
+    assert scheduler.quality == 2
+    feed(controller, budget * 0.3)
+    assert scheduler.quality == 1
+    changes = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [(c["from"], c["to"]) for c in changes] == [(0, 1), (1, 2), (2, 1)]
+
+
+def test_quality_stops_at_the_lowest_level(scheduler):
+    controller = QualityController(scheduler, window=5, log_path=os.devnull)
+    feed(controller, scheduler.frame_budget_ms * 2, windows=len(QUALITY_LEVELS) + 2)
+    assert scheduler.quality == len(QUALITY_LEVELS) - 1
+    assert len(controller.changes) == len(QUALITY_LEVELS) - 1
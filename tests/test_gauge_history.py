@@ -0,0 +1,65 @@
+from gauge_history import GaugeHistory, RollingWindow
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_window_min_max_mean():
+    window = RollingWindow(10.0)
+    for t, value in enumerate([3.0, 7.0, 1.0, 5.0]):
+        window.add(value, float(t))
+    assert (window.min(), window.max(), window.mean()) == (1.0, 7.0, 4.0)
+
+
+def test_window_evicts_old_samples():
+    window = RollingWindow(2.0)
+    window.add(9.0, 0.0)
+    window.add(1.0, 1.0)
+    window.add(4.0, 2.5)  # the 9 at t=0 is now older than 2 s
+    assert (window.min(), window.max(), window.mean()) == (1.0, 4.0, 2.5)
+    window.expire(10.0)
+    assert len(window) == 0
+    assert (window.min(), window.max(), window.mean()) == (None, None, None)
+
+
+def test_window_capacity_drops_oldest():
+    window = RollingWindow(100.0, capacity=4)
+    for t, value in enumerate([10.0, 1.0, 2.0, 3.0, 4.0]):
+        window.add(value, float(t))
+    assert len(window) == 4
+    assert (window.min(), window.max(), window.mean()) == (1.0, 4.0, 2.5)
+    (older, newer), _ = window.segments()
+    assert list(older) + list(newer) == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_window_matches_brute_force():
+    window = RollingWindow(5.0, capacity=16)
+    samples = []
+    for n in range(200):
+        t = n * 0.3
+        value = float((n * 37) % 23)
+        window.add(value, t)
+        samples.append((t, value))
+        kept = [v for s, v in samples if s >= t - 5.0][-16:]
+        assert window.max() == max(kept)
+        assert window.min() == min(kept)
+        assert abs(window.mean() - sum(kept) / len(kept)) < 1e-9
+
+
+def test_timed_hold_expires_without_new_samples():
+    clock = FakeClock()
+    history = GaugeHistory(windows=(5.0,), trail_seconds=0, clock=clock)
+    history.add(80.0)
+    clock.now = 1.0
+    history.add(60.0)
+    assert history.hold(5.0) == 80.0
+    assert history.hold(5, highest=False) == 60.0
+    clock.now = 10.0
+    assert history.hold(5.0) is None
+    assert history.hold(5.0, highest=False) is None
+    assert history.hold(True) == 80.0  # the all-time peak is kept until reset_peaks()
@@ -0,0 +1,78 @@
+import json
+import os
+
+import pytest
+
+import speedometer_app
+from speedometer_app import LayoutSaver, load_positions_and_scales, save_positions_and_scales
+
+
+class Placed:
+    """A draggable instrument as far as saving its position goes."""
+    def __init__(self, name, x, y):
+        self.name = name
+        self._pos = (x, y)
+
+    def x(self):
+        return self._pos[0]
+
+    def y(self):
+        return self._pos[1]
+
+
+class Page:
+    def __init__(self, name, placed, scales):
+        self.name = name
+        self.placed = placed
+        self.scales = scales
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_pages_are_saved_side_by_side(workdir):
+    save_positions_and_scales([Placed("MPH", 10, 20)], {"MPH": 1.5}, "drive")
+    save_positions_and_scales([Placed("OIL", 5, 6)], {}, "engine")
+    assert load_positions_and_scales("drive") == {"positions": {"MPH": [10, 20]}, "scales": {"MPH": 1.5}}
+    assert load_positions_and_scales("engine")["positions"] == {"OIL": [5, 6]}
+    assert load_positions_and_scales("track") is None
+    assert os.listdir(workdir) == [speedometer_app.POSITIONS_FILE]
+
+
+def test_old_flat_layout_is_the_default_page(workdir):
+    old = {"positions": {"MPH": [1, 2]}, "scales": {}}
+    (workdir / speedometer_app.POSITIONS_FILE).write_text(json.dumps(old))
+    assert load_positions_and_scales() == old
+
+
+def test_failed_save_leaves_the_old_layout(workdir, monkeypatch):
+    save_positions_and_scales([Placed("MPH", 10, 20)], {})
+
+    def power_cut(fd):
+        raise OSError("power cut")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(speedometer_app.os, "fsync", power_cut)
+        with pytest.raises(OSError):
+            save_positions_and_scales([Placed("MPH", 99, 99)], {})
+    assert load_positions_and_scales()["positions"] == {"MPH": [10, 20]}
+
+
+def test_saver_writes_each_waiting_page_once(workdir, qapp, monkeypatch):
+    saved = []
+    monkeypatch.setattr(speedometer_app, "save_positions_and_scales",
+                        lambda placed, scales, page: saved.append(page))
+    saver = LayoutSaver(delay_ms=1000)
+    drive = Page("drive", [], {})
+    saver.schedule(drive)
+    saver.schedule(Page("engine", [], {}))
+    saver.schedule(drive)
+    assert saver.timer.isActive() and saved == []
+    saver.flush()
+    assert sorted(saved) == ["drive", "engine"]
+    assert not saver.timer.isActive()
+    saver.flush()
+    assert len(saved) == 2
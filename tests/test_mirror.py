@@ -0,0 +1,29 @@
+import math
+
+import pytest
+
+from mirror import (DELTA, KEEPALIVE, SNAPSHOT, SUBSCRIBE, MirrorPublisher, decode, encode_delta,
+                    encode_request, encode_snapshot)
+
+
+def test_request_keeps_fractional_rate():
+    assert decode(encode_request(SUBSCRIBE, 0.5))[3] == 0.5
+    assert decode(encode_request(KEEPALIVE))[3] == 0.0
+
+
+def test_snapshot_and_delta_round_trip():
+    kind, seq, captured, payload = decode(encode_snapshot(7, ["MPH", "°C"], [88.5, math.nan], 12.0))
+    assert (kind, seq, captured) == (SNAPSHOT, 7, 12.0)
+    assert payload[0] == ("MPH", 88.5)
+    assert payload[1][0] == "°C" and math.isnan(payload[1][1])
+    assert decode(encode_delta(8, [(1, 2.0)], 13.0)) == (DELTA, 8, 13.0, [(1, 2.0)])
+
+
+def test_truncated_message_is_rejected():
+    assert decode(encode_snapshot(1, ["RPM"], [3.0], 0.0)[:-2]) is None
+
+
+def test_publisher_rejects_names_too_long_for_a_snapshot():
+    with pytest.raises(ValueError):
+        MirrorPublisher(["x" * 256])
+    MirrorPublisher(["é" * 127])  # 254 bytes
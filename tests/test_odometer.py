@@ -0,0 +1,57 @@
+import pytest
+
+from odometer import RECORD_SIZE, Odometer, OdometerStore, pack_record
+
+
+def write_journal(store, records, tail=b""):
+    with open(store.journal_path, "wb") as f:
+        for record in records:
+            f.write(pack_record(*record))
+        f.write(tail)
+
+
+def test_restore_skips_torn_tail(tmp_path):
+    store = OdometerStore(str(tmp_path))
+    write_journal(store, [(1, 10.0, 100.0, 1.0), (2, 20.0, 100.5, 1.5)],
+                  tail=pack_record(3, 30.0, 101.0, 2.0)[:RECORD_SIZE // 2])
+    assert store.restore() == (2, 20.0, 100.5, 1.5)
+
+
+def test_restore_skips_record_failing_crc(tmp_path):
+    store = OdometerStore(str(tmp_path))
+    bad = bytearray(pack_record(3, 30.0, 101.0, 2.0))
+    bad[10] ^= 0xFF
+    write_journal(store, [(1, 10.0, 100.0, 1.0), (2, 20.0, 100.5, 1.5)], tail=bytes(bad))
+    assert store.restore() == (2, 20.0, 100.5, 1.5)
+
+
+def test_open_cuts_off_partial_record(tmp_path):
+    store = OdometerStore(str(tmp_path))
+    write_journal(store, [(1, 10.0, 100.0, 1.0)], tail=b"\x01\x02\x03")
+    store.open()
+    store.append(pack_record(2, 20.0, 100.5, 1.5))
+    store.close()
+    assert (tmp_path / "odometer.journal").stat().st_size == 2 * RECORD_SIZE
+    assert store.restore() == (2, 20.0, 100.5, 1.5)
+
+
+def test_checkpoint_newer_than_stale_journal(tmp_path):
+    store = OdometerStore(str(tmp_path))
+    with open(store.checkpoint_path, "wb") as f:
+        f.write(pack_record(5, 50.0, 200.0, 3.0))
+    write_journal(store, [(4, 40.0, 190.0, 2.0)])  # left behind by a crash during compaction
+    assert store.restore() == (5, 50.0, 200.0, 3.0)
+
+
+def test_totals_survive_restart_and_compaction(tmp_path):
+    odometer = Odometer(str(tmp_path), compact_every=2)
+    odometer.store.open()
+    for step in range(5):
+        odometer.update(60.0, step * 1.0)
+        odometer.flush()
+    odometer.store.close()
+    assert odometer.total == pytest.approx(4 / 60)  # 4 s at 60 mph
+    assert odometer.store.records == 0  # compacted after every second record
+
+    restored = Odometer(str(tmp_path))
+    assert (restored.total, restored.trip, restored.seq) == (odometer.total, odometer.trip, odometer.seq)
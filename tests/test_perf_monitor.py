@@ -0,0 +1,47 @@
+import pytest
+
+from CustomGauge import CustomGauge, GaugeDial
+from dashboard_canvas import DashboardCanvas, GaugeItem
+from perf_monitor import PerfMonitor
+
+
+@pytest.fixture
+def monitor(qapp):
+    monitor = PerfMonitor()
+    monitor.enable()
+    yield monitor
+    monitor.disable()
+
+
+def test_widget_gauges_report_latency(monitor):
+    gauge = CustomGauge(min_value=0, max_value=100, decimals=0)
+    gauge.setObjectName("MPH")
+    gauge.resize(400, 400)
+    gauge.set_value(50)
+    gauge.set_value(50.01)  # changes nothing visible
+    gauge.grab()
+    data = monitor.snapshot()
+    assert data["latency"]["MPH"]["count"] == 1
+    assert data["suppressed"]["MPH"] == {"updates": 2, "suppressed": 1}
+
+
+def test_canvas_items_report_latency(monitor):
+    canvas = DashboardCanvas()
+    canvas.resize(400, 400)
+    item = GaugeItem("MPH", size=200, min_value=0, max_value=100, decimals=0)
+    canvas.add_item(item)
+    item.set_value(50)
+    item.set_value(50.01)
+    canvas.grab()
+    data = monitor.snapshot()
+    assert data["paint"]["MPH"]["count"] == 1
+    assert data["latency"]["MPH"]["count"] == 1
+    assert data["suppressed"]["MPH"] == {"updates": 2, "suppressed": 1}
+    canvas.grab()  # painted again, but no new value to measure
+    assert monitor.snapshot()["latency"]["MPH"]["count"] == 1
+
+
+def test_disable_restores_the_methods(monitor):
+    monitor.disable()
+    assert GaugeItem.set_value is CustomGauge.set_value is GaugeDial.set_value
+    assert GaugeItem.paint.__qualname__ == "GaugeItem.paint"
@@ -0,0 +1,66 @@
+import math
+
+from recorder import Recorder, Recording, RecordingSource
+
+SAMPLES = [
+    (0.0000, "MPH", 10.5), (0.0004, "RPM", 1.25),  # one row: within the merge window
+    (0.0100, "MPH", 11.0),
+    (0.0200, "MPH", 11.5), (0.0201, "MPH", 12.0),  # the same channel twice starts a new row
+    (0.0300, "RPM", 2.5), (0.0300, "FUEL", 0.75),
+    (0.0400, "MPH", 13.0),
+]
+
+
+def record(path, chunk_rows=2):
+    recorder = Recorder(str(path), ["MPH", "RPM", "FUEL"], chunk_rows=chunk_rows)
+    for timestamp, channel, value in SAMPLES:
+        recorder.add(channel, value, timestamp)
+    recorder.add("OIL", 50.0, 0.05)  # not a recorded channel
+    recorder.close()
+    return recorder
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "drive.gtrc"
+    recorder = record(path)
+    recording = Recording(str(path))
+    try:
+        assert recording.channels == ["MPH", "RPM", "FUEL"]
+        assert recording.rows == recorder.rows == 6
+        assert len(recording.chunks) == 3
+        got = list(recording.samples())
+        assert [(channel, value) for _, channel, value in got] == [(c, v) for _, c, v in SAMPLES]
+        # A row keeps the time of its first sample
+        assert [t for t, _, _ in got][:2] == [0.0, 0.0]
+        assert recording.duration == 0.04
+        times, values = recording.columns(0)
+        assert math.isnan(values["FUEL"][0])
+        for view in (times, *values.values()):
+            view.release()
+    finally:
+        recording.close()
+
+
+def test_truncated_last_chunk_is_ignored(tmp_path):
+    path = tmp_path / "drive.gtrc"
+    record(path)
+    with open(path, "r+b") as f:
+        f.truncate(f.seek(0, 2) - 5)
+    recording = Recording(str(path))
+    try:
+        assert recording.rows == 4
+        assert len(list(recording.samples())) == 5
+    finally:
+        recording.close()
+
+
+def test_source_replays_every_sample(tmp_path):
+    path = tmp_path / "drive.gtrc"
+    record(path)
+    source = RecordingSource(str(path), speed=0, batch=3)
+    source.open()
+    replayed = []
+    while not source.finished:
+        replayed.extend(source.read())
+    source.close()
+    assert replayed == [(channel, value) for _, channel, value in SAMPLES]
@@ -0,0 +1,78 @@
+import pytest
+
+from gauge_feeder import GaugeFeeder
+from telemetry import ChannelRing, TelemetryIngestor
+
+
+class Gauge:
+    def __init__(self):
+        self.values = []
+
+    def set_value(self, value):
+        self.values.append(value)
+
+
+def filled_ring(values, capacity=8):
+    ring = ChannelRing(capacity)
+    for t, value in enumerate(values):
+        ring.push(value, float(t))
+    return ring
+
+
+@pytest.mark.parametrize("mode, expected", [("latest", 2.0), ("mean", 4.0), ("min", 2.0), ("max", 7.0)])
+def test_drain_modes(mode, expected):
+    ring = filled_ring([3.0, 7.0, 2.0])
+    assert ring.pending() == 3
+    assert ring.drain(mode) == expected
+    assert ring.pending() == 0
+    assert ring.drain(mode) is None
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        filled_ring([1.0]).drain("median")
+
+
+def test_lapped_consumer_counts_overruns():
+    ring = filled_ring(range(10), capacity=4)
+    assert ring.pending() == 4
+    assert ring.drain("min") == 6  # only the newest capacity samples are left
+    assert ring.overruns == 6
+
+
+def test_ingestor_drops_malformed_and_unknown():
+    ingestor = TelemetryIngestor(None, channels=["MPH"])
+    for line in ["MPH,88.5", "RPM,3.2", "MPH", "MPH,fast", "", "MPH,90"]:
+        ingestor.ingest_line(line)
+    assert ingestor.received == 2
+    assert ingestor.drops == 3
+    assert ingestor.rings["MPH"].drain("mean") == 89.25
+
+
+def test_ingestor_creates_rings_on_first_sight():
+    ingestor = TelemetryIngestor(None)
+    ingestor.ingest_line("OIL, 45")
+    assert list(ingestor.rings) == ["OIL"]
+
+
+def test_feeder_hands_one_drain_to_every_gauge_on_a_channel(qapp):
+    ingestor = TelemetryIngestor(None, channels=["MPH", "RPM"])
+    feeder = GaugeFeeder(ingestor)
+    first, second, rpm = Gauge(), Gauge(), Gauge()
+    feeder.bind("MPH", first, "max")
+    feeder.bind("MPH", second, "max")
+    feeder.bind("RPM", rpm)
+    for value in (10.0, 30.0, 20.0):
+        ingestor.ingest("MPH", value)
+    feeder.drain()
+    assert first.values == second.values == [30.0]
+    assert rpm.values == []  # nothing arrived for it
+    feeder.drain()
+    assert first.values == [30.0]
+
+
+def test_feeder_rejects_a_second_mode_for_a_channel(qapp):
+    feeder = GaugeFeeder(TelemetryIngestor(None))
+    feeder.bind("MPH", Gauge(), "latest")
+    with pytest.raises(ValueError):
+        feeder.bind("MPH", Gauge(), "mean")